@@ -1,11 +1,51 @@
 import os
 import re
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+import json
+import time
+import atexit
+import threading
+import sqlite3
+import hashlib
+import shutil
+import uuid
+import random
+import mimetypes
+import io
+import gzip
+import tempfile
+from contextlib import contextmanager
+from collections import OrderedDict, namedtuple, Counter, deque
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, make_response, send_file, abort
+from flask import g, has_request_context, before_render_template, template_rendered, stream_with_context
+from flask.cli import AppGroup
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime, timedelta
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
+from markupsafe import Markup, escape
+from PIL import Image, ImageOps
 from functools import wraps
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import click
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
 
 app = Flask(__name__)
 
@@ -20,22 +60,30 @@ if DATABASE_URL:
     if DATABASE_URL.startswith('postgres://'):
         DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
     app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
-    print(f"Using PostgreSQL: {DATABASE_URL[:30]}...")
 else:
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///website.db'
-    print("Using SQLite for local development")
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    'pool_pre_ping': True,
-    'pool_recycle': 300,
-}
+# 로컬 SQLite 는 시작 시 마이그레이션 자동 적용, PostgreSQL 은 배포 시 flask db upgrade 로 한 번만 실행
+app.config['AUTO_MIGRATE'] = os.environ.get('AUTO_MIGRATE', '0' if DATABASE_URL and not DATABASE_URL.startswith('sqlite') else '1') == '1'
+
+# DB 연결 풀 (워커 프로세스마다 pool_size + max_overflow 개까지 연결)
+# DB_PRE_PING: always = 대여할 때마다 SELECT 1, idle = DB_PRE_PING_IDLE 초 이상 쉰 연결만 확인, never = 확인 안 함
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 5))
+app.config['DB_MAX_OVERFLOW'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+app.config['DB_POOL_RECYCLE'] = int(os.environ.get('DB_POOL_RECYCLE', 300))
+app.config['DB_PRE_PING'] = os.environ.get('DB_PRE_PING', 'idle')
+app.config['DB_PRE_PING_IDLE'] = float(os.environ.get('DB_PRE_PING_IDLE', 30))
+app.config['DB_STATEMENT_TIMEOUT_MS'] = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 0))
+app.config['DB_APPLICATION_NAME'] = os.environ.get('DB_APPLICATION_NAME', 'dayumusic')
 
 # 파일 업로드 설정
 UPLOAD_FOLDER = 'static/uploads'
 THUMBNAIL_UPLOAD_FOLDER = os.path.join('static', 'uploads', 'thumbnails')
 LOCAL_VIDEO_FOLDER = os.path.join('static', 'uploads', 'videos')
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+ALLOWED_VIDEO_EXTENSIONS = {'mp4', 'webm', 'mov', 'm4v'}
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['THUMBNAIL_UPLOAD_FOLDER'] = THUMBNAIL_UPLOAD_FOLDER
@@ -43,14 +91,227 @@ app.config['LOCAL_VIDEO_FOLDER'] = LOCAL_VIDEO_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 app.config['MAX_LOCAL_VIDEO_SIZE'] = 100 * 1024 * 1024
 
-# 폴더 생성
-for folder in [UPLOAD_FOLDER, THUMBNAIL_UPLOAD_FOLDER, LOCAL_VIDEO_FOLDER]:
-    os.makedirs(folder, exist_ok=True)
+# 로컬 영상 분할 업로드 (청크는 MAX_CONTENT_LENGTH 보다 작아야 함, 임시 파일은 static 밖에 저장)
+app.config['VIDEO_UPLOAD_CHUNK_SIZE'] = 8 * 1024 * 1024
+app.config['VIDEO_UPLOAD_TMP_FOLDER'] = os.path.join(app.instance_path, 'partial_uploads')
+# 이 시간(시간)보다 오래된 미완료 업로드 세션과 임시 파일은 expire_video_uploads 작업이 정리 (0 이면 정리하지 않음)
+app.config['VIDEO_UPLOAD_TTL_HOURS'] = float(os.environ.get('VIDEO_UPLOAD_TTL_HOURS', 24))
+
+# 정적 자산 빌드 (flask build-assets: static/css, static/js -> static/build 에 해시 파일명 + .gz/.br)
+ASSET_SOURCE_FOLDER = 'static'
+ASSET_SOURCE_DIRS = ('css', 'js')
+ASSET_BUILD_FOLDER = os.path.join('static', 'build')
+ASSET_MANIFEST = os.path.join(ASSET_BUILD_FOLDER, 'manifest.json')
+
+# 게시글 이미지 저장소: local (static/uploads) 또는 s3 (AWS S3, MinIO 등 S3 호환, boto3 필요)
+# 파일명이 내용 해시라 같은 사진은 한 번만 저장되고 주소가 바뀌지 않으므로 1년 immutable 캐시로 전송
+# S3 자격 증명은 boto3 기본 방식(AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY), S3_PUBLIC_URL 은 버킷/CDN 공개 주소
+app.config['UPLOAD_STORAGE'] = os.environ.get('UPLOAD_STORAGE', 'local')
+app.config['S3_BUCKET'] = os.environ.get('S3_BUCKET')
+app.config['S3_ENDPOINT_URL'] = os.environ.get('S3_ENDPOINT_URL')
+app.config['S3_REGION'] = os.environ.get('S3_REGION')
+app.config['S3_PUBLIC_URL'] = os.environ.get('S3_PUBLIC_URL')
+app.config['S3_PREFIX'] = os.environ.get('S3_PREFIX', '')
+
+# 영상 스트리밍 (USE_X_SENDFILE=1 이면 앞단 웹서버가 파일 전송을 담당)
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+VIDEO_MAX_RANGES = 16
+
+# 외부 영상 메타데이터 (oEmbed), 테스트에서는 로컬 스텁 서버 주소로 바꿀 수 있음
+app.config['YOUTUBE_OEMBED_URL'] = os.environ.get('YOUTUBE_OEMBED_URL', 'https://www.youtube.com/oembed')
+app.config['VIMEO_OEMBED_URL'] = os.environ.get('VIMEO_OEMBED_URL', 'https://vimeo.com/api/oembed.json')
+app.config['HTTP_TIMEOUT'] = float(os.environ.get('HTTP_TIMEOUT', 5))
+app.config['OEMBED_CACHE_TTL'] = int(os.environ.get('OEMBED_CACHE_TTL', 3600))
+THUMBNAIL_MAX_BYTES = 5 * 1024 * 1024
+THUMBNAIL_MAX_WIDTH = 1280
+
+# 요청 계측 (느린 요청 기준, 같은 형태의 쿼리가 이 횟수를 넘으면 N+1 로 표시)
+app.config['SLOW_REQUEST_MS'] = int(os.environ.get('SLOW_REQUEST_MS', 500))
+app.config['N_PLUS_ONE_THRESHOLD'] = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 10))
+# 쿼리 형태별 집계(N+1 감지, 느린 요청의 주요 쿼리)는 SQL 을 정규식으로 정규화하므로 이 비율의 요청만 수행 (디버그 모드는 항상)
+app.config['QUERY_SHAPE_SAMPLE_RATE'] = float(os.environ.get('QUERY_SHAPE_SAMPLE_RATE', 0.1))
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+
+# 이미지 파생본 설정 (static/derived 에 폭별 원본 형식 + WebP 생성)
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+IMAGE_JPEG_QUALITY = 82
+IMAGE_WEBP_QUALITY = 80
+# 업로드 이미지 최대 픽셀 수 (디코딩 전에 헤더로 확인, 작은 파일이 거대한 비트맵으로 풀리는 경우 방지)
+app.config['MAX_IMAGE_PIXELS'] = int(os.environ.get('MAX_IMAGE_PIXELS', 50_000_000))
+Image.MAX_IMAGE_PIXELS = app.config['MAX_IMAGE_PIXELS']
+
+# 관련 영상 추천 (영상마다 상위 RELATED_VIDEOS_STORED 개를 미리 계산해 저장, 가중치 합은 1)
+RELATED_VIDEOS_STORED = 8
+RELATED_WEIGHTS = {'tags': 0.5, 'text': 0.35, 'date': 0.15}
+RELATED_DATE_SCALE_DAYS = 180.0
+RELATED_MAX_TEXT_FEATURES = 5000
+
+# 백그라운드 작업 큐 (JOB_WORKERS=0 이면 웹 워커에서는 처리하지 않고 flask run-jobs 로 처리)
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 1))
+app.config['JOB_POLL_INTERVAL'] = float(os.environ.get('JOB_POLL_INTERVAL', 2))
+app.config['JOB_TIMEOUT'] = int(os.environ.get('JOB_TIMEOUT', 300))
+
+# 조회수/좋아요 카운터 반영 주기 (초, 0 이하이면 요청마다 즉시 반영)
+app.config['COUNTER_FLUSH_INTERVAL'] = float(os.environ.get('COUNTER_FLUSH_INTERVAL', 10))
+
+# 업로드 폴더 점검/정리 작업 주기 (시간, 0 이면 예약하지 않음), 이보다 최근(초)에 생긴 파일은 고아로 보지 않음
+app.config['STORAGE_GC_INTERVAL_HOURS'] = float(os.environ.get('STORAGE_GC_INTERVAL_HOURS', 24))
+app.config['STORAGE_GC_GRACE_SECONDS'] = int(os.environ.get('STORAGE_GC_GRACE_SECONDS', 3600))
+
+# 공개 POST 요청 제한 ('횟수/초', 0 이면 제한 없음), 같은 방문자의 반복 조회/좋아요는 창(초) 안에서 한 번만 반영
+# RESPONSE_CACHE_DB 가 있으면 모든 워커가 카운터를 공유, 프록시 뒤라면 PROXY_X_FOR 에 프록시 단계 수 지정
+app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', '1') != '0'
+app.config['RATE_LIMIT_CONTACT'] = os.environ.get('RATE_LIMIT_CONTACT', '5/600')
+app.config['RATE_LIMIT_EVENTS'] = os.environ.get('RATE_LIMIT_EVENTS', '120/60')
+app.config['RATE_LIMIT_VIDEO_EVENTS'] = os.environ.get('RATE_LIMIT_VIDEO_EVENTS', '600/60')
+# 방문자 쿠키 없이 들어온 조회/좋아요 요청은 IP + User-Agent 당 이 한도로 제한 (중복 제거는 쿠키로만 함)
+app.config['RATE_LIMIT_NEW_VISITOR_EVENTS'] = os.environ.get('RATE_LIMIT_NEW_VISITOR_EVENTS', '30/60')
+app.config['RATE_LIMIT_MAX_ENTRIES'] = int(os.environ.get('RATE_LIMIT_MAX_ENTRIES', 100000))
+app.config['VIEW_DEDUP_SECONDS'] = int(os.environ.get('VIEW_DEDUP_SECONDS', 1800))
+app.config['LIKE_DEDUP_SECONDS'] = int(os.environ.get('LIKE_DEDUP_SECONDS', 86400))
+app.config['PROXY_X_FOR'] = int(os.environ.get('PROXY_X_FOR', 0))
+
+# 공개 페이지 응답 캐시 (RESPONSE_CACHE_DB 를 지정하면 모든 워커가 SQLite 파일을 공유)
+app.config['RESPONSE_CACHE_ENABLED'] = os.environ.get('RESPONSE_CACHE_ENABLED', '1') != '0'
+app.config['RESPONSE_CACHE_TTL'] = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
+app.config['RESPONSE_CACHE_MAX_ENTRIES'] = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 512))
+app.config['RESPONSE_CACHE_DB'] = os.environ.get('RESPONSE_CACHE_DB')
+
+# 게시글/영상 행 캐시 (조회수/좋아요는 다른 워커의 증가분이 최대 OBJECT_CACHE_TTL 초 늦게 보일 수 있음)
+app.config['OBJECT_CACHE_ENABLED'] = os.environ.get('OBJECT_CACHE_ENABLED', '1') != '0'
+app.config['OBJECT_CACHE_TTL'] = int(os.environ.get('OBJECT_CACHE_TTL', 300))
+app.config['OBJECT_CACHE_MAX_ENTRIES'] = int(os.environ.get('OBJECT_CACHE_MAX_ENTRIES', 2048))
+
+# 전문 검색 (흔한 검색어는 일치 문서가 많으므로 관련도 계산은 최신 문서 N개 안에서만 수행)
+app.config['SEARCH_RANK_CANDIDATES'] = int(os.environ.get('SEARCH_RANK_CANDIDATES', 1000))
 
 # 관리자 설정
 ADMIN_USERNAME = 'admin'
 ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'admin123')
 
+# ============================================
+# DB 연결 풀 (워커 프로세스마다 하나, 크기/대기 시간 통계 수집)
+# ============================================
+class PoolStats:
+    """연결 대여 횟수, 대기 시간, 타임아웃, 연결 확인(ping) 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_failures = 0
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def record_ping(self, ok):
+        with self._lock:
+            self.pings += 1
+            self.ping_failures += not ok
+
+pool_stats = PoolStats()
+
+class InstrumentedQueuePool(QueuePool):
+    """연결을 얻기까지 기다린 시간을 기록하는 QueuePool"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+def build_engine_options():
+    """DB_* 환경 변수로 연결 풀/세션 옵션 구성"""
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    options = {'pool_recycle': app.config['DB_POOL_RECYCLE']}
+    if app.config['DB_PRE_PING'] == 'always':
+        options['pool_pre_ping'] = True
+
+    if uri.startswith('sqlite') and ':memory:' in uri:
+        return options
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': app.config['DB_POOL_SIZE'],
+        'max_overflow': app.config['DB_MAX_OVERFLOW'],
+        'pool_timeout': app.config['DB_POOL_TIMEOUT'],
+    })
+    if uri.startswith('postgresql'):
+        connect_args = {'application_name': app.config['DB_APPLICATION_NAME']}
+        if app.config['DB_STATEMENT_TIMEOUT_MS']:
+            connect_args['options'] = f"-c statement_timeout={app.config['DB_STATEMENT_TIMEOUT_MS']}"
+        options['connect_args'] = connect_args
+    return options
+
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options()
+
+@event.listens_for(QueuePool, 'checkin')
+def mark_connection_idle(dbapi_connection, connection_record):
+    connection_record.info['checked_in_at'] = time.monotonic()
+
+@event.listens_for(QueuePool, 'checkout')
+def ping_idle_connection(dbapi_connection, connection_record, connection_proxy):
+    """DB_PRE_PING=idle: 한동안 쉬던 연결만 SELECT 1 로 확인 (매 대여마다 왕복하지 않음)"""
+    if app.config['DB_PRE_PING'] != 'idle':
+        return
+    idle_since = connection_record.info.get('checked_in_at')
+    if idle_since is None or time.monotonic() - idle_since < app.config['DB_PRE_PING_IDLE']:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute('SELECT 1')
+        pool_stats.record_ping(True)
+    except Exception:
+        pool_stats.record_ping(False)
+        # 풀이 이 연결을 버리고 새 연결로 다시 시도함
+        raise DisconnectionError()
+    finally:
+        cursor.close()
+
+def pool_status():
+    """현재 워커의 연결 풀 상태"""
+    pool = db.engine.pool
+    status = {
+        'pid': os.getpid(),
+        'pool_class': type(pool).__name__,
+        'pre_ping': app.config['DB_PRE_PING'],
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'max_overflow': app.config['DB_MAX_OVERFLOW'],
+            'timeout': app.config['DB_POOL_TIMEOUT'],
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+        })
+    with pool_stats._lock:
+        checkouts = pool_stats.checkouts
+        status.update({
+            'checkouts': checkouts,
+            'avg_wait_ms': round(pool_stats.wait_seconds / checkouts * 1000, 3) if checkouts else 0.0,
+            'max_wait_ms': round(pool_stats.max_wait_seconds * 1000, 3),
+            'timeouts': pool_stats.timeouts,
+            'pings': pool_stats.pings,
+            'ping_failures': pool_stats.ping_failures,
+        })
+    return status
+
 db = SQLAlchemy(app)
 
 # ============================================
@@ -63,7 +324,10 @@ class Post(db.Model):
     author = db.Column(db.String(100), nullable=False)
     image_filename = db.Column(db.String(100), nullable=True)
     date_posted = db.Column(db.DateTime, default=datetime.utcnow)
+    performance_date = db.Column(db.Date, nullable=True, index=True)
     images = db.relationship('PostImage', backref='post', lazy=True, cascade='all, delete-orphan')
+    # 게시판 정렬 (date_posted DESC, id DESC) 및 키셋 커서
+    __table_args__ = (db.Index('ix_post_date_posted_id', 'date_posted', 'id'),)
 
 class PostImage(db.Model):
     __tablename__ = 'post_image'
@@ -73,14 +337,28 @@ class PostImage(db.Model):
     display_order = db.Column(db.Integer, default=0)
     is_primary = db.Column(db.Boolean, default=False)
     date_uploaded = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('ix_post_image_post_order', 'post_id', 'display_order', 'id'),
+        db.Index('ix_post_image_post_primary', 'post_id', 'is_primary'),
+    )
+
+class UploadBlob(db.Model):
+    """저장소의 업로드 이미지 파일 하나와 그 파일을 쓰는 곳의 수 (게시글 이미지 + 게시글 대표 이미지)"""
+    __tablename__ = 'upload_blob'
+    filename = db.Column(db.String(255), primary_key=True)
+    size = db.Column(db.Integer, nullable=False, default=0)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    date_created = db.Column(db.DateTime, default=datetime.utcnow)
 
 class Contact(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), nullable=False)
     email = db.Column(db.String(100), nullable=False)
     message = db.Column(db.Text, nullable=False)
-    date_sent = db.Column(db.DateTime, default=datetime.utcnow)
+    date_sent = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     answered = db.Column(db.Boolean, default=False)
+    # 관리자 문의함: 답변 여부로 거르고 최신순 (SQLite 는 인덱스 끝에 rowid 가 붙어 id 순서까지 맞음)
+    __table_args__ = (db.Index('ix_contact_answered_date_sent', 'answered', 'date_sent'),)
 
 class Video(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -95,20 +373,681 @@ class Video(db.Model):
     thumbnail_url = db.Column(db.String(500), nullable=True)
     duration = db.Column(db.String(20), nullable=True)
     file_size = db.Column(db.Integer, nullable=True)
-    performance_date = db.Column(db.Date, nullable=True)
+    performance_date = db.Column(db.Date, nullable=True, index=True)
     tags = db.Column(db.String(500), nullable=True)
     view_count = db.Column(db.Integer, default=0)
     like_count = db.Column(db.Integer, default=0)
     date_uploaded = db.Column(db.DateTime, default=datetime.utcnow)
     is_featured = db.Column(db.Boolean, default=False)
+    tag_items = db.relationship('Tag', secondary='video_tag', lazy=True, order_by='Tag.name')
+    # 포트폴리오/API 정렬 (date_uploaded DESC, id DESC) 및 키셋 커서
+    __table_args__ = (db.Index('ix_video_date_uploaded_id', 'date_uploaded', 'id'),)
 
-# 데이터베이스 초기화
-with app.app_context():
-    try:
-        db.create_all()
-        print("Database tables created successfully!")
-    except Exception as e:
-        print(f"Error creating database tables: {e}")
+video_tag = db.Table(
+    'video_tag',
+    db.Column('video_id', db.Integer, db.ForeignKey('video.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tag.id', ondelete='CASCADE'), primary_key=True),
+    # 태그로 영상 찾기 (기본 키는 영상 -> 태그 방향)
+    db.Index('ix_video_tag_tag_id', 'tag_id', 'video_id'),
+)
+
+class RelatedVideo(db.Model):
+    """영상별로 미리 계산한 관련 영상 (기본 키 순서대로 읽으면 rank 순)"""
+    __tablename__ = 'related_video'
+    video_id = db.Column(db.Integer, db.ForeignKey('video.id', ondelete='CASCADE'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    related_id = db.Column(db.Integer, db.ForeignKey('video.id', ondelete='CASCADE'), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)
+
+class Tag(db.Model):
+    __tablename__ = 'tag'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False, unique=True)
+    video_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+
+class SchemaVersion(db.Model):
+    """적용된 스키마 마이그레이션 기록"""
+    __tablename__ = 'schema_version'
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    description = db.Column(db.String(200), nullable=True)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class VideoUpload(db.Model):
+    __tablename__ = 'video_upload'
+    id = db.Column(db.String(32), primary_key=True)
+    filename = db.Column(db.String(255), nullable=False)
+    total_size = db.Column(db.Integer, nullable=False)
+    received_size = db.Column(db.Integer, nullable=False, default=0)
+    meta = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Job(db.Model):
+    __tablename__ = 'job'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    last_error = db.Column(db.Text, nullable=True)
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    __table_args__ = (db.Index('ix_job_status_run_after', 'status', 'run_after'),)
+
+class SearchDocument(db.Model):
+    """게시글/영상 검색 문서 (원문은 스니펫용, *_tokens 는 n-gram 색인용)"""
+    __tablename__ = 'search_document'
+    id = db.Column(db.Integer, primary_key=True)
+    doc_type = db.Column(db.String(10), nullable=False)
+    doc_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(200), nullable=False, default='')
+    body = db.Column(db.Text, nullable=False, default='')
+    title_tokens = db.Column(db.Text, nullable=False, default='')
+    body_tokens = db.Column(db.Text, nullable=False, default='')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (db.UniqueConstraint('doc_type', 'doc_id', name='uq_search_document_doc'),)
+
+# ============================================
+# 전문 검색 색인 (Postgres tsvector + GIN / SQLite FTS5)
+# ============================================
+# 한글은 형태소 분석 없이 2-gram 으로 색인하고, 그 외 단어는 통째로 색인해 접두어로 검색
+HANGUL_RUN = re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]+')
+SEARCH_TOKEN_RUN = re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]+|[^\W_가-힣ㄱ-ㅎㅏ-ㅣ]+')
+
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title_tokens, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(body_tokens, '')), 'B')"
+)
+
+def hangul_bigrams(run):
+    return [run] if len(run) < 2 else [run[i:i + 2] for i in range(len(run) - 1)]
+
+def ngram_text(text):
+    """색인용 토큰 문자열 (한글 구간은 2-gram, 나머지는 단어 단위)"""
+    tokens = []
+    for run in SEARCH_TOKEN_RUN.findall((text or '').lower()):
+        tokens.extend(hangul_bigrams(run) if HANGUL_RUN.fullmatch(run) else [run])
+    return ' '.join(tokens)
+
+def parse_search_query(query):
+    """검색어를 구(phrase) 목록으로 변환: [(토큰 목록, 접두어 검색 여부)]"""
+    phrases = []
+    for run in SEARCH_TOKEN_RUN.findall((query or '').lower())[:10]:
+        if HANGUL_RUN.fullmatch(run):
+            # 한 글자는 그 글자로 시작하는 2-gram 을 접두어로 검색 (FTS5 는 1글자 접두어 색인 사용)
+            phrases.append((hangul_bigrams(run), len(run) == 1))
+        else:
+            phrases.append(([run], True))
+    return phrases
+
+def ensure_search_index():
+    """DB 종류에 맞는 전문 검색 색인 생성"""
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(db.text(
+            f'CREATE INDEX IF NOT EXISTS ix_search_document_tsv ON search_document USING GIN (({PG_SEARCH_VECTOR}))'
+        ))
+    elif db.engine.dialect.name == 'sqlite':
+        # search_document 를 원본으로 하는 외부 콘텐츠 FTS5 테이블, 트리거로 동기화
+        for statement in (
+            """CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+                title_tokens, body_tokens, content='search_document', content_rowid='id', prefix='1')""",
+            """CREATE TRIGGER IF NOT EXISTS search_document_ai AFTER INSERT ON search_document BEGIN
+                INSERT INTO search_fts(rowid, title_tokens, body_tokens)
+                VALUES (new.id, new.title_tokens, new.body_tokens);
+            END""",
+            """CREATE TRIGGER IF NOT EXISTS search_document_ad AFTER DELETE ON search_document BEGIN
+                INSERT INTO search_fts(search_fts, rowid, title_tokens, body_tokens)
+                VALUES ('delete', old.id, old.title_tokens, old.body_tokens);
+            END""",
+            """CREATE TRIGGER IF NOT EXISTS search_document_au AFTER UPDATE ON search_document BEGIN
+                INSERT INTO search_fts(search_fts, rowid, title_tokens, body_tokens)
+                VALUES ('delete', old.id, old.title_tokens, old.body_tokens);
+                INSERT INTO search_fts(rowid, title_tokens, body_tokens)
+                VALUES (new.id, new.title_tokens, new.body_tokens);
+            END""",
+        ):
+            db.session.execute(db.text(statement))
+    db.session.commit()
+
+def index_document(doc_type, doc_id, title, body):
+    """검색 문서 추가/갱신 (요청의 DB 트랜잭션과 함께 commit 됨)"""
+    document = SearchDocument.query.filter_by(doc_type=doc_type, doc_id=doc_id).first()
+    if document is None:
+        document = SearchDocument(doc_type=doc_type, doc_id=doc_id)
+        db.session.add(document)
+    document.title = (title or '')[:200]
+    document.body = body or ''
+    document.title_tokens = ngram_text(title)
+    document.body_tokens = ngram_text(body)
+    document.updated_at = datetime.utcnow()
+
+def index_post(post):
+    index_document('post', post.id, post.title, f'{post.author}\n{post.content}')
+
+def index_video(video):
+    index_document('video', video.id, video.title,
+                   '\n'.join(part for part in (video.author, video.description, video.tags) if part))
+
+def remove_from_search_index(doc_type, doc_id):
+    SearchDocument.query.filter_by(doc_type=doc_type, doc_id=doc_id).delete(synchronize_session=False)
+
+def search_snippet(text, query, width=120):
+    """검색어 주변 본문을 잘라 <mark> 로 강조한 HTML 조각"""
+    terms = sorted({term for term in (query or '').lower().split() if term}, key=len, reverse=True)
+    lower = text.lower()
+    positions = [lower.find(term) for term in terms if term in lower]
+    start = max(min(positions) - width // 3, 0) if positions else 0
+    fragment = text[start:start + width]
+
+    escaped = str(escape(fragment))
+    if terms:
+        pattern = re.compile('|'.join(re.escape(str(escape(term))) for term in terms), re.IGNORECASE)
+        escaped = pattern.sub(lambda m: f'<mark>{m.group(0)}</mark>', escaped)
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if start + width < len(text) else ''
+    return Markup(f'{prefix}{escaped}{suffix}')
+
+def search_documents(query, doc_type=None, limit=20, offset=0):
+    """검색어와 일치하는 문서를 관련도 순으로 반환"""
+    phrases = parse_search_query(query)
+    if not phrases:
+        return []
+
+    params = {'limit': limit, 'offset': offset, 'doc_type': doc_type,
+              'candidates': app.config['SEARCH_RANK_CANDIDATES']}
+    type_filter = 'AND d.doc_type = :doc_type' if doc_type else ''
+
+    if db.engine.dialect.name == 'postgresql':
+        params['tsquery'] = ' & '.join(
+            '(' + ' <-> '.join(tokens) + (':*' if prefix else '') + ')' for tokens, prefix in phrases
+        )
+        sql = f"""
+            SELECT d.id, d.doc_type, d.doc_id, d.title, d.body, ts_rank({PG_SEARCH_VECTOR}, q) AS rank
+            FROM (
+                SELECT d.id FROM search_document d, to_tsquery('simple', :tsquery) q
+                WHERE ({PG_SEARCH_VECTOR}) @@ q {type_filter}
+                ORDER BY d.id DESC LIMIT :candidates
+            ) candidate
+            JOIN search_document d ON d.id = candidate.id, to_tsquery('simple', :tsquery) q
+            ORDER BY rank DESC, d.id DESC
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        # FTS5 구(phrase) 검색: "공연 연장" 은 두 2-gram 이 연속으로 나오는 문서만 일치
+        params['match'] = ' AND '.join(
+            '"' + ' '.join(tokens) + '"' + ('*' if prefix else '') for tokens, prefix in phrases
+        )
+        # 후보 구간의 하한 rowid 를 먼저 구해 bm25 계산 범위를 제한
+        sql = f"""
+            SELECT d.id, d.doc_type, d.doc_id, d.title, d.body, -bm25(search_fts, 3.0, 1.0) AS rank
+            FROM search_fts JOIN search_document d ON d.id = search_fts.rowid
+            WHERE search_fts MATCH :match {type_filter}
+              AND search_fts.rowid >= coalesce((
+                  SELECT rowid FROM search_fts WHERE search_fts MATCH :match
+                  ORDER BY rowid DESC LIMIT 1 OFFSET :candidates - 1
+              ), 0)
+            ORDER BY bm25(search_fts, 3.0, 1.0), d.id DESC
+            LIMIT :limit OFFSET :offset
+        """
+
+    rows = db.session.execute(db.text(sql), params).fetchall()
+    results = []
+    for row in rows:
+        if row.doc_type == 'post':
+            url = url_for('view_post', post_id=row.doc_id)
+        else:
+            url = url_for('view_video', video_id=row.doc_id)
+        results.append({
+            'type': row.doc_type,
+            'id': row.doc_id,
+            'title': row.title,
+            'url': url,
+            'snippet': search_snippet(row.body, query),
+            'rank': round(float(row.rank), 4),
+        })
+    return results
+
+# ============================================
+# 스키마 마이그레이션 (버전 관리)
+# ============================================
+# 배포 시 한 번만 실행: flask db upgrade (AUTO_MIGRATE=1 이면 앱 시작 시 자동 적용)
+# create_all 로 이미 만들어진 DB 에도 적용되도록 각 단계는 여러 번 실행해도 안전하게 작성
+MIGRATIONS = []
+
+class Migration:
+    """버전 번호가 붙은 스키마 변경 단계 (revert 가 없으면 되돌릴 수 없음)"""
+
+    def __init__(self, version, description, upgrade):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+        self.revert = None
+
+    def downgrade(self, revert):
+        self.revert = revert
+        return revert
+
+def migration(version, description):
+    def decorator(upgrade):
+        step = Migration(version, description, upgrade)
+        MIGRATIONS.append(step)
+        return step
+    return decorator
+
+def add_column_if_missing(table, column, column_type):
+    existing = {c['name'] for c in db.inspect(db.engine).get_columns(table)}
+    if column not in existing:
+        db.session.execute(db.text(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}'))
+
+def create_index(name, table, columns):
+    db.session.execute(db.text(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})'))
+
+def drop_index(name):
+    db.session.execute(db.text(f'DROP INDEX IF EXISTS {name}'))
+
+# 마이그레이션 1 이 만드는 테이블 (버전 관리를 도입할 때의 모델 그대로 고정)
+# 모델에 나중에 추가한 테이블/컬럼/인덱스는 여기가 아니라 새 번호의 마이그레이션으로 만든다
+BASELINE_METADATA = db.MetaData()
+
+db.Table(
+    'post', BASELINE_METADATA,
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('title', db.String(200), nullable=False),
+    db.Column('content', db.Text, nullable=False),
+    db.Column('author', db.String(100), nullable=False),
+    db.Column('image_filename', db.String(100)),
+    db.Column('date_posted', db.DateTime),
+    db.Column('performance_date', db.Date, index=True),
+    db.Index('ix_post_date_posted_id', 'date_posted', 'id'),
+)
+db.Table(
+    'post_image', BASELINE_METADATA,
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('post_id', db.Integer, db.ForeignKey('post.id'), nullable=False),
+    db.Column('filename', db.String(255), nullable=False),
+    db.Column('display_order', db.Integer),
+    db.Column('is_primary', db.Boolean),
+    db.Column('date_uploaded', db.DateTime),
+    db.Index('ix_post_image_post_order', 'post_id', 'display_order', 'id'),
+    db.Index('ix_post_image_post_primary', 'post_id', 'is_primary'),
+)
+db.Table(
+    'contact', BASELINE_METADATA,
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('name', db.String(50), nullable=False),
+    db.Column('email', db.String(100), nullable=False),
+    db.Column('message', db.Text, nullable=False),
+    db.Column('date_sent', db.DateTime, index=True),
+    db.Column('answered', db.Boolean),
+)
+db.Table(
+    'video', BASELINE_METADATA,
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('title', db.String(200), nullable=False),
+    db.Column('description', db.Text),
+    db.Column('author', db.String(100), nullable=False),
+    db.Column('platform', db.String(20), nullable=False),
+    db.Column('video_id', db.String(50)),
+    db.Column('external_url', db.String(500)),
+    db.Column('video_filename', db.String(255)),
+    db.Column('thumbnail_filename', db.String(255)),
+    db.Column('thumbnail_url', db.String(500)),
+    db.Column('duration', db.String(20)),
+    db.Column('file_size', db.Integer),
+    db.Column('performance_date', db.Date, index=True),
+    db.Column('tags', db.String(500)),
+    db.Column('view_count', db.Integer),
+    db.Column('like_count', db.Integer),
+    db.Column('date_uploaded', db.DateTime, index=True),
+    db.Column('is_featured', db.Boolean),
+)
+db.Table(
+    'tag', BASELINE_METADATA,
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('name', db.String(50), nullable=False, unique=True),
+    db.Column('video_count', db.Integer, nullable=False, index=True),
+)
+db.Table(
+    'video_tag', BASELINE_METADATA,
+    db.Column('video_id', db.Integer, db.ForeignKey('video.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tag.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_video_tag_tag_id', 'tag_id', 'video_id'),
+)
+db.Table(
+    'related_video', BASELINE_METADATA,
+    db.Column('video_id', db.Integer, db.ForeignKey('video.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('rank', db.Integer, primary_key=True, autoincrement=False),
+    db.Column('related_id', db.Integer, db.ForeignKey('video.id', ondelete='CASCADE'), nullable=False, index=True),
+    db.Column('score', db.Float, nullable=False),
+)
+db.Table(
+    'schema_version', BASELINE_METADATA,
+    db.Column('version', db.Integer, primary_key=True, autoincrement=False),
+    db.Column('description', db.String(200)),
+    db.Column('applied_at', db.DateTime),
+)
+db.Table(
+    'video_upload', BASELINE_METADATA,
+    db.Column('id', db.String(32), primary_key=True),
+    db.Column('filename', db.String(255), nullable=False),
+    db.Column('total_size', db.Integer, nullable=False),
+    db.Column('received_size', db.Integer, nullable=False),
+    db.Column('meta', db.Text),
+    db.Column('created_at', db.DateTime),
+    db.Column('updated_at', db.DateTime),
+)
+db.Table(
+    'job', BASELINE_METADATA,
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('kind', db.String(50), nullable=False),
+    db.Column('payload', db.Text),
+    db.Column('status', db.String(20), nullable=False),
+    db.Column('attempts', db.Integer, nullable=False),
+    db.Column('max_attempts', db.Integer, nullable=False),
+    db.Column('last_error', db.Text),
+    db.Column('run_after', db.DateTime, nullable=False),
+    db.Column('created_at', db.DateTime, nullable=False),
+    db.Column('started_at', db.DateTime),
+    db.Column('finished_at', db.DateTime),
+    db.Index('ix_job_status_run_after', 'status', 'run_after'),
+)
+db.Table(
+    'search_document', BASELINE_METADATA,
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('doc_type', db.String(10), nullable=False),
+    db.Column('doc_id', db.Integer, nullable=False),
+    db.Column('title', db.String(200), nullable=False),
+    db.Column('body', db.Text, nullable=False),
+    db.Column('title_tokens', db.Text, nullable=False),
+    db.Column('body_tokens', db.Text, nullable=False),
+    db.Column('updated_at', db.DateTime),
+    db.UniqueConstraint('doc_type', 'doc_id', name='uq_search_document_doc'),
+)
+
+@migration(1, '기준선: 기존 테이블, 공연 날짜 컬럼/인덱스, 검색 색인')
+def migrate_baseline():
+    BASELINE_METADATA.create_all(db.session.connection(), checkfirst=True)
+    # 버전 관리 이전에 만들어진 DB 의 post 테이블에는 공연 날짜 컬럼이 없음
+    add_column_if_missing('post', 'performance_date', 'DATE')
+    create_index('ix_post_performance_date', 'post', 'performance_date')
+    create_index('ix_video_performance_date', 'video', 'performance_date')
+    ensure_search_index()
+
+HOT_QUERY_INDEXES = [
+    ('ix_post_date_posted_id', 'post', 'date_posted, id'),
+    ('ix_video_date_uploaded', 'video', 'date_uploaded'),
+    ('ix_post_image_post_order', 'post_image', 'post_id, display_order, id'),
+    ('ix_post_image_post_primary', 'post_image', 'post_id, is_primary'),
+    ('ix_contact_date_sent', 'contact', 'date_sent'),
+]
+
+@migration(2, '자주 쓰는 정렬/필터 컬럼 인덱스')
+def migrate_hot_query_indexes():
+    for name, table, columns in HOT_QUERY_INDEXES:
+        create_index(name, table, columns)
+
+@migrate_hot_query_indexes.downgrade
+def downgrade_hot_query_indexes():
+    for name, _, _ in HOT_QUERY_INDEXES:
+        drop_index(name)
+
+@migration(3, '영상 목록 키셋 커서 인덱스 (date_uploaded, id)')
+def migrate_video_cursor_index():
+    create_index('ix_video_date_uploaded_id', 'video', 'date_uploaded, id')
+    drop_index('ix_video_date_uploaded')
+
+@migrate_video_cursor_index.downgrade
+def downgrade_video_cursor_index():
+    create_index('ix_video_date_uploaded', 'video', 'date_uploaded')
+    drop_index('ix_video_date_uploaded_id')
+
+@migration(4, '문의함 인덱스 (answered, date_sent)')
+def migrate_contact_inbox_index():
+    # 예전 행의 NULL 을 미답변으로 채워 answered = false 조건 하나로 인덱스를 타게 함
+    db.session.execute(db.text('UPDATE contact SET answered = :answered WHERE answered IS NULL'), {'answered': False})
+    create_index('ix_contact_answered_date_sent', 'contact', 'answered, date_sent')
+
+@migrate_contact_inbox_index.downgrade
+def downgrade_contact_inbox_index():
+    drop_index('ix_contact_answered_date_sent')
+
+@migration(5, '업로드 이미지 참조 수 (upload_blob)')
+def migrate_upload_blobs():
+    UploadBlob.__table__.create(db.session.connection(), checkfirst=True)
+    register_existing_uploads(static_storage)
+
+@migrate_upload_blobs.downgrade
+def downgrade_upload_blobs():
+    UploadBlob.__table__.drop(db.session.connection(), checkfirst=True)
+
+@migration(6, '영상 태그 이전 (Video.tags 문자열 -> tag/video_tag)')
+def migrate_video_tags():
+    backfill_video_tags()
+
+@migrate_video_tags.downgrade
+def downgrade_video_tags():
+    # Video.tags 문자열은 그대로 남아 있으므로 되돌릴 것이 없음
+    pass
+
+def current_schema_version():
+    if not db.inspect(db.engine).has_table('schema_version'):
+        return 0
+    return db.session.query(db.func.max(SchemaVersion.version)).scalar() or 0
+
+def upgrade_schema(target=None, echo=print):
+    """target 버전까지(기본: 최신) 아직 적용되지 않은 마이그레이션 실행, 적용한 개수 반환"""
+    current = current_schema_version()
+    applied = 0
+    for step in sorted(MIGRATIONS, key=lambda step: step.version):
+        if step.version <= current or (target is not None and step.version > target):
+            continue
+        echo(f"마이그레이션 {step.version}: {step.description}")
+        step.upgrade()
+        db.session.add(SchemaVersion(version=step.version, description=step.description))
+        db.session.commit()
+        applied += 1
+    return applied
+
+def downgrade_schema(target, echo=print):
+    """target 버전이 될 때까지 최근 마이그레이션부터 되돌리기"""
+    current = current_schema_version()
+    for step in reversed(sorted(MIGRATIONS, key=lambda step: step.version)):
+        if step.version <= target or step.version > current:
+            continue
+        if step.revert is None:
+            raise RuntimeError(f'마이그레이션 {step.version} 은 되돌릴 수 없습니다.')
+        echo(f"되돌리기 {step.version}: {step.description}")
+        step.revert()
+        SchemaVersion.query.filter_by(version=step.version).delete()
+        db.session.commit()
+
+# ============================================
+# 앱 초기화 (import 시에는 DB/파일시스템에 접근하지 않음)
+# ============================================
+# 운영 배포: flask init (또는 flask db upgrade) 를 배포 단계에서 한 번 실행하고
+#           gunicorn app:app 으로 워커 시작 (--preload 로 fork 해도 DB 연결을 공유하지 않음)
+# 라우트가 모듈의 app 에 등록되므로 앱은 프로세스당 하나이고, 무거운 초기화는 첫 요청 또는 flask init 에서 수행
+_bootstrap_lock = threading.Lock()
+_bootstrapped_pid = None
+
+def prepare_upload_folders():
+    for folder in (UPLOAD_FOLDER, THUMBNAIL_UPLOAD_FOLDER, LOCAL_VIDEO_FOLDER):
+        os.makedirs(folder, exist_ok=True)
+
+def bootstrap_app():
+    """워커 프로세스마다 첫 요청 때 한 번: 업로드 폴더 확인, 스키마 확인 (AUTO_MIGRATE 이면 적용)"""
+    global _bootstrapped_pid
+    if _bootstrapped_pid == os.getpid():
+        return
+    with _bootstrap_lock:
+        if _bootstrapped_pid == os.getpid():
+            return
+        prepare_upload_folders()
+        try:
+            if app.config['AUTO_MIGRATE']:
+                if upgrade_schema():
+                    print("Database schema upgraded!")
+            elif current_schema_version() < max(step.version for step in MIGRATIONS):
+                print("적용되지 않은 마이그레이션이 있습니다: flask db upgrade 를 실행하세요")
+            schedule_storage_gc()
+            schedule_video_upload_expiry()
+        except Exception as e:
+            print(f"Error checking database schema: {e}")
+        _bootstrapped_pid = os.getpid()
+
+@app.before_request
+def ensure_bootstrapped():
+    bootstrap_app()
+
+def reset_after_fork():
+    """fork 된 자식 프로세스는 부모가 열어 둔 DB 연결을 버리고 새로 연결"""
+    with app.app_context():
+        db.engine.dispose(close=False)
+    pool_stats.reset()
+
+os.register_at_fork(after_in_child=reset_after_fork)
+
+# ============================================
+# 백그라운드 작업 큐
+# ============================================
+JOB_HANDLERS = {}
+
+def job_handler(kind):
+    """작업 종류별 처리 함수 등록"""
+    def decorator(f):
+        JOB_HANDLERS[kind] = f
+        return f
+    return decorator
+
+def enqueue_job(kind, payload, max_attempts=3, run_after=None):
+    """작업을 현재 DB 세션에 추가 (요청의 commit 과 함께 저장되므로 롤백되면 작업도 취소됨)"""
+    job = Job(kind=kind, payload=json.dumps(payload, ensure_ascii=False), max_attempts=max_attempts,
+              run_after=run_after or datetime.utcnow())
+    db.session.add(job)
+    job_queue.wake()
+    return job
+
+class JobQueue:
+    """DB 테이블(job) 기반 작업 큐를 워커 프로세스 안의 스레드들이 처리
+
+    여러 gunicorn 워커가 같은 테이블을 보더라도 조건부 UPDATE 로 작업을 가져가므로
+    한 작업은 한 번만 실행된다. 실패하면 지수 백오프로 max_attempts 까지 재시도한다.
+    """
+
+    def __init__(self, num_workers, poll_interval, timeout):
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        self._next_requeue = 0
+
+    def start(self):
+        if self.num_workers <= 0 or (self._pid == os.getpid() and all(t.is_alive() for t in self._threads)):
+            return
+        with self._lock:
+            if self._pid == os.getpid() and all(t.is_alive() for t in self._threads):
+                return
+            self._pid = os.getpid()
+            self._threads = [
+                threading.Thread(target=self._run, name=f'job-worker-{i}', daemon=True)
+                for i in range(self.num_workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            try:
+                with app.app_context():
+                    processed = self.run_pending()
+            except Exception as e:
+                print(f"작업 큐 오류: {e}")
+                processed = 0
+            if not processed:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def requeue_stale(self, now):
+        """실행 도중 워커가 죽어 timeout 보다 오래 running 으로 남은 작업 정리
+
+        재시도 횟수가 남았으면 다시 대기열로, max_attempts 를 다 썼으면 failed 로 표시한다.
+        """
+        stale = (Job.status == 'running', Job.started_at < now - timedelta(seconds=self.timeout))
+        Job.query.filter(*stale, Job.attempts < Job.max_attempts) \
+            .update({'status': 'pending', 'last_error': '작업 시간 초과'}, synchronize_session=False)
+        Job.query.filter(*stale) \
+            .update({'status': 'failed', 'last_error': '작업 시간 초과', 'finished_at': now}, synchronize_session=False)
+        db.session.commit()
+
+    def claim(self):
+        """실행할 작업 하나를 가져와 running 으로 표시, 없으면 None"""
+        now = datetime.utcnow()
+        # 오래 걸린 작업 정리는 폴링마다가 아니라 timeout 에 한 번만 (매번 UPDATE + COMMIT 하지 않도록)
+        if time.monotonic() >= self._next_requeue:
+            self._next_requeue = time.monotonic() + self.timeout
+            self.requeue_stale(now)
+
+        candidates = db.session.query(Job.id).filter(Job.status == 'pending', Job.run_after <= now) \
+            .order_by(Job.run_after, Job.id).limit(5).all()
+        for (job_id,) in candidates:
+            claimed = Job.query.filter(Job.id == job_id, Job.status == 'pending').update({
+                'status': 'running',
+                'started_at': now,
+                'attempts': Job.attempts + 1,
+            }, synchronize_session=False)
+            db.session.commit()
+            if claimed:
+                return db.session.get(Job, job_id)
+        return None
+
+    def run_pending(self, limit=None):
+        """대기 중인 작업을 처리하고 처리한 개수를 반환"""
+        processed = 0
+        while limit is None or processed < limit:
+            job = self.claim()
+            if job is None:
+                break
+            self.execute(job)
+            processed += 1
+        return processed
+
+    def execute(self, job):
+        try:
+            handler = JOB_HANDLERS[job.kind]
+            handler(json.loads(job.payload or '{}'))
+            job.status = 'done'
+            job.last_error = None
+        except Exception as e:
+            db.session.rollback()
+            job.last_error = f'{type(e).__name__}: {e}'
+            if job.attempts < job.max_attempts:
+                job.status = 'pending'
+                job.run_after = datetime.utcnow() + timedelta(seconds=5 * 2 ** job.attempts)
+            else:
+                job.status = 'failed'
+            print(f"작업 실패 ({job.kind} #{job.id}): {job.last_error}")
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+job_queue = JobQueue(
+    app.config['JOB_WORKERS'],
+    app.config['JOB_POLL_INTERVAL'],
+    app.config['JOB_TIMEOUT'],
+)
+
+@app.before_request
+def start_job_workers():
+    # fork 이후 각 워커 프로세스에서 처음 요청을 받을 때 작업 스레드 시작
+    job_queue.start()
 
 # ============================================
 # 유틸리티 함수들
@@ -158,33 +1097,70 @@ def extract_date_from_content(content):
     
     return None
 
+def extract_video_performance_date(description):
+    """영상 설명에서 공연 날짜(YYYY.MM.DD) 추출"""
+    if not description:
+        return None
+    
+    date_match = re.search(r'(\d{4})\.(\d{1,2})\.(\d{1,2})', description)
+    if date_match:
+        try:
+            year, month, day = int(date_match.group(1)), int(date_match.group(2)), int(date_match.group(3))
+            return datetime(year, month, day).date()
+        except ValueError:
+            return None
+    return None
+
+def parse_form_date(value):
+    """폼의 YYYY-MM-DD 날짜 문자열을 date 로 변환"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+def update_post_performance_date(post):
+    """작성/수정 시점에 본문에서 공연 날짜를 추출해 저장 (렌더링 시에는 정규식을 실행하지 않음)"""
+    extracted_date = extract_date_from_content(post.content)
+    post.performance_date = extracted_date.date() if extracted_date else None
+
+def update_video_performance_date(video, form_value=None):
+    """폼에 입력된 공연 날짜가 없으면 설명에서 추출해 저장"""
+    video.performance_date = parse_form_date(form_value) or extract_video_performance_date(video.description)
+
+def query_session(session=None):
+    """조회 헬퍼/읽기 뷰가 쓸 세션 (ASGI 모드에서는 비동기 드라이버 위의 세션이 전달됨)"""
+    return db.session if session is None else session
+
 def get_display_date(post):
     """게시글 표시용 날짜 반환"""
-    try:
-        extracted_date = extract_date_from_content(post.content)
-        if extracted_date:
-            return extracted_date + timedelta(days=1)
-        return post.date_posted
-    except:
-        return post.date_posted
+    if post.performance_date:
+        return datetime.combine(post.performance_date, datetime.min.time()) + timedelta(days=1)
+    return post.date_posted
 
-def get_post_images(post):
-    """게시글의 모든 이미지를 순서대로 가져오기"""
+def parse_year_filter():
+    """?year= 쿼리 파라미터를 공연 날짜 범위로 변환"""
+    year = request.args.get('year', type=int)
+    if year and 1900 <= year <= 2100:
+        return year, datetime(year, 1, 1).date(), datetime(year + 1, 1, 1).date()
+    return None, None, None
+
+def get_post_images(post, session=None):
+    """게시글의 모든 이미지를 순서대로 가져오기 (객체 캐시 사용)"""
     try:
-        return PostImage.query.filter_by(post_id=post.id).order_by(PostImage.display_order, PostImage.id).all()
+        return cached_post_images(post.id, session)
     except:
         return []
 
 def get_primary_image(post):
     """게시글의 대표 이미지 가져오기"""
     try:
-        primary = PostImage.query.filter_by(post_id=post.id, is_primary=True).first()
+        images = get_post_images(post)
+        primary = next((image for image in images if image.is_primary), None)
         if primary:
             return primary
         
-        first_image = PostImage.query.filter_by(post_id=post.id).order_by(PostImage.display_order, PostImage.id).first()
-        if first_image:
-            return first_image
+        if images:
+            return images[0]
         
         if hasattr(post, 'image_filename') and post.image_filename:
             return type('obj', (object,), {'filename': post.image_filename, 'is_primary': True})()
@@ -196,13 +1172,150 @@ def get_primary_image(post):
 def get_image_count(post):
     """게시글의 이미지 개수"""
     try:
-        count = PostImage.query.filter_by(post_id=post.id).count()
+        count = len(get_post_images(post))
         if hasattr(post, 'image_filename') and post.image_filename and count == 0:
             count = 1
         return count
     except:
         return 0
 
+def load_post_image_summaries(posts, session=None):
+    """페이지에 표시될 게시글들의 대표 이미지/이미지 개수를 한 번에 조회
+
+    게시글마다 PostImage 를 따로 조회하지 않도록 집계 쿼리 2개로 처리한다.
+    반환값: {post_id: {'primary': filename 또는 None, 'count': int}}
+    """
+    summaries = {post.id: {'primary': None, 'count': 0} for post in posts}
+    if not summaries:
+        return summaries
+
+    try:
+        post_ids = list(summaries.keys())
+
+        session = query_session(session)
+        counts = session.query(PostImage.post_id, db.func.count(PostImage.id)) \
+            .filter(PostImage.post_id.in_(post_ids)) \
+            .group_by(PostImage.post_id).all()
+        for post_id, count in counts:
+            summaries[post_id]['count'] = count
+
+        # 게시글별 대표 이미지: is_primary 우선, 그 다음 display_order, id 순
+        ranked = session.query(
+            PostImage.post_id,
+            PostImage.filename,
+            db.func.row_number().over(
+                partition_by=PostImage.post_id,
+                order_by=(PostImage.is_primary.desc(), PostImage.display_order, PostImage.id)
+            ).label('rank')
+        ).filter(PostImage.post_id.in_(post_ids)).subquery()
+        primaries = session.query(ranked.c.post_id, ranked.c.filename).filter(ranked.c.rank == 1).all()
+        for post_id, filename in primaries:
+            summaries[post_id]['primary'] = filename
+    except Exception as e:
+        print(f"이미지 요약 조회 오류: {e}")
+
+    # 다중 이미지가 없는 예전 게시글은 단일 이미지(image_filename)로 대체
+    for post in posts:
+        summary = summaries[post.id]
+        if summary['count'] == 0 and post.image_filename:
+            summary['primary'] = post.image_filename
+            summary['count'] = 1
+
+    return summaries
+
+def encode_cursor(timestamp, row_id):
+    """키셋 페이지네이션용 커서 (게시글은 date_posted, 영상은 date_uploaded 와 id)"""
+    return f"{timestamp.strftime('%Y%m%d%H%M%S%f')}-{row_id}"
+
+def decode_cursor(cursor):
+    """커서 문자열을 (timestamp, id) 로 변환, 잘못된 값이면 None"""
+    try:
+        date_part, id_part = cursor.split('-', 1)
+        return datetime.strptime(date_part, '%Y%m%d%H%M%S%f'), int(id_part)
+    except (AttributeError, ValueError):
+        return None
+
+# 업로드 이미지는 방향 보정/메타데이터 제거를 마친 내용의 해시 파일명으로 한 번만 저장하고 upload_blob 의 참조 수로 공유
+# (해시 주소로 immutable 캐시되므로 저장한 뒤에는 내용을 바꾸지 않음, 파생본만 백그라운드에서 생성)
+def normalize_upload(image_file):
+    """업로드 이미지의 EXIF 방향을 적용하고 위치 정보 등 메타데이터를 지운 내용 (GIF 는 원본 그대로)
+
+    저장 파일명이 정규화된 내용의 해시이므로 요청 스레드에서 다시 인코딩한다. 업로드 요청이 이미지
+    한 장당 디코딩 + 인코딩 시간(수십~수백 ms)만큼 느려지는 대신, 원본 EXIF(GPS 등)가 저장소에
+    한 번도 쓰이지 않고 같은 사진은 처음부터 한 파일로 합쳐진다. 관리자만 올리므로 이 비용을 감수한다.
+    """
+    stream = image_file.stream
+    stream.seek(0)
+    if not supports_derivatives(image_file.filename):
+        return stream
+    with Image.open(stream) as probe:
+        # Image.open 은 헤더만 읽으므로 픽셀을 풀기 전에 크기를 확인할 수 있음
+        if probe.width * probe.height > app.config['MAX_IMAGE_PIXELS']:
+            raise ValueError(f'이미지가 너무 큽니다 ({probe.width}x{probe.height})')
+    stream.seek(0)
+    image = load_oriented_image(stream)
+    normalized = io.BytesIO()
+    save_image(image, normalized, os.path.splitext(image_file.filename)[1].lower())
+    normalized.seek(0)
+    return normalized
+
+def upload_filename(image_file):
+    """저장할 내용과 그 SHA-256 으로 만든 파일명, 크기 (같은 사진이면 같은 이름)"""
+    stream = normalize_upload(image_file)
+    hasher = hashlib.sha256()
+    size = 0
+    for block in iter(lambda: stream.read(1024 * 1024), b''):
+        hasher.update(block)
+        size += len(block)
+    stream.seek(0)
+    extension = image_file.filename.rsplit('.', 1)[1].lower().replace('jpeg', 'jpg')
+    return stream, f'{hasher.hexdigest()[:32]}.{extension}', size
+
+def retain_upload(stream, filename, size):
+    """filename 의 참조 수 +1, 처음 보는 내용이면 저장소에 쓰고 파생본 생성 예약
+
+    동시에 같은 사진이 올라와도 INSERT ... ON CONFLICT 한 문장으로 행을 만들거나 참조 수를 올리므로
+    기본 키 충돌이 나지 않고, 참조 수가 1 이 된 요청 하나만 파일을 쓴다.
+    """
+    insert = postgresql_insert if db.engine.dialect.name == 'postgresql' else sqlite_insert
+    statement = insert(UploadBlob).values(filename=filename, size=size, ref_count=1, date_created=datetime.utcnow())
+    statement = statement.on_conflict_do_update(
+        index_elements=[UploadBlob.filename],
+        set_={'ref_count': UploadBlob.ref_count + 1},
+    ).returning(UploadBlob.ref_count)
+    if db.session.execute(statement).scalar() > 1:
+        return
+    upload_storage.save(f'uploads/{filename}', stream)
+    process_uploaded_image(filename)
+
+def store_upload(image_file):
+    """업로드 이미지를 저장(또는 같은 내용의 기존 파일을 재사용)하고 파일명 반환"""
+    stream, filename, size = upload_filename(image_file)
+    retain_upload(stream, filename, size)
+    return filename
+
+def release_uploads(filenames):
+    """참조 수 -1, 더 이상 아무 데서도 쓰지 않는 파일(참조 기록이 없는 파일 포함)은 삭제 예약"""
+    counts = Counter(filename for filename in filenames if filename)
+    if not counts:
+        return
+    for filename, count in counts.items():
+        UploadBlob.query.filter_by(filename=filename) \
+            .update({'ref_count': UploadBlob.ref_count - count}, synchronize_session=False)
+    ref_counts = dict(db.session.query(UploadBlob.filename, UploadBlob.ref_count)
+                      .filter(UploadBlob.filename.in_(list(counts))))
+    unreferenced = [filename for filename in counts if ref_counts.get(filename, 0) <= 0]
+    if unreferenced:
+        # 행은 참조 수 0 으로 남겨 두고 delete_uploads 작업이 조건부 DELETE 로 지움 (기록이 없던 파일도 행을 만듦)
+        UploadBlob.query.filter(UploadBlob.filename.in_(unreferenced)) \
+            .update({'ref_count': 0}, synchronize_session=False)
+        insert = postgresql_insert if db.engine.dialect.name == 'postgresql' else sqlite_insert
+        for filename in unreferenced:
+            if filename not in ref_counts:
+                db.session.execute(insert(UploadBlob).values(filename=filename, size=0, ref_count=0)
+                                   .on_conflict_do_nothing(index_elements=[UploadBlob.filename]))
+        enqueue_job('delete_uploads', {'filenames': unreferenced})
+
 def save_post_images(post_id, image_files):
     """게시글의 여러 이미지를 저장"""
     saved_images = []
@@ -210,78 +1323,1769 @@ def save_post_images(post_id, image_files):
     for index, image_file in enumerate(image_files):
         if image_file and image_file.filename != '' and allowed_file(image_file.filename):
             try:
-                filename = secure_filename(image_file.filename)
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                file_extension = os.path.splitext(filename)[1].lower()
-                new_filename = f"post_{post_id}_{timestamp}_{index}{file_extension}"
-                
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], new_filename)
-                image_file.save(filepath)
-                
+                filename = store_upload(image_file)
                 post_image = PostImage(
                     post_id=post_id,
-                    filename=new_filename,
+                    filename=filename,
                     display_order=index,
                     is_primary=(index == 0)
                 )
                 db.session.add(post_image)
-                saved_images.append(new_filename)
+                saved_images.append(filename)
             except Exception as e:
                 print(f"이미지 저장 오류: {e}")
                 continue
     
     return saved_images
 
-def delete_post_images(post_id):
-    """게시글의 모든 이미지 삭제"""
-    try:
-        images = PostImage.query.filter_by(post_id=post_id).all()
-        for image in images:
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], image.filename)
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            db.session.delete(image)
-        return True
-    except Exception as e:
-        print(f"이미지 삭제 오류: {e}")
-        return False
+def sync_post_images(post_id, image_files):
+    """게시글 이미지를 새로 올린 목록으로 교체 (게시글 수정)
+
+    내용이 같은 기존 이미지는 파일을 다시 쓰지 않고 행을 재사용해 순서만 바꾸고,
+    목록에서 빠진 이미지만 참조를 해제한다.
+    """
+    existing = {}
+    for image in PostImage.query.filter_by(post_id=post_id).order_by(PostImage.display_order, PostImage.id):
+        existing.setdefault(image.filename, []).append(image)
+
+    synced = []
+    for image_file in image_files:
+        if not (image_file and image_file.filename != '' and allowed_file(image_file.filename)):
+            continue
+        try:
+            stream, filename, size = upload_filename(image_file)
+            if existing.get(filename):
+                image = existing[filename].pop(0)
+            else:
+                retain_upload(stream, filename, size)
+                image = PostImage(post_id=post_id, filename=filename)
+                db.session.add(image)
+            image.display_order = len(synced)
+            image.is_primary = not synced
+            synced.append(filename)
+        except Exception as e:
+            print(f"이미지 저장 오류: {e}")
+
+    removed = [image for images in existing.values() for image in images]
+    for image in removed:
+        db.session.delete(image)
+    release_uploads([image.filename for image in removed])
+    return synced
+
+def replace_post_image(post, image_file):
+    """게시글 대표 이미지(단일 이미지 입력) 교체, 같은 내용이면 그대로 둠"""
+    stream, filename, size = upload_filename(image_file)
+    if filename == post.image_filename:
+        return
+    retain_upload(stream, filename, size)
+    release_uploads([post.image_filename])
+    post.image_filename = filename
+
+def delete_post_images(post_id):
+    """게시글의 모든 이미지 삭제 (참조가 없어진 파일은 백그라운드 작업으로 삭제)"""
+    try:
+        images = PostImage.query.filter_by(post_id=post_id).all()
+        for image in images:
+            db.session.delete(image)
+        release_uploads([image.filename for image in images])
+        return True
+    except Exception as e:
+        print(f"이미지 삭제 오류: {e}")
+        return False
+
+# 이미지 파생본(반응형 크기 + WebP) 관련 유틸리티
+def derivative_rel_path(rel_path, width, ext):
+    """static 기준 원본 경로에 대한 파생본 경로 (static 기준)"""
+    directory, name = os.path.split(rel_path)
+    stem = os.path.splitext(name)[0]
+    return '/'.join(part for part in ('derived', directory, f'{stem}_{width}w{ext}') if part)
+
+def derivative_fallback_ext(rel_path):
+    """WebP 를 지원하지 않는 브라우저용 파생본 형식 (PNG 는 투명도 유지)"""
+    return '.png' if rel_path.lower().endswith('.png') else '.jpg'
+
+def supports_derivatives(rel_path):
+    # 애니메이션 GIF 는 그대로 사용
+    return os.path.splitext(rel_path)[1].lower() in ('.jpg', '.jpeg', '.png')
+
+def load_oriented_image(path):
+    """EXIF 방향을 적용한 이미지 로드 (path: 파일 경로 또는 파일 객체)"""
+    with Image.open(path) as image:
+        image.load()
+        return ImageOps.exif_transpose(image)
+
+def save_image(image, path, ext):
+    """메타데이터 없이 형식별 최적화 옵션으로 저장 (path: 파일 경로 또는 파일 객체)"""
+    if ext in ('.jpg', '.jpeg'):
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.save(path, 'JPEG', quality=IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+    elif ext == '.png':
+        image.save(path, 'PNG', optimize=True)
+    elif ext == '.webp':
+        image.save(path, 'WEBP', quality=IMAGE_WEBP_QUALITY, method=4)
+
+def generate_image_derivatives(rel_path, force=False, root=None):
+    """설정된 폭별로 원본 형식 + WebP 파생본 생성, 생성한 파일 수 반환 (root: 기본 static 폴더)"""
+    if not supports_derivatives(rel_path):
+        return 0
+
+    root = root or app.static_folder
+    source_path = os.path.join(root, rel_path)
+    image = load_oriented_image(source_path)
+    fallback_ext = derivative_fallback_ext(rel_path)
+
+    # 원본보다 큰 폭은 만들지 않음 (이미 작은 이미지는 원본을 그대로 사용)
+    widths = [w for w in IMAGE_VARIANT_WIDTHS if w < image.width]
+
+    created = 0
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = None
+        for ext in (fallback_ext, '.webp'):
+            target = os.path.join(root, derivative_rel_path(rel_path, width, ext))
+            if not force and os.path.exists(target):
+                continue
+            if resized is None:
+                resized = image.resize((width, height), Image.LANCZOS)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            save_image(resized, target, ext)
+            created += 1
+    return created
+
+def remove_image_derivatives(rel_path):
+    """원본 삭제 시 파생본도 함께 삭제"""
+    directory = os.path.join(app.static_folder, 'derived', os.path.dirname(rel_path))
+    stem = os.path.splitext(os.path.basename(rel_path))[0]
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if re.fullmatch(re.escape(stem) + r'_\d+w\.(jpg|png|webp)', name):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError as e:
+                print(f"파생 이미지 삭제 오류: {e}")
+
+def derivative_rel_paths(rel_path):
+    """rel_path 에 대해 만들 수 있는 모든 파생본 경로 (실제로 있는지는 원본 폭에 따라 다름)"""
+    if not supports_derivatives(rel_path):
+        return []
+    return [derivative_rel_path(rel_path, width, ext) for width in IMAGE_VARIANT_WIDTHS
+            for ext in (derivative_fallback_ext(rel_path), '.webp')]
+
+def process_uploaded_image(filename):
+    """업로드 이미지의 파생본 생성을 백그라운드 작업으로 예약"""
+    enqueue_job('process_image', {'rel_path': f'uploads/{filename}'})
+
+@job_handler('process_image')
+def process_image_job(payload):
+    rel_path = payload['rel_path']
+    with upload_storage.workspace(rel_path) as root:
+        # 작업이 실행되기 전에 게시글과 함께 삭제된 경우
+        if root is None:
+            return
+        if not generate_image_derivatives(rel_path, root=root):
+            return
+    # 파생본이 생기기 전에 캐시된 페이지는 srcset 없이 렌더링되었으므로 이 이미지를 쓰는 게시글 페이지를 무효화
+    filename = rel_path[len('uploads/'):]
+    post_ids = {post_id for (post_id,) in db.session.query(PostImage.post_id).filter(PostImage.filename == filename)}
+    post_ids.update(post_id for (post_id,) in db.session.query(Post.id).filter(Post.image_filename == filename))
+    if post_ids:
+        response_cache.invalidate('posts', *[f'post:{post_id}' for post_id in sorted(post_ids)])
+
+@job_handler('delete_uploads')
+def delete_uploads_job(payload):
+    """참조 수가 0 인 채로 남은 업로드 파일 삭제
+
+    조건부 DELETE 로 upload_blob 행을 지운 뒤 commit 전에 파일을 지운다. 그 사이 같은 내용을 올리는
+    retain_upload 의 INSERT ... ON CONFLICT 는 행 잠금(SQLite 는 DB 쓰기 잠금)에서 기다렸다가 새 행을
+    만들고 파일을 다시 쓰며, 먼저 참조 수를 올렸다면 DELETE 가 0 행이 되어 파일을 남긴다.
+    행이 없는 파일(이 방식 이전에 예약된 작업)은 건드리지 않고 저장소 점검(storage gc)에 맡긴다.
+    """
+    for filename in payload.get('filenames', []):
+        deleted = UploadBlob.query.filter(UploadBlob.filename == filename, UploadBlob.ref_count <= 0) \
+            .delete(synchronize_session=False)
+        if deleted:
+            upload_storage.delete([f'uploads/{filename}'] + derivative_rel_paths(f'uploads/{filename}'))
+        db.session.commit()
+
+@job_handler('delete_files')
+def delete_files_job(payload):
+    for path in payload.get('files', []):
+        if os.path.exists(path):
+            os.remove(path)
+    for rel_path in payload.get('derivatives', []):
+        remove_image_derivatives(rel_path)
+
+def available_derivative_widths(rel_path, storage=None):
+    storage = storage or static_storage
+    fallback_ext = derivative_fallback_ext(rel_path)
+    return [w for w in IMAGE_VARIANT_WIDTHS if storage.exists(derivative_rel_path(rel_path, w, fallback_ext))]
+
+def responsive_image(rel_path, alt='', sizes='100vw', storage=None, **attrs):
+    """파생본이 있으면 WebP <source> 와 srcset 을 포함한 <picture> 태그 생성 (storage: 기본 static 폴더)"""
+    storage = storage or static_storage
+    extra = ''.join(f' {key.replace("_", "-")}="{escape(value)}"' for key, value in attrs.items())
+    widths = available_derivative_widths(rel_path, storage) if supports_derivatives(rel_path) else []
+
+    if not widths:
+        src = storage.url(rel_path)
+        return Markup(f'<picture><img src="{escape(src)}" alt="{escape(alt)}"{extra}></picture>')
+
+    def srcset(ext):
+        return ', '.join(f"{storage.url(derivative_rel_path(rel_path, w, ext))} {w}w" for w in widths)
+
+    fallback_ext = derivative_fallback_ext(rel_path)
+    src = storage.url(derivative_rel_path(rel_path, widths[-1], fallback_ext))
+    return Markup(
+        f'<picture>'
+        f'<source type="image/webp" srcset="{escape(srcset(".webp"))}" sizes="{escape(sizes)}">'
+        f'<img src="{escape(src)}" srcset="{escape(srcset(fallback_ext))}" sizes="{escape(sizes)}" alt="{escape(alt)}"{extra}>'
+        f'</picture>'
+    )
+
+def upload_image(filename, alt='', sizes='100vw', **attrs):
+    """업로드 저장소의 게시글 이미지 <picture> 태그"""
+    return responsive_image(f'uploads/{filename}', alt=alt, sizes=sizes, storage=upload_storage, **attrs)
+
+def upload_url(filename):
+    return upload_storage.url(f'uploads/{filename}')
+
+# 비디오 관련 유틸리티
+def extract_youtube_video_id(url):
+    """YouTube URL에서 비디오 ID 추출"""
+    patterns = [
+        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
+        r'youtube\.com\/watch\?.*v=([^&\n?#]+)'
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    return None
+
+def extract_vimeo_video_id(url):
+    """Vimeo URL에서 비디오 ID 추출"""
+    pattern = r'vimeo\.com\/(?:.*\/)?(\d+)'
+    match = re.search(pattern, url)
+    return match.group(1) if match else None
+
+def get_video_embed_url(video):
+    """비디오 임베드 URL 생성"""
+    if video.platform == 'youtube':
+        return f"https://www.youtube.com/embed/{video.video_id}"
+    elif video.platform == 'vimeo':
+        return f"https://player.vimeo.com/video/{video.video_id}"
+    elif video.platform == 'local' and video.video_filename:
+        return url_for('stream_video', filename=video.video_filename)
+    return None
+
+def get_video_thumbnail_url(video):
+    """비디오 썸네일 URL"""
+    if video.thumbnail_filename:
+        return url_for('static', filename=f'uploads/thumbnails/{video.thumbnail_filename}')
+    elif video.platform == 'youtube' and video.video_id:
+        return f"https://img.youtube.com/vi/{video.video_id}/hqdefault.jpg"
+    return None
+
+# 태그 관련 유틸리티 (video_tag 연결 테이블이 기준, Video.tags 문자열은 편집 폼/검색 색인용 사본)
+def parse_tag_names(raw):
+    """쉼표로 구분된 태그 문자열을 정규화된 태그 이름 목록으로 변환 (입력 순서 유지, 중복 제거)"""
+    names = []
+    for part in (raw or '').split(','):
+        name = ' '.join(part.split()).lstrip('#').strip()[:50]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def refresh_tag_counts(tag_ids):
+    """태그별 영상 수 캐시 컬럼 갱신"""
+    if not tag_ids:
+        return
+    count = db.select(db.func.count()).select_from(video_tag) \
+        .where(video_tag.c.tag_id == Tag.id).scalar_subquery()
+    Tag.query.filter(Tag.id.in_(tag_ids)).update({Tag.video_count: count}, synchronize_session=False)
+
+def set_video_tags(video, raw):
+    """영상의 태그를 교체하고 영향을 받은 태그의 영상 수 갱신 (commit 은 호출하는 쪽에서)"""
+    names = parse_tag_names(raw)
+    existing = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(names))} if names else {}
+
+    tags = []
+    for name in names:
+        tag = existing.get(name)
+        if tag is None:
+            tag = Tag(name=name)
+            db.session.add(tag)
+        tags.append(tag)
+
+    previous_ids = {tag.id for tag in video.tag_items}
+    video.tag_items = tags
+    video.tags = ', '.join(names)
+    db.session.flush()
+    refresh_tag_counts(previous_ids | {tag.id for tag in tags})
+
+def backfill_video_tags(batch_size=200):
+    """기존 Video.tags 문자열을 tag/video_tag 테이블로 옮기고 태그가 있는 영상 수 반환 (여러 번 실행해도 안전)"""
+    migrated = 0
+    last_id = 0
+    while True:
+        videos = Video.query.filter(Video.id > last_id).order_by(Video.id).limit(batch_size).all()
+        if not videos:
+            break
+        for video in videos:
+            set_video_tags(video, video.tags)
+            if video.tag_items:
+                migrated += 1
+        last_id = videos[-1].id
+        db.session.commit()
+    return migrated
+
+def filter_videos(query):
+    """?year=, ?tag= 필터 적용, (query, tag, year) 반환"""
+    year, year_start, year_end = parse_year_filter()
+    if year:
+        query = query.filter(Video.performance_date >= year_start, Video.performance_date < year_end)
+    
+    # 태그 필터: 태그 이름(unique 인덱스) -> video_tag(tag_id 인덱스) -> 영상 순으로 조회
+    tag = request.args.get('tag', '').strip()
+    if tag:
+        query = query.join(video_tag, video_tag.c.video_id == Video.id) \
+            .join(Tag, Tag.id == video_tag.c.tag_id).filter(Tag.name == tag)
+    return query, tag, year
+
+def load_tag_cloud(limit=30, session=None):
+    """영상이 많은 순으로 태그 목록 (영상 수는 캐시 컬럼 사용)"""
+    return query_session(session).query(Tag).filter(Tag.video_count > 0) \
+        .order_by(Tag.video_count.desc(), Tag.name).limit(limit).all()
+
+# ============================================
+# 관련 영상 추천 (태그 겹침 + 제목/설명 TF-IDF + 공연 날짜 근접도)
+# ============================================
+VideoFeatures = namedtuple('VideoFeatures', 'ids index tags tag_sizes text days has_date')
+
+def build_video_features():
+    """전체 영상의 특징 행렬 생성 (행 = 영상)"""
+    # numpy 는 작업 워커에서만 필요하므로 웹 워커 시작 시간을 줄이기 위해 여기서 import
+    import numpy as np
+    videos = db.session.query(Video.id, Video.title, Video.description, Video.performance_date) \
+        .order_by(Video.id).all()
+    ids = np.array([video.id for video in videos], dtype=np.int64)
+    index = {video_id: i for i, video_id in enumerate(ids.tolist())}
+
+    # 태그: 영상 x 태그 0/1 행렬
+    links = db.session.query(video_tag.c.video_id, video_tag.c.tag_id).all()
+    tag_columns = {tag_id: i for i, tag_id in enumerate(sorted({tag_id for _, tag_id in links}))}
+    tags = np.zeros((len(ids), len(tag_columns)), dtype=np.float32)
+    for video_id, tag_id in links:
+        if video_id in index:
+            tags[index[video_id], tag_columns[tag_id]] = 1.0
+
+    # 제목/설명: 검색 색인과 같은 n-gram 토큰의 TF-IDF, 한 영상에만 나오는 토큰은 유사도에 기여하지 않으므로 제외
+    documents = [Counter(ngram_text(f'{video.title} {video.title} {video.description or ""}').split())
+                 for video in videos]
+    document_frequency = Counter(token for document in documents for token in document)
+    max_df = len(ids) * 0.5 if len(ids) >= 20 else len(ids)
+    vocabulary = [token for token, df in document_frequency.most_common() if 2 <= df <= max_df]
+    vocabulary = {token: i for i, token in enumerate(vocabulary[:RELATED_MAX_TEXT_FEATURES])}
+
+    text = np.zeros((len(ids), len(vocabulary)), dtype=np.float32)
+    for row, document in enumerate(documents):
+        for token, count in document.items():
+            column = vocabulary.get(token)
+            if column is not None:
+                text[row, column] = 1.0 + np.log(count)
+    if vocabulary:
+        idf = np.log(len(ids) / np.array([document_frequency[token] for token in vocabulary], dtype=np.float32)) + 1.0
+        text *= idf
+        norms = np.linalg.norm(text, axis=1, keepdims=True)
+        text /= np.where(norms > 0, norms, 1.0)
+
+    days = np.array([video.performance_date.toordinal() if video.performance_date else 0 for video in videos],
+                    dtype=np.float32)
+    has_date = np.array([video.performance_date is not None for video in videos], dtype=np.float32)
+    return VideoFeatures(ids, index, tags, tags.sum(axis=1), text, days, has_date)
+
+def related_scores(features, rows):
+    """rows 에 해당하는 영상과 전체 영상 사이의 유사도 행렬 (len(rows) x 영상 수)"""
+    import numpy as np
+    rows = np.asarray(rows, dtype=np.int64)
+
+    intersection = features.tags[rows] @ features.tags.T
+    union = features.tag_sizes[rows][:, None] + features.tag_sizes[None, :] - intersection
+    tag_score = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+    text_score = features.text[rows] @ features.text.T
+
+    distance = np.abs(features.days[rows][:, None] - features.days[None, :])
+    date_score = np.exp(-distance / RELATED_DATE_SCALE_DAYS) * features.has_date[rows][:, None] * features.has_date[None, :]
+
+    scores = (RELATED_WEIGHTS['tags'] * tag_score + RELATED_WEIGHTS['text'] * text_score
+              + RELATED_WEIGHTS['date'] * date_score)
+    scores[np.arange(len(rows)), rows] = -np.inf
+    return scores
+
+def top_related(features, scores, k):
+    """행마다 점수가 0 보다 큰 상위 k 개의 (영상 id, 점수)"""
+    import numpy as np
+    k = min(k, scores.shape[1] - 1)
+    if k <= 0:
+        return [[] for _ in range(scores.shape[0])]
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    results = []
+    for row, columns in zip(scores, candidates):
+        columns = columns[np.argsort(-row[columns], kind='stable')]
+        results.append([(int(features.ids[column]), float(row[column])) for column in columns if row[column] > 0])
+    return results
+
+def refresh_related_videos(changed_ids=(), rebuild_ids=()):
+    """
+    관련 영상 표 증분 갱신
+    - changed_ids: 추가/수정된 영상, 자기 목록을 다시 계산하고 다른 영상 목록에 끼어들 수 있는지 확인
+    - rebuild_ids: 자기 목록만 다시 계산 (삭제된 영상을 목록에서 잃은 경우 등)
+    """
+    features = build_video_features()
+    changed_rows = [features.index[video_id] for video_id in changed_ids if video_id in features.index]
+    rebuild = {video_id for video_id in rebuild_ids if video_id in features.index} | set(changed_ids)
+
+    if changed_rows:
+        current = {}
+        for entry in db.session.query(RelatedVideo.video_id, RelatedVideo.related_id, RelatedVideo.score):
+            current.setdefault(entry.video_id, []).append(entry)
+        # 유사도는 대칭이므로 변경된 영상의 행이 곧 다른 영상들에서 본 점수
+        scores = related_scores(features, changed_rows)
+        best = scores.max(axis=0)
+        changed = set(changed_ids)
+        for column, video_id in enumerate(features.ids.tolist()):
+            entries = current.get(video_id, [])
+            if any(entry.related_id in changed for entry in entries):
+                rebuild.add(video_id)
+            elif best[column] > 0 and (len(entries) < RELATED_VIDEOS_STORED or best[column] > min(entry.score for entry in entries)):
+                rebuild.add(video_id)
+
+    rebuild = sorted(video_id for video_id in rebuild if video_id in features.index)
+    for start in range(0, len(rebuild), 500):
+        batch = rebuild[start:start + 500]
+        rows = [features.index[video_id] for video_id in batch]
+        neighbours = top_related(features, related_scores(features, rows), RELATED_VIDEOS_STORED)
+        RelatedVideo.query.filter(RelatedVideo.video_id.in_(batch)).delete(synchronize_session=False)
+        entries = [{'video_id': video_id, 'rank': rank, 'related_id': related_id, 'score': score}
+                   for video_id, related in zip(batch, neighbours)
+                   for rank, (related_id, score) in enumerate(related)]
+        if entries:
+            db.session.execute(RelatedVideo.__table__.insert(), entries)
+    db.session.commit()
+    object_cache.invalidate('related_ids')
+    return len(rebuild)
+
+def remove_related_videos(video_id):
+    """삭제되는 영상의 관련 영상 행 제거, 이 영상을 목록에 갖고 있던 영상 id 반환 (commit 은 호출하는 쪽에서)"""
+    referencing = [row.video_id for row in db.session.query(RelatedVideo.video_id)
+                   .filter(RelatedVideo.related_id == video_id).distinct()]
+    RelatedVideo.query.filter(db.or_(RelatedVideo.video_id == video_id, RelatedVideo.related_id == video_id)) \
+        .delete(synchronize_session=False)
+    return referencing
+
+@job_handler('refresh_related_videos')
+def refresh_related_videos_job(payload):
+    """대기 중인 다른 refresh_related_videos 작업까지 합쳐 특징 행렬을 한 번만 만들어 갱신
+
+    영상을 연달아 올리거나 고치면 작업이 영상마다 쌓이는데, 매번 전체 특징 행렬을 새로 만들므로 합쳐서 처리한다.
+    합친 작업은 갱신이 commit 된 뒤 아직 pending 인 것만 done 으로 표시하고, 그 사이 다른 워커가 가져간
+    작업은 한 번 더 계산될 뿐 결과는 같다.
+    """
+    changed = set(payload.get('changed', []))
+    rebuild = set(payload.get('rebuild', []))
+    absorbed = Job.query.filter(Job.kind == 'refresh_related_videos', Job.status == 'pending').all()
+    for job in absorbed:
+        merged = json.loads(job.payload or '{}')
+        changed.update(merged.get('changed', []))
+        rebuild.update(merged.get('rebuild', []))
+
+    refresh_related_videos(sorted(changed), sorted(rebuild))
+    if absorbed:
+        Job.query.filter(Job.id.in_([job.id for job in absorbed]), Job.status == 'pending') \
+            .update({'status': 'done', 'finished_at': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+
+# ============================================
+# 조회수/좋아요 카운터 버퍼
+# ============================================
+class CounterBuffer:
+    """조회수/좋아요 증가분을 워커 메모리에 모았다가 주기적으로 일괄 반영
+
+    요청마다 행을 읽고 증가시켜 COMMIT 하는 대신,
+    UPDATE video SET view_count = view_count + :amount 형태의 원자적 증가로 모아서 반영한다.
+    """
+    FIELDS = ('view_count', 'like_count')
+
+    def __init__(self, flush_interval):
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def increment(self, video_id, field, amount=1):
+        with self._lock:
+            key = (video_id, field)
+            self._pending[key] = self._pending.get(key, 0) + amount
+        
+        if self.flush_interval <= 0:
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+    def pending(self, video_id, field):
+        with self._lock:
+            return self._pending.get((video_id, field), 0)
+
+    def apply_pending(self, video):
+        """아직 반영되지 않은 증가분을 video 객체의 값에 합침 (세션을 dirty 로 만들지 않음)"""
+        for field in self.FIELDS:
+            delta = self.pending(video.id, field)
+            if delta:
+                self._set_value(video, field, (getattr(video, field) or 0) + delta)
+        return video
+
+    @staticmethod
+    def _set_value(video, field, value):
+        # ORM 객체는 세션을 dirty 로 만들지 않도록 committed 값으로, 캐시 사본(copy)은 속성으로 설정
+        if isinstance(video, CachedRow):
+            setattr(video, field, value)
+        else:
+            set_committed_value(video, field, value)
+
+    def record(self, video, field):
+        """대기 중인 증가분을 합친 뒤 field 를 1 증가시키고 그 값을 반환 (apply_pending 포함)"""
+        self.apply_pending(video)
+        current = (getattr(video, field) or 0) + 1
+        self.increment(video.id, field)
+        self._set_value(video, field, current)
+        return current
+
+    def flush(self):
+        """모인 증가분을 DB 에 반영, 실패하면 다음 주기에 다시 시도"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        
+        try:
+            with app.app_context():
+                with db.engine.begin() as conn:
+                    for field in self.FIELDS:
+                        params = [{'video_id': video_id, 'amount': amount}
+                                  for (video_id, f), amount in pending.items() if f == field]
+                        if params:
+                            conn.execute(db.text(
+                                f'UPDATE video SET {field} = COALESCE({field}, 0) + :amount WHERE id = :video_id'
+                            ), params)
+        except Exception as e:
+            print(f"카운터 반영 오류: {e}")
+            with self._lock:
+                for key, amount in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + amount
+            return 0
+        
+        object_cache.add_counts('video', pending)
+        return sum(pending.values())
+
+    def _ensure_flusher(self):
+        # fork 된 워커에서는 부모의 스레드가 없으므로 pid 기준으로 다시 시작
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='counter-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+counter_buffer = CounterBuffer(app.config['COUNTER_FLUSH_INTERVAL'])
+
+# 워커 정상 종료 시 남은 증가분 반영
+atexit.register(counter_buffer.flush)
+
+# ============================================
+# 캐시 유틸리티
+# ============================================
+class LRUCache:
+    """크기 제한과 항목별 만료 시간이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_entries, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires is not None and expires <= time.time():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+# ============================================
+# 공개 페이지 응답 캐시
+# ============================================
+CachedPage = namedtuple('CachedPage', ['body', 'content_type', 'etag', 'last_modified', 'expires'])
+
+class SQLiteCacheStore:
+    """여러 gunicorn 워커가 공유하는 SQLite 파일 기반 캐시 저장소"""
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute("""CREATE TABLE IF NOT EXISTS response_cache (
+            key TEXT PRIMARY KEY, body BLOB, content_type TEXT,
+            etag TEXT, last_modified REAL, expires REAL)""")
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_generation (name TEXT PRIMARY KEY, version INTEGER NOT NULL)')
+        conn.execute('CREATE TABLE IF NOT EXISTS rate_counter (key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires REAL NOT NULL)')
+        conn.execute('CREATE TABLE IF NOT EXISTS rate_seen (key TEXT PRIMARY KEY, expires REAL NOT NULL)')
+        self._rate_writes = 0
+
+    def _connect(self):
+        # 스레드/프로세스(fork)마다 별도 연결 사용
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT body, content_type, etag, last_modified, expires FROM response_cache WHERE key = ?', (key,)
+        ).fetchone()
+        if row and row[4] > time.time():
+            return CachedPage(*row)
+        return None
+
+    def set(self, key, page):
+        conn = self._connect()
+        conn.execute('INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?, ?)', (key, *page))
+        # 만료된 항목을 정리하고, 최대 개수를 넘으면 만료가 가장 빠른 항목부터 삭제
+        conn.execute('DELETE FROM response_cache WHERE expires <= ?', (time.time(),))
+        conn.execute("""DELETE FROM response_cache WHERE key IN (
+            SELECT key FROM response_cache ORDER BY expires DESC LIMIT -1 OFFSET ?)""", (self.max_entries,))
+
+    def generations(self, names):
+        placeholders = ','.join('?' * len(names))
+        rows = self._connect().execute(
+            f'SELECT name, version FROM cache_generation WHERE name IN ({placeholders})', names
+        ).fetchall()
+        return dict(rows)
+
+    def bump(self, names):
+        conn = self._connect()
+        for name in names:
+            conn.execute("""INSERT INTO cache_generation (name, version) VALUES (?, 1)
+                ON CONFLICT(name) DO UPDATE SET version = version + 1""", (name,))
+
+    def hit_window(self, key, previous_key, ttl):
+        """요청 제한 카운터 key 를 1 올리고 (올린 값, previous_key 의 값) 반환"""
+        conn = self._connect()
+        now = time.time()
+        count = conn.execute("""INSERT INTO rate_counter (key, count, expires) VALUES (?, 1, ?)
+            ON CONFLICT(key) DO UPDATE SET count = count + 1 RETURNING count""", (key, now + ttl)).fetchone()[0]
+        row = conn.execute('SELECT count FROM rate_counter WHERE key = ? AND expires > ?', (previous_key, now)).fetchone()
+        self._purge_rate_rows(conn, now)
+        return count, row[0] if row else 0
+
+    def mark_seen(self, key, ttl):
+        """처음 보거나 기록이 만료된 key 이면 True (여러 워커가 동시에 불러도 한 곳만 True)"""
+        conn = self._connect()
+        now = time.time()
+        cursor = conn.execute("""INSERT INTO rate_seen (key, expires) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET expires = excluded.expires WHERE rate_seen.expires <= ?""",
+            (key, now + ttl, now))
+        self._purge_rate_rows(conn, now)
+        return cursor.rowcount == 1
+
+    def _purge_rate_rows(self, conn, now):
+        # 쓰기 1000번마다 만료된 카운터/중복 기록 정리
+        self._rate_writes += 1
+        if self._rate_writes % 1000 == 0:
+            conn.execute('DELETE FROM rate_counter WHERE expires <= ?', (now,))
+            conn.execute('DELETE FROM rate_seen WHERE expires <= ?', (now,))
+
+class ResponseCache:
+    """엔드포인트/인자/관리자 여부로 키를 만드는 전체 페이지 캐시
+
+    각 항목은 무효화 그룹(예: 'posts', 'post:3')에 속하고, 키에 그룹의 세대(generation) 번호가
+    들어간다. 관리자 수정 라우트가 그룹 세대를 올리면 이전 항목은 더 이상 조회되지 않는다.
+    워커 메모리의 LRU(TTL 포함)를 항상 사용하고, 공유 저장소가 있으면 그 뒤에 둔다.
+    """
+
+    def __init__(self, ttl, max_entries, shared_store=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared_store = shared_store
+        self._entries = LRUCache(max_entries)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def generations(self, groups):
+        if self.shared_store:
+            try:
+                versions = self.shared_store.generations(groups)
+                return [versions.get(group, 0) for group in groups]
+            except sqlite3.Error as e:
+                print(f"캐시 저장소 오류: {e}")
+        with self._lock:
+            return [self._generations.get(group, 0) for group in groups]
+
+    def make_key(self, groups):
+        args = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+        view_args = ','.join(f'{k}={v}' for k, v in sorted((request.view_args or {}).items()))
+        versions = ','.join(f'{g}@{v}' for g, v in zip(groups, self.generations(groups)))
+        admin = 'admin' if session.get('is_admin') else 'public'
+        return f'{request.endpoint}|{view_args}|{args}|{admin}|{versions}'
+
+    def get(self, key):
+        page = self._entries.get(key)
+        if page:
+            return page
+
+        if self.shared_store:
+            try:
+                page = self.shared_store.get(key)
+            except sqlite3.Error as e:
+                print(f"캐시 저장소 오류: {e}")
+                page = None
+            if page:
+                self._store_local(key, page)
+                return page
+        return None
+
+    def set(self, key, response):
+        body = response.get_data()
+        now = time.time()
+        page = CachedPage(body, response.content_type, hashlib.md5(body).hexdigest(), now, now + self.ttl)
+        self._store_local(key, page)
+        if self.shared_store:
+            try:
+                self.shared_store.set(key, page)
+            except sqlite3.Error as e:
+                print(f"캐시 저장소 오류: {e}")
+        return page
+
+    def _store_local(self, key, page):
+        self._entries.set(key, page, ttl=page.expires - time.time())
+
+    def invalidate(self, *groups):
+        """그룹 세대를 올려 해당 그룹에 속한 캐시 항목을 모두 무효화"""
+        with self._lock:
+            for group in groups:
+                self._generations[group] = self._generations.get(group, 0) + 1
+        if self.shared_store:
+            try:
+                self.shared_store.bump(groups)
+            except sqlite3.Error as e:
+                print(f"캐시 저장소 오류: {e}")
+
+def build_response_cache():
+    shared_store = None
+    if app.config['RESPONSE_CACHE_DB']:
+        try:
+            shared_store = SQLiteCacheStore(app.config['RESPONSE_CACHE_DB'], app.config['RESPONSE_CACHE_MAX_ENTRIES'])
+        except sqlite3.Error as e:
+            print(f"공유 캐시 저장소를 열 수 없습니다: {e}")
+    return ResponseCache(app.config['RESPONSE_CACHE_TTL'], app.config['RESPONSE_CACHE_MAX_ENTRIES'], shared_store)
+
+response_cache = build_response_cache()
+
+def page_response(page):
+    """캐시된 페이지로 응답 생성, If-None-Match/If-Modified-Since 가 일치하면 304"""
+    response = make_response(page.body)
+    response.content_type = page.content_type
+    response.set_etag(page.etag)
+    response.last_modified = datetime.utcfromtimestamp(int(page.last_modified))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Cookie')
+    return response.make_conditional(request)
+
+def cached_page(*groups):
+    """공개 페이지 캐시 데코레이터, 그룹 이름에 '{post_id}' 처럼 뷰 인자를 쓸 수 있음"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # 표시할 flash 메시지가 남아 있으면 캐시를 거치지 않음
+            if not app.config['RESPONSE_CACHE_ENABLED'] or request.method != 'GET' or '_flashes' in session:
+                return f(*args, **kwargs)
+
+            resolved_groups = [group.format(**kwargs) for group in groups]
+            if session.get('is_admin'):
+                # 관리자용 페이지는 메뉴 배지(미답변 문의 수)가 바뀔 때도 무효화
+                resolved_groups.append('admin')
+            key = response_cache.make_key(resolved_groups)
+            page = response_cache.get(key)
+            if page:
+                return page_response(page)
+
+            response = make_response(f(*args, **kwargs))
+            # 렌더링 중 flash 등으로 세션이 바뀐 응답은 다른 요청에 재사용하지 않음
+            if response.status_code != 200 or session.modified:
+                return response
+            return page_response(response_cache.set(key, response))
+        return decorated_function
+    return decorator
+
+# ============================================
+# 모델 객체 캐시 (게시글/영상 상세, 게시글 이미지 목록, 관련 영상 id)
+# ============================================
+class CachedRow:
+    """캐시에 보관하는 모델 행 사본 (템플릿과 헬퍼에서는 모델 객체처럼 속성으로 읽음)
+
+    여러 요청이 같은 사본을 공유하므로 값을 바꿔야 하면 copy() 한 뒤 바꾼다.
+    """
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    @classmethod
+    def from_model(cls, instance, **extra):
+        fields = {column.key: getattr(instance, column.key) for column in instance.__table__.columns}
+        return cls(**fields, **extra)
+
+    def copy(self):
+        return CachedRow(**self.__dict__)
+
+    def __repr__(self):
+        return f"<CachedRow {self.__dict__.get('id')}>"
+
+_MISSING = object()
+
+class ObjectCache:
+    """수정 전까지 바뀌지 않는 행을 워커 메모리에 두는 read-through 캐시
+
+    키는 (종류, id, 종류 스탬프, 항목 스탬프) 이다. 수정 라우트가 commit 후 invalidate 로 스탬프를
+    올리면 이전 사본은 더 이상 조회되지 않고 LRU 에서 밀려난다. 스탬프를 먼저 읽고 DB 를 읽으므로
+    수정과 겹친 요청이 옛 값을 넣더라도 옛 스탬프 키에만 들어간다.
+    공유 저장소(RESPONSE_CACHE_DB)가 있으면 스탬프를 워커 간에 공유한다.
+    """
+
+    def __init__(self, max_entries, ttl, shared_store=None, enabled=True):
+        self.max_entries = max_entries
+        self.shared_store = shared_store
+        self.enabled = enabled
+        self._entries = LRUCache(max_entries, ttl=ttl)
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def _stamps(self, names):
+        if self.shared_store:
+            try:
+                versions = self.shared_store.generations(names)
+                return [versions.get(name, 0) for name in names]
+            except sqlite3.Error as e:
+                print(f"캐시 저장소 오류: {e}")
+        with self._lock:
+            return [self._versions.get(name, 0) for name in names]
+
+    def _keys(self, kind, object_ids):
+        stamps = self._stamps([f'object:{kind}'] + [f'object:{kind}:{object_id}' for object_id in object_ids])
+        return [(kind, object_id, stamps[0], stamp) for object_id, stamp in zip(object_ids, stamps[1:])]
+
+    def get_many(self, kind, object_ids, loader):
+        """loader(캐시에 없는 id 목록) -> {id: 값}, 값이 None 이면 (없는 행) 캐시하지 않음"""
+        object_ids = list(dict.fromkeys(object_ids))
+        if not object_ids:
+            return {}
+        if not self.enabled:
+            with self._lock:
+                self.misses[kind] += len(object_ids)
+            loaded = loader(object_ids)
+            return {object_id: loaded.get(object_id) for object_id in object_ids}
+
+        results = {}
+        missing = []
+        for key in self._keys(kind, object_ids):
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                results[key[1]] = value
+        with self._lock:
+            self.hits[kind] += len(object_ids) - len(missing)
+            self.misses[kind] += len(missing)
+
+        if missing:
+            loaded = loader([key[1] for key in missing])
+            for key in missing:
+                value = loaded.get(key[1])
+                results[key[1]] = value
+                if value is not None:
+                    self._entries.set(key, value)
+        return results
+
+    def get(self, kind, object_id, loader):
+        return self.get_many(kind, [object_id], lambda object_ids: {object_id: loader(object_id)})[object_id]
+
+    def invalidate(self, kind, *object_ids):
+        """항목 스탬프를 올림, id 없이 호출하면 그 종류 전체를 무효화"""
+        names = [f'object:{kind}:{object_id}' for object_id in object_ids] or [f'object:{kind}']
+        with self._lock:
+            for name in names:
+                self._versions[name] = self._versions.get(name, 0) + 1
+        if self.shared_store:
+            try:
+                self.shared_store.bump(names)
+            except sqlite3.Error as e:
+                print(f"캐시 저장소 오류: {e}")
+
+    def add_counts(self, kind, increments):
+        """DB 에 반영된 카운터 증가분({(id, 필드): 증가분})을 캐시된 사본에도 더함"""
+        keys = self._keys(kind, sorted({object_id for object_id, _ in increments}))
+        with self._lock:
+            for key in keys:
+                row = self._entries.get(key)
+                if row is None:
+                    continue
+                for (object_id, field), amount in increments.items():
+                    if object_id == key[1]:
+                        setattr(row, field, (getattr(row, field) or 0) + amount)
+
+    def stats(self):
+        with self._lock:
+            kinds = {kind: {
+                'hits': self.hits[kind],
+                'misses': self.misses[kind],
+                'hit_ratio': round(self.hits[kind] / (self.hits[kind] + self.misses[kind]), 3),
+            } for kind in sorted(set(self.hits) | set(self.misses))}
+        return {'enabled': self.enabled, 'entries': len(self._entries), 'max_entries': self.max_entries, 'kinds': kinds}
+
+object_cache = ObjectCache(app.config['OBJECT_CACHE_MAX_ENTRIES'], app.config['OBJECT_CACHE_TTL'],
+                           response_cache.shared_store, app.config['OBJECT_CACHE_ENABLED'])
+
+def load_post_rows(post_ids, session):
+    return {post.id: CachedRow.from_model(post) for post in session.query(Post).filter(Post.id.in_(post_ids))}
+
+def load_post_image_rows(post_id, session):
+    images = session.query(PostImage).filter_by(post_id=post_id).order_by(PostImage.display_order, PostImage.id).all()
+    return [CachedRow.from_model(image) for image in images]
+
+def load_video_rows(video_ids, session):
+    videos = session.query(Video).options(db.selectinload(Video.tag_items)).filter(Video.id.in_(video_ids))
+    return {video.id: CachedRow.from_model(video, tag_items=[CachedRow.from_model(tag) for tag in video.tag_items])
+            for video in videos}
+
+def load_related_video_ids(video_id, session, limit=4):
+    """미리 계산된 관련 영상 id, 아직 계산 전이거나 부족하면 최신 영상으로 채움"""
+    related_ids = [row.related_id for row in session.query(RelatedVideo.related_id)
+                   .filter(RelatedVideo.video_id == video_id).order_by(RelatedVideo.rank).limit(limit)]
+    if len(related_ids) < limit:
+        related_ids += [row.id for row in session.query(Video.id)
+                        .filter(Video.id.notin_([video_id] + related_ids))
+                        .order_by(Video.date_uploaded.desc(), Video.id.desc()).limit(limit - len(related_ids))]
+    return related_ids
+
+def cached_post(post_id, session=None):
+    session = query_session(session)
+    return object_cache.get_many('post', [post_id], lambda post_ids: load_post_rows(post_ids, session)).get(post_id)
+
+def cached_post_images(post_id, session=None):
+    session = query_session(session)
+    return object_cache.get('post_images', post_id, lambda post_id: load_post_image_rows(post_id, session))
+
+def cached_videos(video_ids, session=None):
+    """{id: 영상 사본}, 없는 영상은 빠짐"""
+    session = query_session(session)
+    videos = object_cache.get_many('video', video_ids, lambda video_ids: load_video_rows(video_ids, session))
+    return {video_id: video for video_id, video in videos.items() if video is not None}
+
+def cached_video(video_id, session=None):
+    return cached_videos([video_id], session).get(video_id)
+
+def cached_related_videos(video_id, session=None):
+    session = query_session(session)
+    related_ids = object_cache.get('related_ids', video_id, lambda video_id: load_related_video_ids(video_id, session))
+    videos = cached_videos(related_ids, session)
+    return [videos[related_id] for related_id in related_ids if related_id in videos]
+
+# ============================================
+# 업로드 이미지 저장소 (로컬 static 폴더 / S3 호환 스토리지)
+# ============================================
+# 키는 static 기준 경로 ('uploads/<해시>.jpg', 'derived/uploads/<해시>_640w.webp')
+UPLOAD_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+CONTENT_HASH_UPLOAD = re.compile(r'(derived/)?uploads/[0-9a-f]{32}(_\d+w)?\.[a-z0-9]+')
+
+class LocalFileStorage:
+    """로컬 폴더(static)에 저장하고 /static 주소로 전송"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, key):
+        return os.path.join(self.root, key)
+
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+
+    def save(self, key, stream):
+        # 임시 파일에 쓰고 교체 (전송 중인 요청에 반쯤 쓴 파일이 보이지 않도록)
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(temp_path, 'wb') as f:
+            shutil.copyfileobj(stream, f, 1024 * 1024)
+        os.replace(temp_path, path)
+
+    def delete(self, keys):
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def iter_files(self, prefix):
+        """prefix 폴더 바로 아래 파일의 (key, 크기, 수정 시각), 하위 폴더와 숨김 파일은 제외"""
+        try:
+            entries = os.scandir(self.path(prefix))
+        except FileNotFoundError:
+            return
+        with entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith('.'):
+                    stat = entry.stat()
+                    yield f'{prefix}{entry.name}', stat.st_size, stat.st_mtime
+
+    def url(self, key):
+        return url_for('static', filename=key)
+
+    @contextmanager
+    def workspace(self, key):
+        """key 를 로컬 파일로 다룰 폴더 (그대로 static 폴더), 파일이 없으면 None"""
+        yield self.root if self.exists(key) else None
+
+class S3FileStorage:
+    """S3 호환 스토리지(AWS S3, MinIO 등)에 저장하고 공개 주소(S3_PUBLIC_URL)로 전송
+
+    존재 여부(HEAD)는 워커마다 기억해 페이지를 그릴 때마다 요청하지 않는다. 파생본은 작업이 끝나야
+    생기므로 없다는 결과는 잠깐만 기억한다. 이미지 정리/파생본 생성은 임시 폴더에 받아 처리하고 다시 올린다.
+    """
+
+    def __init__(self, bucket, endpoint_url=None, region=None, public_url=None, prefix=''):
+        import boto3
+
+        self.client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region)
+        self.bucket = bucket
+        self.prefix = prefix
+        default_url = f'{endpoint_url.rstrip("/")}/{bucket}' if endpoint_url else f'https://{bucket}.s3.amazonaws.com'
+        self.public_url = (public_url or default_url).rstrip('/')
+        self._exists = LRUCache(50000)
+
+    def object_key(self, key):
+        return f'{self.prefix}{key}'
+
+    def _missing(self, error):
+        return error.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound')
+
+    def exists(self, key):
+        found = self._exists.get(key)
+        if found is None:
+            try:
+                self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+                found = True
+            except self.client.exceptions.ClientError as e:
+                if not self._missing(e):
+                    raise
+                found = False
+            self._exists.set(key, found, ttl=None if found else 60)
+        return found
+
+    def save(self, key, stream):
+        content_type = mimetypes.guess_type(key)[0] or 'application/octet-stream'
+        self.client.upload_fileobj(stream, self.bucket, self.object_key(key), ExtraArgs={
+            'ContentType': content_type,
+            'CacheControl': UPLOAD_CACHE_CONTROL if CONTENT_HASH_UPLOAD.fullmatch(key) else 'public, max-age=3600',
+        })
+        self._exists.set(key, True)
+
+    def delete(self, keys):
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            self.client.delete_objects(Bucket=self.bucket, Delete={
+                'Objects': [{'Key': self.object_key(key)} for key in batch], 'Quiet': True})
+            for key in batch:
+                self._exists.delete(key)
+
+    def url(self, key):
+        return f'{self.public_url}/{self.object_key(key)}'
+
+    def iter_files(self, prefix):
+        """prefix 바로 아래 객체의 (key, 크기, 수정 시각), 1000개씩 나눠 받음"""
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.object_key(prefix), Delimiter='/'):
+            for item in page.get('Contents', []):
+                key = item['Key'][len(self.prefix):]
+                if not key.rsplit('/', 1)[-1].startswith('.'):
+                    yield key, item['Size'], item['LastModified'].timestamp()
+
+    @contextmanager
+    def workspace(self, key):
+        """key 를 임시 폴더에 받아 두고, 처리가 끝나면 폴더의 파일(정리한 원본 + 파생본)을 다시 올림"""
+        root = tempfile.mkdtemp(prefix='dayu-upload-')
+        try:
+            path = os.path.join(root, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                self.client.download_file(self.bucket, self.object_key(key), path)
+                found = True
+            except self.client.exceptions.ClientError as e:
+                if not self._missing(e):
+                    raise
+                found = False
+            yield root if found else None
+            if found:
+                for directory, _, filenames in os.walk(root):
+                    for filename in filenames:
+                        local_path = os.path.join(directory, filename)
+                        with open(local_path, 'rb') as f:
+                            self.save(os.path.relpath(local_path, root).replace(os.sep, '/'), f)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+def build_upload_storage():
+    if app.config['UPLOAD_STORAGE'] == 's3':
+        return S3FileStorage(app.config['S3_BUCKET'], app.config['S3_ENDPOINT_URL'], app.config['S3_REGION'],
+                             app.config['S3_PUBLIC_URL'], app.config['S3_PREFIX'])
+    return static_storage
+
+static_storage = LocalFileStorage(app.static_folder)
+upload_storage = build_upload_storage()
+
+@app.after_request
+def cache_content_addressed_uploads(response):
+    # 내용 해시 파일명의 업로드 이미지와 파생본은 같은 주소의 내용이 바뀌지 않음
+    if request.endpoint == 'static' and response.status_code in (200, 206, 304) \
+            and CONTENT_HASH_UPLOAD.fullmatch((request.view_args or {}).get('filename', '')):
+        response.headers['Cache-Control'] = UPLOAD_CACHE_CONTROL
+    return response
+
+# ============================================
+# 업로드 저장소 점검 (고아 파일 정리, 누락 파일, 참조 수, 사용량)
+# ============================================
+# 파일 삭제는 작업 큐에서 실패해도 재시도 후 포기하고, 글 작성 중 오류로 롤백되면 이미 쓴 파일이 남으므로
+# 주기적으로 폴더와 DB 를 맞춰 본다. 파일명은 컬럼 하나씩 나눠 읽어 집합으로 만들고 폴더는 한 항목씩 훑는다.
+DERIVATIVE_FILENAME = re.compile(r'(.+)_\d+w\.(jpg|png|webp)')
+STORAGE_GC_BATCH = 1000
+
+def storage_scopes():
+    """(이름, 저장소, 원본 경로, 파생본 경로, 파일명을 가리키는 컬럼들)"""
+    return [
+        ('uploads', upload_storage, 'uploads/', 'derived/uploads/', [PostImage.filename, Post.image_filename]),
+        ('thumbnails', static_storage, 'uploads/thumbnails/', 'derived/uploads/thumbnails/', [Video.thumbnail_filename]),
+        ('videos', static_storage, 'uploads/videos/', None, [Video.video_filename]),
+    ]
+
+def referenced_filenames(columns):
+    filenames = set()
+    for column in columns:
+        for (filename,) in db.session.query(column).filter(column.isnot(None)).distinct().yield_per(5000):
+            filenames.add(filename)
+    return filenames
+
+def check_storage_scope(storage, prefix, derived_prefix, columns, reclaim, grace):
+    """폴더 하나를 DB 참조와 비교해 통계와 고아/누락 파일 예시를 반환 (reclaim 이면 고아 파일 삭제)"""
+    unseen = referenced_filenames(columns)
+    stems = {os.path.splitext(filename)[0] for filename in unseen}
+    referenced_count = len(unseen)
+    cutoff = time.time() - grace
+    stats = Counter()
+    orphans = []
+    pending = []
+
+    def orphan(key, size, derived=False):
+        kind = 'derived_orphan' if derived else 'orphan'
+        stats[f'{kind}_files'] += 1
+        stats[f'{kind}_bytes'] += size
+        if len(orphans) < 20:
+            orphans.append(key)
+        if reclaim:
+            pending.append((key, size))
+            if len(pending) >= STORAGE_GC_BATCH:
+                flush()
+
+    def flush():
+        storage.delete([key for key, _ in pending])
+        stats['reclaimed_files'] += len(pending)
+        stats['reclaimed_bytes'] += sum(size for _, size in pending)
+        pending.clear()
+
+    for key, size, mtime in storage.iter_files(prefix):
+        filename = key[len(prefix):]
+        stats['files'] += 1
+        stats['bytes'] += size
+        if filename in unseen:
+            unseen.discard(filename)
+        elif mtime <= cutoff:
+            # 방금 쓴 파일은 아직 commit 전일 수 있으므로 grace 가 지나야 고아로 봄
+            orphan(key, size)
+
+    if derived_prefix:
+        for key, size, mtime in storage.iter_files(derived_prefix):
+            stats['derived_files'] += 1
+            stats['derived_bytes'] += size
+            match = DERIVATIVE_FILENAME.fullmatch(key[len(derived_prefix):])
+            if (not match or match.group(1) not in stems) and mtime <= cutoff:
+                orphan(key, size, derived=True)
+
+    if pending:
+        flush()
+    stats['referenced'] = referenced_count
+    stats['missing'] = len(unseen)
+    return {'stats': dict(stats), 'orphans': orphans, 'missing': [f'{prefix}{filename}' for filename in sorted(unseen)[:20]]}
+
+def register_existing_uploads(storage):
+    """upload_blob 행이 없는 게시글 이미지를 지금 참조 수로 등록 (마이그레이션 5)
+
+    예전 파일명(post_<id>_<시각>_<순서>.jpg 등)도 등록해 같은 방식으로 해제되게 한다.
+    마이그레이션 당시 업로드 파일은 모두 static 폴더에 있었으므로 호출하는 쪽에서 그 저장소를 넘긴다.
+    """
+    counts = Counter()
+    for filename, count in db.session.query(PostImage.filename, db.func.count()).group_by(PostImage.filename):
+        counts[filename] += count
+    for filename, count in db.session.query(Post.image_filename, db.func.count()) \
+            .filter(Post.image_filename.isnot(None)).group_by(Post.image_filename):
+        counts[filename] += count
+    tracked = {row.filename for row in db.session.query(UploadBlob.filename)}
+    rows = []
+    for filename, count in counts.items():
+        if filename in tracked:
+            continue
+        path = storage.path(f'uploads/{filename}')
+        rows.append({'filename': filename, 'ref_count': count,
+                     'size': os.path.getsize(path) if os.path.isfile(path) else 0})
+    if rows:
+        db.session.execute(UploadBlob.__table__.insert(), rows)
+
+def check_upload_ref_counts(reclaim):
+    """upload_blob 참조 수를 실제 참조(게시글 이미지 + 대표 이미지)와 비교, reclaim 이면 바로잡음"""
+    actual = Counter()
+    for column in (PostImage.filename, Post.image_filename):
+        for filename, count in db.session.query(column, db.func.count()).filter(column.isnot(None)) \
+                .group_by(column).yield_per(5000):
+            actual[filename] += count
+
+    fixes = []
+    for filename, ref_count in db.session.query(UploadBlob.filename, UploadBlob.ref_count).yield_per(5000):
+        count = actual.pop(filename, 0)
+        if count != ref_count:
+            fixes.append((filename, ref_count, count))
+    untracked = list(actual.items())
+
+    if reclaim:
+        # 점검하는 동안 참조 수가 바뀐 행은 건드리지 않음
+        for filename, seen, count in fixes:
+            blobs = UploadBlob.query.filter_by(filename=filename, ref_count=seen)
+            if count:
+                blobs.update({'ref_count': count}, synchronize_session=False)
+            else:
+                blobs.delete(synchronize_session=False)
+        for filename, count in untracked:
+            db.session.add(UploadBlob(filename=filename, ref_count=count, size=0))
+        db.session.commit()
+    return {'mismatched': len(fixes), 'untracked': len(untracked), 'fixed': len(fixes) + len(untracked) if reclaim else 0}
+
+def check_storage(reclaim=False, grace=None):
+    """모든 업로드 폴더 점검 결과 {폴더 이름: 결과, 'ref_counts': 참조 수 점검 결과}"""
+    grace = app.config['STORAGE_GC_GRACE_SECONDS'] if grace is None else grace
+    report = {}
+    for name, storage, prefix, derived_prefix, columns in storage_scopes():
+        report[name] = check_storage_scope(storage, prefix, derived_prefix, columns, reclaim, grace)
+    report['ref_counts'] = check_upload_ref_counts(reclaim)
+    return report
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f'{size:,.0f} {unit}' if unit == 'B' else f'{size:,.1f} {unit}'
+        size /= 1024
+
+def storage_report_lines(report):
+    lines = []
+    for name, result in report.items():
+        if name == 'ref_counts':
+            continue
+        stats = result['stats']
+        line = (f"{name}: 파일 {stats.get('files', 0):,}개 {format_bytes(stats.get('bytes', 0))}, "
+                f"참조 {stats['referenced']:,}개, 누락 {stats['missing']:,}개, "
+                f"고아 {stats.get('orphan_files', 0):,}개 {format_bytes(stats.get('orphan_bytes', 0))}")
+        if 'derived_files' in stats or 'derived_orphan_files' in stats:
+            line += (f", 파생본 {stats.get('derived_files', 0):,}개 {format_bytes(stats.get('derived_bytes', 0))}"
+                     f" (고아 {stats.get('derived_orphan_files', 0):,}개 {format_bytes(stats.get('derived_orphan_bytes', 0))})")
+        if stats.get('reclaimed_files'):
+            line += f", 삭제 {stats['reclaimed_files']:,}개 {format_bytes(stats['reclaimed_bytes'])}"
+        lines.append(line)
+    ref_counts = report['ref_counts']
+    lines.append(f"참조 수: 불일치 {ref_counts['mismatched']:,}개, 기록 없음 {ref_counts['untracked']:,}개, "
+                 f"수정 {ref_counts['fixed']:,}개")
+    return lines
+
+def schedule_periodic_job(kind, hours, from_job=False):
+    """kind 작업이 예약되어 있지 않으면 hours 시간 뒤로 예약 (0 이하이면 예약하지 않음)"""
+    if hours <= 0:
+        return
+    # 작업 안에서는 실행 중인 자기 자신을 빼고 확인
+    statuses = ['pending'] if from_job else ['pending', 'running']
+    if Job.query.filter(Job.kind == kind, Job.status.in_(statuses)).count():
+        return
+    enqueue_job(kind, {}, run_after=datetime.utcnow() + timedelta(hours=hours))
+    db.session.commit()
+
+def schedule_storage_gc(from_job=False):
+    """storage_gc 작업을 STORAGE_GC_INTERVAL_HOURS 뒤로 예약 (워커 시작 시, 작업이 끝날 때)"""
+    schedule_periodic_job('storage_gc', app.config['STORAGE_GC_INTERVAL_HOURS'], from_job)
+
+@job_handler('storage_gc')
+def storage_gc_job(payload):
+    for line in storage_report_lines(check_storage(reclaim=True)):
+        print(f"저장소 점검 - {line}")
+    schedule_storage_gc(from_job=True)
+
+# ============================================
+# 공개 POST 요청 제한 (문의 접수, 조회수/좋아요)
+# ============================================
+RateLimitRule = namedtuple('RateLimitRule', ['limit', 'window'])
+
+def parse_rate_limit(value):
+    """'횟수/초' (예: '5/600') 를 규칙으로 변환, 0 이거나 잘못된 값이면 None (제한 없음)"""
+    try:
+        limit, window = value.split('/')
+        rule = RateLimitRule(int(limit), float(window))
+    except (AttributeError, ValueError):
+        return None
+    return rule if rule.limit > 0 and rule.window > 0 else None
+
+class LocalRateStore:
+    """워커 메모리의 요청 제한 카운터와 중복 이벤트 기록 (공유 저장소가 없거나 오류일 때)"""
+
+    def __init__(self, max_entries):
+        self._counters = LRUCache(max_entries)
+        self._seen = LRUCache(max_entries)
+        self._lock = threading.Lock()
+
+    def hit_window(self, key, previous_key, ttl):
+        with self._lock:
+            count = self._counters.get(key, 0) + 1
+            self._counters.set(key, count, ttl=ttl)
+        return count, self._counters.get(previous_key, 0)
+
+    def mark_seen(self, key, ttl):
+        with self._lock:
+            if self._seen.get(key) is not None:
+                return False
+            self._seen.set(key, True, ttl=ttl)
+            return True
+
+class RateLimiter:
+    """규칙별 슬라이딩 윈도 요청 제한, 반복 이벤트 중복 제거, 이벤트 결과 카운터
+
+    슬라이딩 윈도는 고정 창 두 개(현재/직전)의 횟수를 직전 창이 아직 겹쳐 있는 비율만큼 섞어 추정하므로
+    키마다 숫자 두 개만 저장한다. 제한에 걸린 요청도 횟수에 들어가므로 계속 두드리면 계속 막힌다.
+    """
+
+    def __init__(self, rules, max_entries, shared_store=None, enabled=True):
+        self.rules = {name: rule for name, rule in rules.items() if rule}
+        self.enabled = enabled
+        self.shared_store = shared_store
+        self.local = LocalRateStore(max_entries)
+        self.results = Counter()
+        self._lock = threading.Lock()
+
+    def _store(self, method, *args):
+        if self.shared_store:
+            try:
+                return getattr(self.shared_store, method)(*args)
+            except sqlite3.Error as e:
+                print(f"요청 제한 저장소 오류: {e}")
+        return getattr(self.local, method)(*args)
+
+    def check(self, rule_name, key):
+        """요청 한 번을 기록하고, 허용이면 0, 제한이면 다시 시도할 수 있을 때까지의 초를 반환"""
+        rule = self.rules.get(rule_name)
+        if not self.enabled or rule is None:
+            return 0
+        position = time.time() / rule.window
+        window = int(position)
+        count, previous = self._store('hit_window', f'{rule_name}:{key}:{window}',
+                                      f'{rule_name}:{key}:{window - 1}', rule.window * 2)
+        remaining = 1 - (position - window)
+        if previous * remaining + count <= rule.limit:
+            return 0
+        return int(remaining * rule.window) + 1
+
+    def first_event(self, name, keys, window):
+        """keys 가 모두 window 초 안에 처음 보는 것이면 True (모든 키를 기록함)"""
+        if not self.enabled or window <= 0:
+            return True
+        return all([self._store('mark_seen', f'{name}:{key}', window) for key in keys])
+
+    def record(self, event, result):
+        with self._lock:
+            self.results[(event, result)] += 1
+
+    def stats(self):
+        with self._lock:
+            results = dict(self.results)
+        events = {}
+        for (event, result), count in sorted(results.items()):
+            events.setdefault(event, {})[result] = count
+        return {'enabled': self.enabled, 'shared': bool(self.shared_store), 'events': events}
+
+rate_limiter = RateLimiter({
+    'contact': parse_rate_limit(app.config['RATE_LIMIT_CONTACT']),
+    'events': parse_rate_limit(app.config['RATE_LIMIT_EVENTS']),
+    'video_events': parse_rate_limit(app.config['RATE_LIMIT_VIDEO_EVENTS']),
+    'new_visitor_events': parse_rate_limit(app.config['RATE_LIMIT_NEW_VISITOR_EVENTS']),
+}, app.config['RATE_LIMIT_MAX_ENTRIES'], response_cache.shared_store, app.config['RATE_LIMIT_ENABLED'])
+
+def client_ip():
+    """요청 IP (PROXY_X_FOR 단계의 프록시가 붙인 X-Forwarded-For 값을 신뢰)"""
+    hops = app.config['PROXY_X_FOR']
+    if hops:
+        forwarded = [value.strip() for value in request.headers.get('X-Forwarded-For', '').split(',') if value.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.remote_addr or 'unknown'
+
+def visitor_id():
+    """중복 제거용 방문자 키: 세션 쿠키의 방문자 id (없으면 새로 발급)"""
+    visitor = session.get('visitor')
+    if not visitor:
+        visitor = session['visitor'] = uuid.uuid4().hex
+    return visitor
+
+def client_agent_key():
+    """IP + User-Agent: NAT 뒤의 여러 방문자가 같은 값을 가질 수 있으므로 요청 제한 키로만 사용"""
+    agent = hashlib.md5(request.headers.get('User-Agent', '').encode()).hexdigest()[:12]
+    return f'{client_ip()}:{agent}'
+
+def check_video_event(event, video_id, dedup_seconds):
+    """조회/좋아요 이벤트를 DB 카운터에 반영할지 결정
+
+    IP 당 제한 -> (쿠키 없는 요청이면) IP + User-Agent 당 제한 -> 같은 방문자의 반복 이벤트 제거
+    -> 영상당 제한 순서로 확인하고 (결과, Retry-After 초) 반환, 결과는 accepted / duplicate / rate_limited.
+    """
+    new_visitor = not session.get('visitor')
+    visitor = visitor_id()
+    retry_after = rate_limiter.check('events', client_ip())
+    if not retry_after and new_visitor:
+        # 쿠키를 버리는 클라이언트는 매번 새 방문자로 보이므로 중복 제거 대신 더 낮은 한도로 제한
+        retry_after = rate_limiter.check('new_visitor_events', client_agent_key())
+    if retry_after:
+        result = 'rate_limited'
+    elif not rate_limiter.first_event(event, [f'{video_id}:{visitor}'], dedup_seconds):
+        result = 'duplicate'
+    else:
+        retry_after = rate_limiter.check('video_events', video_id)
+        result = 'rate_limited' if retry_after else 'accepted'
+    rate_limiter.record(event, result)
+    return result, retry_after
+
+def rate_limited_response(retry_after):
+    response = jsonify({'success': False, 'error': '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.'})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def rate_limit_prometheus():
+    lines = ['# TYPE dayu_public_events_total counter']
+    for event, results in rate_limiter.stats()['events'].items():
+        for result, count in results.items():
+            lines.append(f'dayu_public_events_total{{event="{event}",result="{result}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+# ============================================
+# 외부 영상 메타데이터 (oEmbed) 수집
+# ============================================
+def build_http_session():
+    """연결을 재사용하는 외부 HTTP 세션 (워커 프로세스마다 첫 요청 시 연결 생성)"""
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(
+        total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=('GET',)
+    ))
+    http.mount('http://', adapter)
+    http.mount('https://', adapter)
+    http.headers['User-Agent'] = 'dayumusic/1.0'
+    return http
+
+http_session = build_http_session()
+oembed_cache = LRUCache(256, ttl=app.config['OEMBED_CACHE_TTL'])
+
+def format_duration(seconds):
+    """초 단위 길이를 'H:MM:SS' 또는 'M:SS' 로 변환"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02d}:{secs:02d}' if hours else f'{minutes}:{secs:02d}'
+
+def fetch_video_metadata(platform, url):
+    """YouTube/Vimeo oEmbed 로 제목, 썸네일, 길이 조회 (TTL 캐시)"""
+    endpoints = {'youtube': app.config['YOUTUBE_OEMBED_URL'], 'vimeo': app.config['VIMEO_OEMBED_URL']}
+    if platform not in endpoints or not url:
+        return None
+
+    cache_key = f'{platform}:{url}'
+    metadata = oembed_cache.get(cache_key)
+    if metadata is not None:
+        return metadata
+
+    response = http_session.get(endpoints[platform], params={'url': url, 'format': 'json'},
+                                timeout=app.config['HTTP_TIMEOUT'])
+    response.raise_for_status()
+    data = response.json()
+
+    metadata = {
+        'title': data.get('title'),
+        'author_name': data.get('author_name'),
+        'thumbnail_url': data.get('thumbnail_url'),
+        'duration': format_duration(data['duration']) if data.get('duration') else None,
+    }
+    oembed_cache.set(cache_key, metadata)
+    return metadata
+
+def mirror_thumbnail(thumbnail_url, name):
+    """외부 썸네일을 내려받아 최적화한 JPEG 로 저장하고 파생본 생성, 파일명 반환"""
+    response = http_session.get(thumbnail_url, timeout=app.config['HTTP_TIMEOUT'], stream=True)
+    response.raise_for_status()
+
+    buffer = io.BytesIO()
+    for block in response.iter_content(64 * 1024):
+        buffer.write(block)
+        if buffer.tell() > THUMBNAIL_MAX_BYTES:
+            raise ValueError('썸네일 파일이 너무 큽니다.')
+    buffer.seek(0)
+
+    with Image.open(buffer) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > THUMBNAIL_MAX_WIDTH:
+            image = image.resize((THUMBNAIL_MAX_WIDTH, round(image.height * THUMBNAIL_MAX_WIDTH / image.width)), Image.LANCZOS)
+        filename = f'{secure_filename(name)}.jpg'
+        os.makedirs(app.config['THUMBNAIL_UPLOAD_FOLDER'], exist_ok=True)
+        save_image(image, os.path.join(app.config['THUMBNAIL_UPLOAD_FOLDER'], filename), '.jpg')
+
+    generate_image_derivatives(f'uploads/thumbnails/{filename}', force=True)
+    return filename
+
+@job_handler('ingest_video_metadata')
+def ingest_video_metadata_job(payload):
+    video = db.session.get(Video, payload['video_id'])
+    if not video or video.platform not in ('youtube', 'vimeo'):
+        return
+
+    metadata = fetch_video_metadata(video.platform, video.external_url)
+    if not metadata:
+        return
+
+    if metadata['duration']:
+        video.duration = metadata['duration']
+    if metadata['thumbnail_url']:
+        video.thumbnail_url = metadata['thumbnail_url']
+        # 같은 영상을 여러 번 등록해도 행마다 따로 저장 (한 행을 지워도 다른 행의 썸네일은 남음)
+        video.thumbnail_filename = mirror_thumbnail(metadata['thumbnail_url'],
+                                                    f'{video.platform}_{video.video_id}_{video.id}')
+    db.session.commit()
+    response_cache.invalidate('videos')
+    object_cache.invalidate('video', video.id)
+
+# ============================================
+# 요청 계측 (응답 시간, 템플릿 렌더링, 쿼리 수/시간, N+1 감지)
+# ============================================
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+SQL_IN_LISTS = re.compile(r'\((?:\s*(?:\?|%\(\w+\)s|:\w+)\s*,?)+\)')
+
+def statement_shape(statement):
+    """파라미터 개수/리터럴만 다른 SQL 을 같은 형태로 묶기 위한 정규화"""
+    shape = SQL_LITERALS.sub('?', statement)
+    shape = SQL_IN_LISTS.sub('(?)', shape)
+    return ' '.join(shape.split())
+
+class RequestMetrics:
+    """엔드포인트별 지연 시간 히스토그램과 느린 요청 기록 (워커 프로세스 단위)"""
+
+    def __init__(self, slow_log_size=50):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self.slow_requests = deque(maxlen=slow_log_size)
+
+    def observe(self, endpoint, duration, template_time, query_count, query_time):
+        with self._lock:
+            route = self._routes.setdefault(endpoint, {
+                'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * len(LATENCY_BUCKETS),
+                'template_seconds': 0.0, 'queries': 0, 'query_seconds': 0.0, 'n_plus_one': 0,
+            })
+            route['count'] += 1
+            route['sum'] += duration
+            route['max'] = max(route['max'], duration)
+            route['template_seconds'] += template_time
+            route['queries'] += query_count
+            route['query_seconds'] += query_time
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    route['buckets'][i] += 1
+
+    def flag_n_plus_one(self, endpoint):
+        with self._lock:
+            if endpoint in self._routes:
+                self._routes[endpoint]['n_plus_one'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: dict(route, buckets=list(route['buckets'])) for endpoint, route in self._routes.items()}
+
+    def prometheus(self):
+        """Prometheus 텍스트 형식"""
+        lines = [
+            '# HELP dayu_request_duration_seconds Request latency per endpoint.',
+            '# TYPE dayu_request_duration_seconds histogram',
+        ]
+        routes = self.snapshot()
+        for endpoint, route in sorted(routes.items()):
+            for bound, count in zip(LATENCY_BUCKETS, route['buckets']):
+                lines.append(f'dayu_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+            lines.append(f'dayu_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {route["count"]}')
+            lines.append(f'dayu_request_duration_seconds_sum{{endpoint="{endpoint}"}} {route["sum"]:.6f}')
+            lines.append(f'dayu_request_duration_seconds_count{{endpoint="{endpoint}"}} {route["count"]}')
+        for name, key, help_text in (
+            ('dayu_template_seconds_total', 'template_seconds', 'Template render time per endpoint.'),
+            ('dayu_db_queries_total', 'queries', 'SQL statements executed per endpoint.'),
+            ('dayu_db_query_seconds_total', 'query_seconds', 'SQL execution time per endpoint.'),
+            ('dayu_n_plus_one_total', 'n_plus_one', 'Requests flagged for repeated statements.'),
+        ):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for endpoint, route in sorted(routes.items()):
+                lines.append(f'{name}{{endpoint="{endpoint}"}} {route[key]}')
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'query_stats' in g:
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
 
-# 비디오 관련 유틸리티
-def extract_youtube_video_id(url):
-    """YouTube URL에서 비디오 ID 추출"""
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-        r'youtube\.com\/watch\?.*v=([^&\n?#]+)'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+@event.listens_for(Engine, 'after_cursor_execute')
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context() or 'query_stats' not in g or not conn.info.get('query_start'):
+        return
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    stats = g.query_stats
+    stats['count'] += 1
+    stats['seconds'] += elapsed
+    if stats['shapes'] is not None:
+        stats['shapes'][statement_shape(statement)] += 1
 
-def extract_vimeo_video_id(url):
-    """Vimeo URL에서 비디오 ID 추출"""
-    pattern = r'vimeo\.com\/(?:.*\/)?(\d+)'
-    match = re.search(pattern, url)
-    return match.group(1) if match else None
+@before_render_template.connect_via(app)
+def template_render_started(sender, template, context, **extra):
+    if has_request_context():
+        g.setdefault('template_starts', []).append(time.perf_counter())
 
-def get_video_embed_url(video):
-    """비디오 임베드 URL 생성"""
-    if video.platform == 'youtube':
-        return f"https://www.youtube.com/embed/{video.video_id}"
-    elif video.platform == 'vimeo':
-        return f"https://player.vimeo.com/video/{video.video_id}"
-    elif video.platform == 'local':
-        return url_for('static', filename=f'uploads/videos/{video.video_filename}')
-    return None
+@template_rendered.connect_via(app)
+def template_render_finished(sender, template, context, **extra):
+    if has_request_context() and g.get('template_starts'):
+        elapsed = time.perf_counter() - g.template_starts.pop()
+        # 중첩 렌더링은 가장 바깥 템플릿 시간만 합산
+        if not g.template_starts:
+            g.template_seconds = g.get('template_seconds', 0.0) + elapsed
 
-def get_video_thumbnail_url(video):
-    """비디오 썸네일 URL"""
-    if video.thumbnail_filename:
-        return url_for('static', filename=f'uploads/thumbnails/{video.thumbnail_filename}')
-    elif video.platform == 'youtube' and video.video_id:
-        return f"https://img.youtube.com/vi/{video.video_id}/hqdefault.jpg"
-    return None
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    sampled = app.debug or random.random() < app.config['QUERY_SHAPE_SAMPLE_RATE']
+    g.query_stats = {'count': 0, 'seconds': 0.0, 'shapes': Counter() if sampled else None}
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_start' not in g:
+        return response
+
+    duration = time.perf_counter() - g.request_start
+    template_time = g.get('template_seconds', 0.0)
+    stats = g.query_stats
+    endpoint = request.endpoint or 'unknown'
+    request_metrics.observe(endpoint, duration, template_time, stats['count'], stats['seconds'])
+
+    top_shapes = stats['shapes'].most_common(3) if stats['shapes'] is not None else []
+    repeated = [(shape, count) for shape, count in top_shapes if count > app.config['N_PLUS_ONE_THRESHOLD']]
+    if repeated:
+        request_metrics.flag_n_plus_one(endpoint)
+        app.logger.warning("[N+1] %s %s: 같은 쿼리 %d회 반복 - %s",
+                           request.method, request.path, repeated[0][1], repeated[0][0][:200])
+
+    if duration * 1000 >= app.config['SLOW_REQUEST_MS']:
+        entry = {
+            'time': datetime.utcnow().isoformat(timespec='seconds'),
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': endpoint,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 1),
+            'template_ms': round(template_time * 1000, 1),
+            'queries': stats['count'],
+            'query_ms': round(stats['seconds'] * 1000, 1),
+            # 표본에 들지 않은 요청은 빈 목록
+            'top_statements': [{'statement': shape[:300], 'count': count} for shape, count in top_shapes],
+        }
+        request_metrics.slow_requests.append(entry)
+        app.logger.warning("[느린 요청] %s %s %sms (쿼리 %d개 %sms, 템플릿 %sms)",
+                           entry['method'], entry['path'], entry['duration_ms'],
+                           entry['queries'], entry['query_ms'], entry['template_ms'])
+
+    if server_timing_allowed():
+        response.headers['Server-Timing'] = (
+            f"app;dur={duration * 1000:.1f}, db;dur={stats['seconds'] * 1000:.1f};desc=\"{stats['count']} queries\", "
+            f"tpl;dur={template_time * 1000:.1f}"
+        )
+    return response
+
+def server_timing_allowed():
+    """Server-Timing 은 쿼리 수/시간을 드러내므로 디버그 모드, 관리자, METRICS_TOKEN 요청에만 보냄"""
+    if app.debug:
+        return True
+    token = app.config['METRICS_TOKEN']
+    if token and request.headers.get('Authorization') == f'Bearer {token}':
+        return True
+    # 세션을 읽으면 응답에 Vary: Cookie 가 붙으므로 세션 쿠키가 있는 요청만 확인
+    return app.config['SESSION_COOKIE_NAME'] in request.cookies and bool(session.get('is_admin'))
 
 # ============================================
 # Context Processor
@@ -290,11 +3094,16 @@ def get_video_thumbnail_url(video):
 def inject_global_vars():
     return dict(
         is_admin=session.get('is_admin', False),
+        unanswered_contacts=contact_counts()['unanswered'] if session.get('is_admin') else 0,
         get_display_date=get_display_date,
         extract_date_from_content=extract_date_from_content,
         get_post_images=get_post_images,
         get_primary_image=get_primary_image,
         get_image_count=get_image_count,
+        responsive_image=responsive_image,
+        upload_image=upload_image,
+        upload_url=upload_url,
+        asset_url=asset_url,
         get_video_embed_url=get_video_embed_url,
         get_video_thumbnail_url=get_video_thumbnail_url
     )
@@ -303,36 +3112,49 @@ def inject_global_vars():
 # 기본 페이지 라우트
 # ============================================
 @app.route('/')
+@cached_page('static')
 def home():
     return render_template('index.html')
 
 @app.route('/greeting')
+@cached_page('static')
 def greeting():
     return render_template('greeting.html')
 
 @app.route('/about')
+@cached_page('static')
 def about():
     return render_template('about.html')
 
 @app.route('/members')
+@cached_page('static')
 def members():
     return render_template('members.html')
 
 @app.route('/healingconcert')
+@cached_page('static')
 def healingconcert():
     return render_template('healingconcert.html')
 
 @app.route('/contact', methods=['GET', 'POST'])
 def contact():
     if request.method == 'POST':
+        retry_after = rate_limiter.check('contact', client_ip())
+        if retry_after:
+            rate_limiter.record('contact', 'rate_limited')
+            flash(f'문의가 너무 자주 접수되었습니다. {retry_after}초 후에 다시 시도해주세요.')
+            return redirect(url_for('contact'))
+        
         name = request.form.get('name', '').strip()
         email = request.form.get('email', '').strip()
         message = request.form.get('message', '').strip()
         
         if name and email and message:
-            contact_entry = Contact(name=name, email=email, message=message)
+            contact_entry = Contact(name=name, email=email, message=message, answered=False)
             db.session.add(contact_entry)
             db.session.commit()
+            invalidate_contact_counts()
+            rate_limiter.record('contact', 'accepted')
             flash('문의가 접수되었습니다!')
         else:
             flash('모든 필드를 입력해주세요.')
@@ -345,20 +3167,56 @@ def contact():
 # 게시판 라우트
 # ============================================
 @app.route('/board')
-def board():
+@cached_page('posts')
+def board(db_session=None):
     try:
-        posts = Post.query.order_by(Post.date_posted.desc()).all()
-        return render_template('board.html', posts=posts)
+        per_page = 12
+        ordering = (Post.date_posted.desc(), Post.id.desc())
+        cursor = decode_cursor(request.args.get('after'))
+        
+        query = query_session(db_session).query(Post)
+        year, year_start, year_end = parse_year_filter()
+        if year:
+            query = query.filter(Post.performance_date >= year_start, Post.performance_date < year_end)
+        
+        if cursor:
+            # 키셋 페이지네이션: OFFSET 없이 커서 이후의 게시글만 조회
+            cursor_date, cursor_id = cursor
+            rows = query.filter(db.or_(
+                Post.date_posted < cursor_date,
+                db.and_(Post.date_posted == cursor_date, Post.id < cursor_id)
+            )).order_by(*ordering).limit(per_page + 1).all()
+            posts = rows[:per_page]
+            has_next = len(rows) > per_page
+            pagination = None
+        else:
+            page = request.args.get('page', 1, type=int)
+            pagination = query.order_by(*ordering).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            posts = pagination.items
+            has_next = pagination.has_next
+        
+        next_cursor = encode_cursor(posts[-1].date_posted, posts[-1].id) if posts and has_next else None
+        image_summaries = load_post_image_summaries(posts, db_session)
+        
+        return render_template('board.html', posts=posts, pagination=pagination,
+                               next_cursor=next_cursor, image_summaries=image_summaries,
+                               selected_year=year)
     except Exception as e:
         print(f"Board error: {e}")
         flash('게시판을 불러오는 중 오류가 발생했습니다.')
-        return render_template('board.html', posts=[])
+        return render_template('board.html', posts=[], pagination=None,
+                               next_cursor=None, image_summaries={}, selected_year=None)
 
 @app.route('/post/<int:post_id>')
-def view_post(post_id):
+@cached_page('post:{post_id}')
+def view_post(post_id, db_session=None):
     try:
-        post = Post.query.get_or_404(post_id)
-        images = get_post_images(post)
+        post = cached_post(post_id, db_session)
+        if post is None:
+            abort(404)
+        images = get_post_images(post, db_session)
         return render_template('post_detail.html', post=post, images=images)
     except Exception as e:
         print(f"Post view error: {e}")
@@ -379,6 +3237,7 @@ def write_post():
                 return redirect(request.url)
             
             new_post = Post(title=title, content=content, author=author)
+            update_post_performance_date(new_post)
             db.session.add(new_post)
             db.session.flush()
             
@@ -388,18 +3247,13 @@ def write_post():
                 save_post_images(new_post.id, image_files)
             
             # 단일 이미지 처리 (하위 호환)
-            if 'image' in request.files:
-                single_image = request.files['image']
-                if single_image and single_image.filename != '' and allowed_file(single_image.filename):
-                    filename = secure_filename(single_image.filename)
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    file_extension = os.path.splitext(filename)[1].lower()
-                    new_filename = f"single_{timestamp}{file_extension}"
-                    filepath = os.path.join(app.config['UPLOAD_FOLDER'], new_filename)
-                    single_image.save(filepath)
-                    new_post.image_filename = new_filename
+            single_image = request.files.get('image')
+            if single_image and single_image.filename != '' and allowed_file(single_image.filename):
+                replace_post_image(new_post, single_image)
             
+            index_post(new_post)
             db.session.commit()
+            response_cache.invalidate('posts')
             flash('게시글이 작성되었습니다!')
             return redirect(url_for('board'))
             
@@ -421,14 +3275,22 @@ def edit_post(post_id):
             post.title = request.form.get('title', '').strip()
             post.content = request.form.get('content', '').strip()
             post.author = request.form.get('author', '').strip()
+            update_post_performance_date(post)
             
-            # 새 이미지 처리
+            # 새 이미지 처리 (내용이 같은 기존 이미지는 그대로 둠)
             image_files = request.files.getlist('images')
             if image_files and any(f.filename for f in image_files):
-                delete_post_images(post.id)
-                save_post_images(post.id, image_files)
+                sync_post_images(post.id, image_files)
+            
+            single_image = request.files.get('image')
+            if single_image and single_image.filename != '' and allowed_file(single_image.filename):
+                replace_post_image(post, single_image)
             
+            index_post(post)
             db.session.commit()
+            response_cache.invalidate('posts', f'post:{post.id}')
+            object_cache.invalidate('post', post.id)
+            object_cache.invalidate('post_images', post.id)
             flash('게시글이 수정되었습니다!')
             return redirect(url_for('view_post', post_id=post.id))
             
@@ -446,14 +3308,14 @@ def delete_post(post_id):
     try:
         post = Post.query.get_or_404(post_id)
         delete_post_images(post.id)
-        
-        if post.image_filename:
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], post.image_filename)
-            if os.path.exists(filepath):
-                os.remove(filepath)
+        release_uploads([post.image_filename])
+        remove_from_search_index('post', post.id)
         
         db.session.delete(post)
         db.session.commit()
+        response_cache.invalidate('posts', f'post:{post_id}')
+        object_cache.invalidate('post', post_id)
+        object_cache.invalidate('post_images', post_id)
         flash('게시글이 삭제되었습니다!')
     except Exception as e:
         print(f"Delete post error: {e}")
@@ -462,51 +3324,102 @@ def delete_post(post_id):
     
     return redirect(url_for('board'))
 
+# ============================================
+# 검색 라우트
+# ============================================
+SEARCH_PER_PAGE = 20
+
+def run_search():
+    """요청 인자(q, type, page)로 검색 실행"""
+    query = request.args.get('q', '').strip()[:100]
+    doc_type = request.args.get('type')
+    if doc_type not in ('post', 'video'):
+        doc_type = None
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    started = time.perf_counter()
+    # 다음 페이지 여부 확인을 위해 한 건 더 조회
+    results = search_documents(query, doc_type, limit=SEARCH_PER_PAGE + 1, offset=(page - 1) * SEARCH_PER_PAGE)
+    took_ms = round((time.perf_counter() - started) * 1000, 2)
+    return query, doc_type, page, results[:SEARCH_PER_PAGE], len(results) > SEARCH_PER_PAGE, took_ms
+
+@app.route('/search')
+@cached_page('posts', 'videos')
+def search():
+    try:
+        query, doc_type, page, results, has_next, took_ms = run_search()
+        return render_template('search.html', query=query, doc_type=doc_type, page=page,
+                               results=results, has_next=has_next, took_ms=took_ms)
+    except Exception as e:
+        print(f"Search error: {e}")
+        flash('검색 중 오류가 발생했습니다.')
+        return render_template('search.html', query=request.args.get('q', ''), doc_type=None, page=1,
+                               results=[], has_next=False, took_ms=None)
+
+@app.route('/api/search')
+@cached_page('posts', 'videos')
+def search_api():
+    """검색 JSON API: ?q=검색어&type=post|video&page=1"""
+    try:
+        query, doc_type, page, results, has_next, took_ms = run_search()
+        for result in results:
+            result['snippet'] = str(result['snippet'])
+        return jsonify({'query': query, 'type': doc_type, 'page': page, 'has_next': has_next,
+                        'took_ms': took_ms, 'results': results})
+    except Exception as e:
+        print(f"Search API error: {e}")
+        return jsonify({'error': '검색 중 오류가 발생했습니다.'}), 500
+
 # ============================================
 # 포트폴리오 (비디오) 라우트
 # ============================================
 @app.route('/portfolio')
-def portfolio():
+@cached_page('videos')
+def portfolio(db_session=None):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = 9
         
-        videos_paginated = Video.query.order_by(Video.date_uploaded.desc()).paginate(
+        query, tag, year = filter_videos(query_session(db_session).query(Video).options(db.selectinload(Video.tag_items)))
+        videos_paginated = query.order_by(Video.date_uploaded.desc(), Video.id.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
+        # 무한 스크롤: 다음 영상들은 /api/videos?after= 로 이어서 불러옴
+        last = videos_paginated.items[-1] if videos_paginated.items else None
+        next_cursor = encode_cursor(last.date_uploaded, last.id) if last and videos_paginated.has_next else None
         
-        # 각 비디오의 본문에서 날짜 추출
+        # 공연 날짜는 저장 시점에 추출되어 있음
         for video in videos_paginated.items:
-            if video.description:
-                date_match = re.search(r'(\d{4})\.(\d{1,2})\.(\d{1,2})', video.description)
-                if date_match:
-                    try:
-                        year, month, day = int(date_match.group(1)), int(date_match.group(2)), int(date_match.group(3))
-                        original_date = datetime(year, month, day)
-                        next_day = original_date + timedelta(days=1)
-                        video.display_date = next_day.strftime('%Y-%m-%d')
-                    except ValueError:
-                        video.display_date = '날짜 없음'
-                else:
-                    video.display_date = '날짜 없음'
+            if video.performance_date:
+                video.display_date = (video.performance_date + timedelta(days=1)).strftime('%Y-%m-%d')
             else:
                 video.display_date = '날짜 없음'
         
-        return render_template('portfolio.html', videos=videos_paginated.items, pagination=videos_paginated)
+        return render_template('portfolio.html', videos=videos_paginated.items, pagination=videos_paginated,
+                               tag_cloud=load_tag_cloud(session=db_session), selected_tag=tag or None, selected_year=year,
+                               next_cursor=next_cursor)
     except Exception as e:
         print(f"Portfolio error: {e}")
         flash('포트폴리오를 불러오는 중 문제가 발생했습니다.')
-        return render_template('portfolio.html', videos=[], pagination=None)
+        return render_template('portfolio.html', videos=[], pagination=None,
+                               tag_cloud=[], selected_tag=None, selected_year=None, next_cursor=None)
 
 @app.route('/video/<int:video_id>')
-def view_video(video_id):
+def view_video(video_id, db_session=None):
     try:
-        video = Video.query.get_or_404(video_id)
-        video.view_count = (video.view_count or 0) + 1
-        db.session.commit()
+        video = cached_video(video_id, db_session)
+        if video is None:
+            abort(404)
+        video = video.copy()
+        # 조회수 API 와 같은 중복 제거/요청 제한을 거쳐 반영 (제한에 걸려도 페이지는 보여 줌)
+        result, _ = check_video_event('view', video.id, app.config['VIEW_DEDUP_SECONDS'])
+        if result == 'accepted':
+            counter_buffer.record(video, 'view_count')
+        else:
+            counter_buffer.apply_pending(video)
         
-        # 관련 비디오
-        related_videos = Video.query.filter(Video.id != video.id).order_by(Video.date_uploaded.desc()).limit(4).all()
+        # 관련 비디오: 미리 계산된 id 목록과 영상 사본 모두 객체 캐시에서 조회
+        related_videos = cached_related_videos(video.id, db_session)
         
         return render_template('video_detail.html', video=video, related_videos=related_videos)
     except Exception as e:
@@ -550,11 +3463,17 @@ def add_video():
                 external_url=video_url
             )
             
-            if hasattr(video, 'tags'):
-                video.tags = request.form.get('tags', '').strip()
+            update_video_performance_date(video, request.form.get('performance_date', '').strip())
             
             db.session.add(video)
+            set_video_tags(video, request.form.get('tags', ''))
+            index_video(video)
+            enqueue_job('refresh_related_videos', {'changed': [video.id]})
+            if video.platform in ('youtube', 'vimeo'):
+                enqueue_job('ingest_video_metadata', {'video_id': video.id})
             db.session.commit()
+            response_cache.invalidate('videos')
+            object_cache.invalidate('related_ids')
             
             flash('영상이 성공적으로 추가되었습니다!')
             return redirect(url_for('portfolio'))
@@ -569,6 +3488,7 @@ def add_video():
 @admin_required
 def edit_video(video_id):
     video = Video.query.get_or_404(video_id)
+    counter_buffer.apply_pending(video)
     
     if request.method == 'POST':
         try:
@@ -576,10 +3496,17 @@ def edit_video(video_id):
             video.description = request.form.get('description', '').strip()
             video.author = request.form.get('author', '앙상블 다유').strip()
             
-            if hasattr(video, 'tags'):
-                video.tags = request.form.get('tags', '').strip()
+            set_video_tags(video, request.form.get('tags', ''))
+            update_video_performance_date(video, request.form.get('performance_date', '').strip())
             
+            if video.platform in ('youtube', 'vimeo') and not video.thumbnail_filename:
+                enqueue_job('ingest_video_metadata', {'video_id': video.id})
+            
+            index_video(video)
+            enqueue_job('refresh_related_videos', {'changed': [video.id]})
             db.session.commit()
+            response_cache.invalidate('videos')
+            object_cache.invalidate('video', video.id)
             flash('영상 정보가 성공적으로 수정되었습니다!')
             return redirect(url_for('view_video', video_id=video.id))
         except Exception as e:
@@ -596,18 +3523,22 @@ def delete_video(video_id):
         video = Video.query.get_or_404(video_id)
         video_title = video.title
         
-        if hasattr(video, 'video_filename') and video.video_filename:
-            video_path = os.path.join(app.config.get('LOCAL_VIDEO_FOLDER', ''), video.video_filename)
-            if os.path.exists(video_path):
-                os.remove(video_path)
-        
-        if hasattr(video, 'thumbnail_filename') and video.thumbnail_filename:
-            thumbnail_path = os.path.join(app.config.get('THUMBNAIL_UPLOAD_FOLDER', ''), video.thumbnail_filename)
-            if os.path.exists(thumbnail_path):
-                os.remove(thumbnail_path)
+        if video.video_filename or video.thumbnail_filename:
+            enqueue_job('delete_video_files', {
+                'filenames': [video.video_filename] if video.video_filename else [],
+                'thumbnails': [video.thumbnail_filename] if video.thumbnail_filename else [],
+            })
+        remove_from_search_index('video', video.id)
+        set_video_tags(video, '')
+        referencing = remove_related_videos(video.id)
+        if referencing:
+            enqueue_job('refresh_related_videos', {'rebuild': referencing})
         
         db.session.delete(video)
         db.session.commit()
+        response_cache.invalidate('videos')
+        object_cache.invalidate('video', video_id)
+        object_cache.invalidate('related_ids')
         
         flash(f'영상 "{video_title}"이 성공적으로 삭제되었습니다!')
     except Exception as e:
@@ -647,20 +3578,218 @@ def admin_logout():
     flash('로그아웃되었습니다.')
     return redirect(url_for('home'))
 
+CONTACT_STATUSES = ('all', 'unanswered', 'answered')
+
+def load_contact_counts():
+    counts = {'answered': 0, 'unanswered': 0}
+    for answered, count in db.session.query(Contact.answered, db.func.count(Contact.id)).group_by(Contact.answered):
+        counts['answered' if answered else 'unanswered'] += count
+    counts['total'] = counts['answered'] + counts['unanswered']
+    return counts
+
+def contact_counts():
+    """전체/미답변/답변완료 문의 수 (문의 접수와 처리 때만 무효화되므로 페이지마다 COUNT 하지 않음)"""
+    return object_cache.get('contact_counts', 'all', lambda _: load_contact_counts())
+
+def invalidate_contact_counts():
+    object_cache.invalidate('contact_counts')
+    # 캐시된 관리자용 페이지에는 메뉴의 미답변 배지가 들어 있음
+    response_cache.invalidate('admin')
+
+def parse_contact_filters(source):
+    """?status=all|unanswered|answered, ?from=, ?to= (YYYY-MM-DD, 양 끝 포함)"""
+    status = source.get('status', 'all')
+    return {
+        'status': status if status in CONTACT_STATUSES else 'all',
+        'from': parse_form_date(source.get('from')),
+        'to': parse_form_date(source.get('to')),
+    }
+
+def filter_contacts(query, filters):
+    if filters['status'] != 'all':
+        query = query.filter(Contact.answered == (db.true() if filters['status'] == 'answered' else db.false()))
+    if filters['from']:
+        query = query.filter(Contact.date_sent >= datetime.combine(filters['from'], datetime.min.time()))
+    if filters['to']:
+        query = query.filter(Contact.date_sent < datetime.combine(filters['to'] + timedelta(days=1), datetime.min.time()))
+    return query
+
+def contact_filter_args(filters):
+    """url_for 에 넘길 필터 인자 (기본값은 생략)"""
+    args = {'status': filters['status']} if filters['status'] != 'all' else {}
+    for key in ('from', 'to'):
+        if filters[key]:
+            args[key] = filters[key].isoformat()
+    return args
+
 @app.route('/admin/dashboard')
 @admin_required
 def admin_dashboard():
-    contacts = Contact.query.order_by(Contact.date_sent.desc()).all()
-    return render_template('admin.html', contacts=contacts)
+    """문의함: 상태/기간 필터, 최신순 키셋 페이지네이션 (OFFSET 없이 ?after= 커서)"""
+    per_page = 50
+    filters = parse_contact_filters(request.args)
+    query = filter_contacts(Contact.query, filters)
+
+    cursor = decode_cursor(request.args.get('after'))
+    if cursor:
+        cursor_date, cursor_id = cursor
+        query = query.filter(db.or_(
+            Contact.date_sent < cursor_date,
+            db.and_(Contact.date_sent == cursor_date, Contact.id < cursor_id)
+        ))
+    rows = query.order_by(Contact.date_sent.desc(), Contact.id.desc()).limit(per_page + 1).all()
+    contacts = rows[:per_page]
+    next_cursor = encode_cursor(contacts[-1].date_sent, contacts[-1].id) if len(rows) > per_page else None
+
+    return render_template('admin.html', contacts=contacts, counts=contact_counts(), filters=filters,
+                           filter_args=contact_filter_args(filters), next_cursor=next_cursor,
+                           is_first_page=cursor is None)
+
+@app.route('/admin/contacts/bulk', methods=['POST'])
+@admin_required
+def bulk_update_contacts():
+    """선택한 문의 (scope=selected) 또는 현재 필터에 맞는 문의 전체 (scope=filtered)를 UPDATE/DELETE 한 번으로 처리"""
+    action = request.form.get('action')
+    filters = parse_contact_filters(request.form)
+    redirect_url = url_for('admin_dashboard', **contact_filter_args(filters))
+
+    if request.form.get('scope') == 'filtered':
+        query = filter_contacts(Contact.query, filters)
+    else:
+        ids = request.form.getlist('ids', type=int)
+        if not ids:
+            flash('선택한 문의가 없습니다.')
+            return redirect(redirect_url)
+        query = Contact.query.filter(Contact.id.in_(ids))
+
+    if action == 'answer':
+        changed = query.filter(Contact.answered == db.false()).update(
+            {Contact.answered: True}, synchronize_session=False)
+        message = f'{changed}개의 문의를 답변완료로 처리했습니다.'
+    elif action == 'delete':
+        changed = query.delete(synchronize_session=False)
+        message = f'{changed}개의 문의를 삭제했습니다.'
+    else:
+        abort(400)
+
+    db.session.commit()
+    invalidate_contact_counts()
+    flash(message)
+    return redirect(redirect_url)
 
-@app.route('/admin/mark_answered/<int:contact_id>')
+@app.route('/admin/jobs')
+@admin_required
+def admin_jobs():
+    """작업 큐 상태: 상태별 개수, 대기 시간/실행 시간, 최근 실패"""
+    counts = dict(db.session.query(Job.status, db.func.count(Job.id)).group_by(Job.status).all())
+    
+    oldest_pending = db.session.query(db.func.min(Job.created_at)).filter(Job.status == 'pending').scalar()
+    recent = Job.query.filter(Job.status == 'done').order_by(Job.finished_at.desc()).limit(100).all()
+    waits = [(job.started_at - job.created_at).total_seconds() for job in recent if job.started_at]
+    runs = [(job.finished_at - job.started_at).total_seconds() for job in recent if job.started_at and job.finished_at]
+    failures = Job.query.filter(Job.status == 'failed').order_by(Job.finished_at.desc()).limit(10).all()
+    
+    return jsonify({
+        'depth': counts.get('pending', 0),
+        'counts': counts,
+        'oldest_pending_seconds': (datetime.utcnow() - oldest_pending).total_seconds() if oldest_pending else 0,
+        'avg_wait_seconds': sum(waits) / len(waits) if waits else 0,
+        'max_wait_seconds': max(waits) if waits else 0,
+        'avg_run_seconds': sum(runs) / len(runs) if runs else 0,
+        'recent_failures': [
+            {'id': job.id, 'kind': job.kind, 'attempts': job.attempts, 'error': job.last_error}
+            for job in failures
+        ],
+    })
+
+def histogram_quantile(route, quantile):
+    """히스토그램 버킷으로 추정한 분위수 상한 (ms)"""
+    target = route['count'] * quantile
+    for bound, count in zip(LATENCY_BUCKETS, route['buckets']):
+        if count >= target:
+            return bound * 1000
+    return route['max'] * 1000
+
+def metrics_access_allowed():
+    """관리자 세션 또는 METRICS_TOKEN Bearer 토큰"""
+    token = app.config['METRICS_TOKEN']
+    return session.get('is_admin') or (token and request.headers.get('Authorization') == f'Bearer {token}')
+
+def object_cache_prometheus():
+    stats = object_cache.stats()
+    lines = ['# TYPE dayu_object_cache_entries gauge', f"dayu_object_cache_entries {stats['entries']}"]
+    for key in ('hits', 'misses'):
+        lines.append(f'# TYPE dayu_object_cache_{key}_total counter')
+        for kind, counts in stats['kinds'].items():
+            lines.append(f'dayu_object_cache_{key}_total{{kind="{kind}"}} {counts[key]}')
+    return '\n'.join(lines) + '\n'
+
+def pool_prometheus():
+    status = pool_status()
+    lines = []
+    for key, kind in (('checked_out', 'gauge'), ('overflow', 'gauge'), ('checkouts', 'counter'),
+                      ('timeouts', 'counter'), ('ping_failures', 'counter')):
+        if key in status:
+            lines.append(f'# TYPE dayu_db_pool_{key} {kind}')
+            lines.append(f'dayu_db_pool_{key} {status[key]}')
+    lines.append('# TYPE dayu_db_pool_wait_seconds_max gauge')
+    lines.append(f"dayu_db_pool_wait_seconds_max {status['max_wait_ms'] / 1000:.6f}")
+    return '\n'.join(lines) + '\n'
+
+@app.route('/admin/metrics')
+def admin_metrics():
+    """엔드포인트별 지연 시간/쿼리 통계, ?format=prometheus 는 Prometheus 텍스트 형식"""
+    if not metrics_access_allowed():
+        flash('관리자 권한이 필요합니다.')
+        return redirect(url_for('admin_login'))
+    
+    if request.args.get('format') == 'prometheus':
+        return app.response_class(request_metrics.prometheus() + pool_prometheus() + object_cache_prometheus()
+                                  + rate_limit_prometheus(),
+                                  mimetype='text/plain; version=0.0.4')
+    
+    routes = {}
+    for endpoint, route in request_metrics.snapshot().items():
+        count = route['count'] or 1
+        routes[endpoint] = {
+            'count': route['count'],
+            'avg_ms': round(route['sum'] / count * 1000, 2),
+            'p50_ms': histogram_quantile(route, 0.5),
+            'p95_ms': histogram_quantile(route, 0.95),
+            'p99_ms': histogram_quantile(route, 0.99),
+            'max_ms': round(route['max'] * 1000, 2),
+            'avg_template_ms': round(route['template_seconds'] / count * 1000, 2),
+            'avg_queries': round(route['queries'] / count, 2),
+            'avg_query_ms': round(route['query_seconds'] / count * 1000, 2),
+            'n_plus_one_requests': route['n_plus_one'],
+        }
+    
+    return jsonify({
+        'pid': os.getpid(),
+        'routes': routes,
+        'slow_requests': list(request_metrics.slow_requests),
+        'object_cache': object_cache.stats(),
+        'rate_limit': rate_limiter.stats(),
+    })
+
+@app.route('/admin/pool')
+def admin_pool():
+    """이 워커의 DB 연결 풀 상태 (대여 중/초과 연결 수, 대기 시간, 타임아웃)"""
+    if not metrics_access_allowed():
+        flash('관리자 권한이 필요합니다.')
+        return redirect(url_for('admin_login'))
+    return jsonify(pool_status())
+
+@app.route('/admin/mark_answered/<int:contact_id>', methods=['POST'])
 @admin_required
 def mark_answered(contact_id):
-    contact = Contact.query.get_or_404(contact_id)
-    contact.answered = True
+    if not db.session.query(Contact.id).filter_by(id=contact_id).first():
+        abort(404)
+    Contact.query.filter_by(id=contact_id).update({Contact.answered: True}, synchronize_session=False)
     db.session.commit()
+    invalidate_contact_counts()
     flash('답변완료로 처리되었습니다.')
-    return redirect(url_for('admin_dashboard'))
+    return redirect(url_for('admin_dashboard', **contact_filter_args(parse_contact_filters(request.form))))
 
 # ============================================
 # 에러 핸들러
@@ -695,58 +3824,635 @@ def internal_server_error(e):
 # API 라우트
 # ============================================
 @app.route('/api/video/<int:video_id>')
-def get_video_info(video_id):
+def get_video_info(video_id, db_session=None):
     """AJAX용 비디오 정보 API"""
     try:
-        video = Video.query.get_or_404(video_id)
-        
-        video_data = {
-            'id': video.id,
-            'title': video.title,
-            'description': video.description,
-            'author': video.author,
-            'platform': video.platform,
-            'video_id': video.video_id,
-            'external_url': video.external_url,
-            'duration': video.duration,
-            'view_count': video.view_count,
-            'like_count': video.like_count
-        }
+        video = cached_video(video_id, db_session)
+        if video is None:
+            abort(404)
+        video = counter_buffer.apply_pending(video.copy())
         
-        if video.platform == 'youtube':
-            video_data['video_url'] = f"https://www.youtube.com/embed/{video.video_id}"
-        elif video.platform == 'vimeo':
-            video_data['video_url'] = f"https://player.vimeo.com/video/{video.video_id}"
-        elif video.platform == 'local' and video.video_filename:
-            video_data['video_url'] = url_for('static', filename=f'uploads/videos/{video.video_filename}')
+        video_data = serialize_video(video, ('id', 'title', 'description', 'author', 'platform', 'video_id',
+                                             'external_url', 'duration', 'view_count', 'like_count'))
+        embed_url = get_video_embed_url(video)
+        if embed_url:
+            video_data['video_url'] = embed_url
         
         return jsonify(video_data)
     except Exception as e:
         print(f"API error: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/video/metadata')
+@admin_required
+def video_metadata_api():
+    """영상 등록 화면용 메타데이터 조회 (브라우저 대신 서버가 oEmbed 호출)"""
+    platform = request.args.get('platform', 'youtube')
+    url = request.args.get('url', '').strip()
+    try:
+        metadata = fetch_video_metadata(platform, url)
+        if not metadata:
+            return jsonify({'success': False, 'error': '지원하지 않는 영상 주소입니다.'}), 400
+        return jsonify({'success': True, **metadata})
+    except Exception as e:
+        print(f"Metadata API error: {e}")
+        return jsonify({'success': False, 'error': '영상 정보를 가져올 수 없습니다.'}), 502
+
 @app.route('/api/video/<int:video_id>/view', methods=['POST'])
-def update_view_count(video_id):
-    """조회수 업데이트 API"""
+def update_view_count(video_id, db_session=None):
+    """조회수 업데이트 API (같은 방문자의 반복 조회는 VIEW_DEDUP_SECONDS 안에서 한 번만 반영)"""
     try:
-        video = Video.query.get_or_404(video_id)
-        video.view_count += 1
-        db.session.commit()
-        return jsonify({'success': True, 'view_count': video.view_count})
+        # 없는 영상 id 로는 중복 제거/요청 제한 상태를 남기지 않도록 영상부터 확인
+        video = cached_video(video_id, db_session)
+        if video is None:
+            return jsonify({'success': False, 'error': '영상을 찾을 수 없습니다.'}), 404
+        result, retry_after = check_video_event('view', video_id, app.config['VIEW_DEDUP_SECONDS'])
+        if result == 'rate_limited':
+            return rate_limited_response(retry_after)
+        if result == 'accepted':
+            view_count = counter_buffer.record(video.copy(), 'view_count')
+        else:
+            view_count = counter_buffer.apply_pending(video.copy()).view_count or 0
+        return jsonify({'success': True, 'view_count': view_count, 'counted': result == 'accepted'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/video/<int:video_id>/like', methods=['POST'])
-def like_video_api(video_id):
-    """좋아요 API"""
+def like_video_api(video_id, db_session=None):
+    """좋아요 API (같은 방문자는 LIKE_DEDUP_SECONDS 안에 한 번만 반영)"""
     try:
-        video = Video.query.get_or_404(video_id)
-        video.like_count += 1
-        db.session.commit()
-        return jsonify({'success': True, 'like_count': video.like_count})
+        video = cached_video(video_id, db_session)
+        if video is None:
+            return jsonify({'success': False, 'error': '영상을 찾을 수 없습니다.'}), 404
+        result, retry_after = check_video_event('like', video_id, app.config['LIKE_DEDUP_SECONDS'])
+        if result == 'rate_limited':
+            return rate_limited_response(retry_after)
+        if result == 'accepted':
+            like_count = counter_buffer.record(video.copy(), 'like_count')
+        else:
+            like_count = counter_buffer.apply_pending(video.copy()).like_count or 0
+        return jsonify({'success': True, 'like_count': like_count, 'counted': result == 'accepted'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# ============================================
+# 영상 목록/일괄 조회 API (JSON, NDJSON 스트리밍)
+# ============================================
+VIDEO_API_DEFAULT_LIMIT = 24
+VIDEO_API_MAX_LIMIT = 100
+VIDEO_API_MAX_IDS = 100
+VIDEO_API_STREAM_BATCH = 200
+
+def format_api_date(value):
+    return value.isoformat() if value else None
+
+# 모델 컬럼이 아닌 필드는 필요할 때만 계산
+VIDEO_API_COMPUTED = {
+    'embed_url': get_video_embed_url,
+    'thumbnail_url': get_video_thumbnail_url,
+    'url': lambda video: url_for('view_video', video_id=video.id),
+    'tags': lambda video: [tag.name for tag in video.tag_items],
+    'performance_date': lambda video: format_api_date(video.performance_date),
+    'date_uploaded': lambda video: format_api_date(video.date_uploaded),
+    'cursor': lambda video: encode_cursor(video.date_uploaded, video.id),
+}
+VIDEO_API_FIELDS = ('id', 'title', 'description', 'author', 'platform', 'video_id', 'external_url', 'duration',
+                    'view_count', 'like_count', 'performance_date', 'date_uploaded', 'tags',
+                    'embed_url', 'thumbnail_url', 'url', 'cursor')
+
+def dump_json(value):
+    """API 응답 직렬화 (orjson 이 있으면 사용, 없으면 표준 json 으로 같은 형식 출력)"""
+    if orjson:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def serialize_video(video, fields=VIDEO_API_FIELDS):
+    """영상(ORM 객체 또는 캐시 사본)을 fields 의 키만 가진 dict 로 변환"""
+    return {field: VIDEO_API_COMPUTED[field](video) if field in VIDEO_API_COMPUTED else getattr(video, field)
+            for field in fields}
+
+def parse_video_fields():
+    """?fields=id,title,... (없으면 전체 필드), 모르는 필드가 있으면 ValueError"""
+    raw = request.args.get('fields', '').strip()
+    if not raw:
+        return VIDEO_API_FIELDS
+    fields = list(dict.fromkeys(field.strip() for field in raw.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in VIDEO_API_FIELDS]
+    if unknown:
+        raise ValueError(f"알 수 없는 필드: {', '.join(unknown)}")
+    return fields
+
+def json_response(payload):
+    """본문 해시를 ETag 로 붙인 JSON 응답, If-None-Match 가 일치하면 304"""
+    body = dump_json(payload)
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(hashlib.md5(body).hexdigest())
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def ndjson_response(lines):
+    """한 줄에 JSON 객체 하나씩 스트리밍 (본문을 다 만들기 전에 헤더를 보내므로 ETag 없음)"""
+    response = app.response_class(stream_with_context(lines), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def wants_ndjson(req=None):
+    req = request if req is None else req
+    return req.args.get('format') == 'ndjson' or \
+        req.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+def after_video_cursor(query, cursor):
+    """(date_uploaded, id) 키셋 커서 이후의 영상만"""
+    cursor_date, cursor_id = cursor
+    return query.filter(db.or_(
+        Video.date_uploaded < cursor_date,
+        db.and_(Video.date_uploaded == cursor_date, Video.id < cursor_id)
+    ))
+
+def stream_videos(query, fields, cursor, limit):
+    """커서 기준으로 VIDEO_API_STREAM_BATCH 개씩 끊어 조회하며 NDJSON 줄 생성 (limit 이 None 이면 끝까지)"""
+    sent = 0
+    while limit is None or sent < limit:
+        batch_size = VIDEO_API_STREAM_BATCH if limit is None else min(VIDEO_API_STREAM_BATCH, limit - sent)
+        batch_query = after_video_cursor(query, cursor) if cursor else query
+        batch = batch_query.order_by(Video.date_uploaded.desc(), Video.id.desc()).limit(batch_size).all()
+        for video in batch:
+            yield dump_json(serialize_video(counter_buffer.apply_pending(video), fields)) + b'\n'
+        sent += len(batch)
+        if len(batch) < batch_size:
+            break
+        cursor = (batch[-1].date_uploaded, batch[-1].id)
+        # 이미 보낸 행은 세션에 붙잡아 두지 않음
+        query.session.expunge_all()
+
+@app.route('/api/videos')
+def list_videos_api(db_session=None):
+    """
+    영상 일괄 조회/목록 API
+    - ?ids=3,1,2: 요청한 순서대로 (객체 캐시 사용), 없는 id 는 missing 에 표시
+    - ?after=커서&limit=N&tag=&year=: 최신순 목록, 응답의 next_cursor 로 다음 페이지
+    - ?fields=id,title,thumbnail_url: 필요한 필드만
+    - ?format=ndjson 또는 Accept: application/x-ndjson: 한 줄에 영상 하나씩 스트리밍 (limit 없으면 끝까지)
+    """
+    try:
+        fields = parse_video_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    ndjson = wants_ndjson()
+
+    if 'ids' in request.args:
+        try:
+            ids = [int(value) for value in request.args['ids'].split(',') if value.strip()]
+        except ValueError:
+            return jsonify({'error': 'ids 는 쉼표로 구분한 숫자여야 합니다.'}), 400
+        if len(ids) > VIDEO_API_MAX_IDS:
+            return jsonify({'error': f'ids 는 최대 {VIDEO_API_MAX_IDS}개까지 요청할 수 있습니다.'}), 400
+        videos = cached_videos(ids, db_session)
+        items = [serialize_video(counter_buffer.apply_pending(videos[video_id].copy()), fields)
+                 for video_id in ids if video_id in videos]
+        if ndjson:
+            return ndjson_response(dump_json(item) + b'\n' for item in items)
+        return json_response({'videos': items, 'missing': [video_id for video_id in ids if video_id not in videos]})
+
+    query, _, _ = filter_videos(query_session(db_session).query(Video).options(db.selectinload(Video.tag_items)))
+    after = request.args.get('after')
+    cursor = decode_cursor(after)
+    if after and not cursor:
+        return jsonify({'error': '잘못된 커서입니다.'}), 400
+    limit = request.args.get('limit', type=int)
+
+    if ndjson:
+        return ndjson_response(stream_videos(query, fields, cursor, max(limit, 0) if limit is not None else None))
+
+    limit = min(max(limit or VIDEO_API_DEFAULT_LIMIT, 1), VIDEO_API_MAX_LIMIT)
+    if cursor:
+        query = after_video_cursor(query, cursor)
+    rows = query.order_by(Video.date_uploaded.desc(), Video.id.desc()).limit(limit + 1).all()
+    videos = rows[:limit]
+    next_cursor = encode_cursor(videos[-1].date_uploaded, videos[-1].id) if len(rows) > limit else None
+    return json_response({
+        'videos': [serialize_video(counter_buffer.apply_pending(video), fields) for video in videos],
+        'next_cursor': next_cursor,
+    })
+
+# ============================================
+# 로컬 영상 분할 업로드 API (init / chunk / finalize)
+# ============================================
+def allowed_video_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_VIDEO_EXTENSIONS
+
+def partial_upload_path(upload_id):
+    return os.path.join(app.config['VIDEO_UPLOAD_TMP_FOLDER'], f'{upload_id}.part')
+
+def upload_status(upload):
+    return {
+        'upload_id': upload.id,
+        'filename': upload.filename,
+        'total_size': upload.total_size,
+        'received_size': upload.received_size,
+        'chunk_size': app.config['VIDEO_UPLOAD_CHUNK_SIZE'],
+        'complete': upload.received_size == upload.total_size,
+    }
+
+@app.route('/api/uploads/video', methods=['POST'])
+@admin_required
+def init_video_upload():
+    """업로드 세션 생성: {filename, size, title, description, author, tags, performance_date}"""
+    data = request.get_json(silent=True) or {}
+    filename = secure_filename(data.get('filename', ''))
+    total_size = data.get('size')
+
+    if not filename or not allowed_video_file(filename):
+        return jsonify({'error': '지원하지 않는 영상 형식입니다.'}), 400
+    if not isinstance(total_size, int) or total_size <= 0:
+        return jsonify({'error': '파일 크기가 올바르지 않습니다.'}), 400
+    if total_size > app.config['MAX_LOCAL_VIDEO_SIZE']:
+        return jsonify({'error': '파일이 너무 큽니다.'}), 413
+    if not data.get('title', '').strip():
+        return jsonify({'error': '영상 제목을 입력해주세요.'}), 400
+
+    meta = {key: str(data.get(key, '')).strip() for key in ('title', 'description', 'author', 'tags', 'performance_date')}
+    upload = VideoUpload(id=uuid.uuid4().hex, filename=filename, total_size=total_size,
+                         meta=json.dumps(meta, ensure_ascii=False))
+
+    os.makedirs(app.config['VIDEO_UPLOAD_TMP_FOLDER'], exist_ok=True)
+    open(partial_upload_path(upload.id), 'wb').close()
+
+    db.session.add(upload)
+    db.session.commit()
+    return jsonify(upload_status(upload)), 201
+
+@app.route('/api/uploads/video/<upload_id>', methods=['GET'])
+@admin_required
+def video_upload_status(upload_id):
+    """이어받기용 상태 조회: received_size 부터 다시 보내면 됨"""
+    upload = VideoUpload.query.get_or_404(upload_id)
+    return jsonify(upload_status(upload))
+
+@app.route('/api/uploads/video/<upload_id>', methods=['PUT'])
+@admin_required
+def upload_video_chunk(upload_id):
+    """?offset= 위치에 요청 본문(청크)을 바로 디스크에 기록, X-Chunk-SHA256 헤더로 검증"""
+    upload = VideoUpload.query.get_or_404(upload_id)
+    offset = request.args.get('offset', type=int)
+    expected_checksum = (request.headers.get('X-Chunk-SHA256') or '').lower()
+    chunk_length = request.content_length
+
+    if offset != upload.received_size:
+        # 청크는 순서대로만 받음, 연결이 끊겼다면 상태를 조회해 received_size 부터 이어서 전송
+        return jsonify({'error': '잘못된 offset 입니다.', **upload_status(upload)}), 409
+    if not chunk_length or chunk_length > app.config['VIDEO_UPLOAD_CHUNK_SIZE']:
+        return jsonify({'error': '청크 크기가 올바르지 않습니다.'}), 400
+    if offset + chunk_length > upload.total_size:
+        return jsonify({'error': '파일 크기를 초과했습니다.'}), 400
+    if not expected_checksum:
+        return jsonify({'error': 'X-Chunk-SHA256 헤더가 필요합니다.'}), 400
+
+    hasher = hashlib.sha256()
+    written = 0
+    with open(partial_upload_path(upload.id), 'r+b') as f:
+        f.seek(offset)
+        while True:
+            block = request.stream.read(64 * 1024)
+            if not block:
+                break
+            hasher.update(block)
+            f.write(block)
+            written += len(block)
+
+        if written != chunk_length or hasher.hexdigest() != expected_checksum:
+            # 연결이 끊기거나 체크섬이 다르면 이 청크는 버림
+            f.truncate(upload.received_size)
+            return jsonify({'error': '청크 검증에 실패했습니다.', **upload_status(upload)}), 422
+
+    previous_size = upload.received_size
+    new_size = offset + written
+    updated = VideoUpload.query.filter_by(id=upload.id, received_size=previous_size) \
+        .update({'received_size': new_size, 'updated_at': datetime.utcnow()}, synchronize_session=False)
+    db.session.commit()
+    if not updated:
+        db.session.refresh(upload)
+        return jsonify({'error': '다른 요청과 충돌했습니다.', **upload_status(upload)}), 409
+
+    upload.received_size = new_size
+    return jsonify(upload_status(upload))
+
+@app.route('/api/uploads/video/<upload_id>/finalize', methods=['POST'])
+@admin_required
+def finalize_video_upload(upload_id):
+    """모든 청크를 받은 업로드를 영상 폴더로 옮기고 Video 행 생성"""
+    upload = VideoUpload.query.get_or_404(upload_id)
+    if upload.received_size != upload.total_size:
+        return jsonify({'error': '아직 모든 청크를 받지 않았습니다.', **upload_status(upload)}), 409
+
+    part_path = partial_upload_path(upload.id)
+    hasher = hashlib.sha256()
+    try:
+        with open(part_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+    except FileNotFoundError:
+        # 동시에 들어온 다른 finalize 요청이 이미 옮겼거나 만료 작업이 지운 경우
+        return jsonify({'error': '이미 처리되었거나 만료된 업로드입니다.'}), 409
+    digest = hasher.hexdigest()
+
+    expected_checksum = ((request.get_json(silent=True) or {}).get('sha256') or '').lower()
+    if expected_checksum and expected_checksum != digest:
+        return jsonify({'error': '파일 체크섬이 일치하지 않습니다.'}), 422
+
+    # 조건부 DELETE 로 업로드를 먼저 차지: 동시에 들어온 finalize 나 만료 작업 중 하나만 통과
+    claimed = VideoUpload.query.filter_by(id=upload.id, received_size=upload.total_size) \
+        .delete(synchronize_session=False)
+    if claimed != 1:
+        db.session.rollback()
+        return jsonify({'error': '이미 처리되었거나 만료된 업로드입니다.'}), 409
+
+    # 내용 해시 기반 파일명 (같은 이름이면 내용도 같으므로 캐시를 오래 유지할 수 있음)
+    # 같은 영상을 다시 올리면 파일 하나를 여러 Video 행이 함께 가리킴 (삭제는 delete_video_files 작업이 확인)
+    extension = os.path.splitext(upload.filename)[1].lower()
+    video_filename = f'{digest[:32]}{extension}'
+
+    meta = json.loads(upload.meta or '{}')
+    video = Video(
+        title=meta.get('title') or upload.filename,
+        description=meta.get('description', ''),
+        author=meta.get('author') or '앙상블 다유',
+        platform='local',
+        video_filename=video_filename,
+        file_size=upload.total_size,
+    )
+    update_video_performance_date(video, meta.get('performance_date'))
+
+    db.session.add(video)
+    set_video_tags(video, meta.get('tags'))
+    index_video(video)
+    enqueue_job('refresh_related_videos', {'changed': [video.id]})
+    try:
+        db.session.commit()
+    except Exception:
+        # 롤백되면 업로드 행도 되살아나므로 .part 파일을 그대로 두고 다시 finalize 할 수 있음
+        db.session.rollback()
+        raise
+
+    # Video 행이 저장된 뒤에 옮기므로 delete_video_files 작업은 이 파일을 참조 중으로 보고 지우지 않음
+    os.makedirs(app.config['LOCAL_VIDEO_FOLDER'], exist_ok=True)
+    shutil.move(part_path, os.path.join(app.config['LOCAL_VIDEO_FOLDER'], video_filename))
+    response_cache.invalidate('videos')
+    object_cache.invalidate('related_ids')
+
+    return jsonify({'success': True, 'video_id': video.id, 'video_filename': video_filename}), 201
+
+def schedule_video_upload_expiry(from_job=False):
+    """expire_video_uploads 작업을 VIDEO_UPLOAD_TTL_HOURS 뒤로 예약 (워커 시작 시, 작업이 끝날 때)"""
+    schedule_periodic_job('expire_video_uploads', app.config['VIDEO_UPLOAD_TTL_HOURS'], from_job)
+
+@job_handler('expire_video_uploads')
+def expire_video_uploads_job(payload):
+    """created_at 이 VIDEO_UPLOAD_TTL_HOURS 보다 오래된 업로드 세션과 .part 파일, 행이 없는 .part 파일 정리"""
+    ttl = timedelta(hours=app.config['VIDEO_UPLOAD_TTL_HOURS'])
+    cutoff = datetime.utcnow() - ttl
+    stale_ids = [upload_id for (upload_id,) in
+                 db.session.query(VideoUpload.id).filter(VideoUpload.created_at < cutoff).all()]
+    for upload_id in stale_ids:
+        # finalize 와 같은 조건부 DELETE: 먼저 차지한 쪽만 파일을 다룸
+        expired = VideoUpload.query.filter(VideoUpload.id == upload_id, VideoUpload.created_at < cutoff) \
+            .delete(synchronize_session=False)
+        db.session.commit()
+        if expired and os.path.exists(partial_upload_path(upload_id)):
+            os.remove(partial_upload_path(upload_id))
+
+    folder = app.config['VIDEO_UPLOAD_TMP_FOLDER']
+    if os.path.isdir(folder):
+        for name in os.listdir(folder):
+            path = os.path.join(folder, name)
+            upload_id = name[:-len('.part')] if name.endswith('.part') else None
+            if upload_id is None or time.time() - os.path.getmtime(path) < ttl.total_seconds():
+                continue
+            if db.session.get(VideoUpload, upload_id) is None:
+                os.remove(path)
+    schedule_video_upload_expiry(from_job=True)
+
+@job_handler('delete_video_files')
+def delete_video_files_job(payload):
+    """삭제된 영상의 파일/썸네일 정리, 같은 파일을 가리키는 Video 행이 남아 있으면 지우지 않음"""
+    for filename in payload.get('filenames', []):
+        if Video.query.filter_by(video_filename=filename).first() is not None:
+            continue
+        path = os.path.join(app.config['LOCAL_VIDEO_FOLDER'], filename)
+        if os.path.exists(path):
+            os.remove(path)
+    for filename in payload.get('thumbnails', []):
+        if Video.query.filter_by(thumbnail_filename=filename).first() is not None:
+            continue
+        path = os.path.join(app.config['THUMBNAIL_UPLOAD_FOLDER'], filename)
+        if os.path.exists(path):
+            os.remove(path)
+        remove_image_derivatives(f'uploads/thumbnails/{filename}')
+
+# ============================================
+# 로컬 영상 스트리밍 (HTTP Range)
+# ============================================
+CONTENT_HASH_FILENAME = re.compile(r'[0-9a-f]{32}\.[a-z0-9]+')
+
+def resolve_byte_ranges(byte_range, size):
+    """Range 헤더의 구간들을 [start, stop) 으로 정규화, 만족할 수 없는 구간은 제외"""
+    resolved = []
+    for start, stop in byte_range.ranges:
+        if start < 0:
+            start, stop = max(size + start, 0), size
+        stop = size if stop is None else min(stop, size)
+        if start < stop:
+            resolved.append((start, stop))
+    return resolved
+
+def multi_range_response(path, ranges, size, mimetype, etag):
+    """여러 구간 요청에 대한 multipart/byteranges 응답 (파일을 블록 단위로 읽어 스트리밍)"""
+    boundary = uuid.uuid4().hex
+
+    def generate():
+        with open(path, 'rb') as f:
+            for start, stop in ranges:
+                yield (f'--{boundary}\r\nContent-Type: {mimetype}\r\n'
+                       f'Content-Range: bytes {start}-{stop - 1}/{size}\r\n\r\n').encode()
+                f.seek(start)
+                remaining = stop - start
+                while remaining > 0:
+                    block = f.read(min(256 * 1024, remaining))
+                    if not block:
+                        break
+                    remaining -= len(block)
+                    yield block
+                yield b'\r\n'
+        yield f'--{boundary}--\r\n'.encode()
+
+    response = app.response_class(generate(), status=206, mimetype=f'multipart/byteranges; boundary={boundary}')
+    response.set_etag(etag)
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
+
+@app.route('/media/videos/<path:filename>')
+def stream_video(filename):
+    """로컬 영상 전송: 단일/다중 Range(206), 강한 ETag, 내용 해시 파일명은 immutable 캐시"""
+    path = safe_join(app.config['LOCAL_VIDEO_FOLDER'], filename)
+    if not path or not os.path.isfile(path):
+        abort(404)
+
+    stat = os.stat(path)
+    content_addressed = bool(CONTENT_HASH_FILENAME.fullmatch(filename))
+    # 내용 해시 파일명이면 파일명 자체가 내용의 식별자
+    etag = filename.split('.')[0] if content_addressed else f'{int(stat.st_mtime)}-{stat.st_size}'
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    byte_range = request.range
+    # If-Range 가 현재 ETag 와 다르면 Range 를 무시하고 전체 전송
+    range_applies = byte_range and (not request.headers.get('If-Range') or request.if_range.etag == etag)
+    if range_applies and len(byte_range.ranges) > 1 and not request.if_none_match.contains(etag):
+        ranges = resolve_byte_ranges(byte_range, stat.st_size)
+        if not ranges:
+            response = app.response_class(status=416)
+            response.headers['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if len(ranges) <= VIDEO_MAX_RANGES:
+            response = multi_range_response(path, ranges, stat.st_size, mimetype, etag)
+        else:
+            # 구간이 너무 많으면 전체 전송
+            response = send_file(path, mimetype=mimetype, etag=etag, conditional=False)
+    else:
+        # 단일 Range/조건부 요청은 werkzeug 가 처리 (wsgi.file_wrapper 로 sendfile 사용)
+        response = send_file(path, mimetype=mimetype, etag=etag, conditional=True)
+
+    response.headers['Accept-Ranges'] = 'bytes'
+    if content_addressed:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+# ============================================
+# 정적 자산 (CSS/JS) 빌드 및 전송
+# ============================================
+ASSET_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+CSS_STRING_OR_COMMENT = re.compile(r'("(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\')|/\*.*?\*/', re.S)
+CSS_STRING = re.compile(r'("(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\')')
+_asset_manifest = None
+
+def minify_css(text):
+    """주석 제거, 공백 축소 (따옴표 안의 문자열은 그대로 둠)"""
+    text = CSS_STRING_OR_COMMENT.sub(lambda m: m.group(1) or '', text)
+    parts = CSS_STRING.split(text)
+    for i in range(0, len(parts), 2):
+        part = re.sub(r'\s+', ' ', parts[i])
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        parts[i] = re.sub(r':\s+', ':', part).replace(';}', '}')
+    return ''.join(parts).strip()
+
+def minify_js(text):
+    """rjsmin 으로 공백/주석 제거 (문자열, 템플릿 리터럴, 정규식 리터럴 안은 그대로), 패키지가 없으면 원본 그대로"""
+    if rjsmin is None:
+        print("rjsmin 패키지가 없어 JS 파일은 축소하지 않습니다.")
+        return text
+    return rjsmin.jsmin(text)
+
+def precompress_asset(path, data):
+    """path.gz, path.br 생성 (원본보다 작을 때만), 인코딩별 크기 반환"""
+    compressed = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+        compressed['br'] = brotli.compress(data, quality=11)
+    except ImportError:
+        print("brotli 패키지가 없어 .br 파일은 만들지 않습니다.")
+
+    sizes = {}
+    for encoding, suffix in ASSET_ENCODINGS:
+        if encoding in compressed and len(compressed[encoding]) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed[encoding])
+            sizes[encoding] = len(compressed[encoding])
+    return sizes
+
+def build_assets(echo=print, clean=False):
+    """static/css, static/js 를 축소해 static/build 에 '이름.해시.확장자' 로 저장하고 manifest 작성"""
+    manifest = {}
+    for directory in ASSET_SOURCE_DIRS:
+        source_dir = os.path.join(ASSET_SOURCE_FOLDER, directory)
+        if not os.path.isdir(source_dir):
+            continue
+        os.makedirs(os.path.join(ASSET_BUILD_FOLDER, directory), exist_ok=True)
+        for name in sorted(os.listdir(source_dir)):
+            stem, ext = os.path.splitext(name)
+            if ext not in ('.css', '.js'):
+                continue
+            with open(os.path.join(source_dir, name), encoding='utf-8') as f:
+                source = f.read()
+            minified = (minify_css if ext == '.css' else minify_js)(source).encode('utf-8')
+            built_name = f'{directory}/{stem}.{hashlib.sha256(minified).hexdigest()[:12]}{ext}'
+            path = os.path.join(ASSET_BUILD_FOLDER, built_name)
+            with open(path, 'wb') as f:
+                f.write(minified)
+            sizes = precompress_asset(path, minified)
+            manifest[f'{directory}/{name}'] = built_name
+            compressed = ', '.join(f'{encoding} {size:,}' for encoding, size in sizes.items())
+            echo(f"{directory}/{name}: {len(source.encode('utf-8')):,} -> {len(minified):,} B ({compressed}) => {built_name}")
+
+    # 워커가 읽는 중에도 완성된 파일만 보이도록 임시 파일로 쓰고 교체
+    temp_path = f'{ASSET_MANIFEST}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, ASSET_MANIFEST)
+
+    if clean:
+        keep = {os.path.normpath(built_name) for built_name in manifest.values()}
+        for root, _, filenames in os.walk(ASSET_BUILD_FOLDER):
+            for filename in filenames:
+                rel_path = os.path.relpath(os.path.join(root, filename), ASSET_BUILD_FOLDER)
+                base = re.sub(r'\.(gz|br)$', '', rel_path)
+                if rel_path != 'manifest.json' and base not in keep:
+                    os.remove(os.path.join(root, filename))
+                    echo(f"삭제: {rel_path}")
+
+    global _asset_manifest
+    _asset_manifest = manifest
+    return manifest
+
+def load_asset_manifest():
+    """빌드 manifest (워커마다 한 번 읽음, 아직 빌드 전이면 다음 호출 때 다시 확인)"""
+    global _asset_manifest
+    if not _asset_manifest or app.debug:
+        try:
+            with open(ASSET_MANIFEST, encoding='utf-8') as f:
+                _asset_manifest = json.load(f)
+        except (OSError, ValueError):
+            _asset_manifest = {}
+    return _asset_manifest
+
+def asset_url(name):
+    """자산 주소 ('css/base.css' -> /assets/css/base.<해시>.css), 빌드 전이면 원본 정적 파일 주소"""
+    built_name = load_asset_manifest().get(name)
+    if built_name:
+        return url_for('serve_asset', filename=built_name)
+    return url_for('static', filename=name)
+
+@app.route('/assets/<path:filename>')
+def serve_asset(filename):
+    """빌드된 자산 전송: Accept-Encoding 에 맞춰 미리 압축한 파일, 파일명에 해시가 있으므로 immutable 캐시"""
+    path = safe_join(ASSET_BUILD_FOLDER, filename)
+    if not path or not os.path.isfile(path) or filename == 'manifest.json':
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for candidate, suffix in ASSET_ENCODINGS:
+        if request.accept_encodings[candidate] and os.path.isfile(path + suffix):
+            encoding, path = candidate, path + suffix
+            break
+
+    response = send_file(path, mimetype=mimetype, conditional=True)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 # ============================================
 # 디버그 라우트
 # ============================================
@@ -805,17 +4511,272 @@ def debug_db():
             'message': str(e)
         })
 
+# ============================================
+# CLI 명령
+# ============================================
+schema_cli = AppGroup('db', help='스키마 마이그레이션과 쿼리 계획 확인')
+app.cli.add_command(schema_cli)
+
+@schema_cli.command('upgrade')
+@click.option('--to', 'target', type=int, default=None, help='이 버전까지만 적용 (기본: 최신)')
+def db_upgrade_command(target):
+    """아직 적용되지 않은 마이그레이션 실행 (배포 시 한 번)"""
+    applied = upgrade_schema(target, echo=click.echo)
+    click.echo(f"현재 스키마 버전: {current_schema_version()} (적용 {applied}개)")
+
+@schema_cli.command('downgrade')
+@click.option('--to', 'target', type=int, required=True, help='되돌릴 목표 버전')
+def db_downgrade_command(target):
+    """target 버전까지 마이그레이션 되돌리기"""
+    try:
+        downgrade_schema(target, echo=click.echo)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"현재 스키마 버전: {current_schema_version()}")
+
+@schema_cli.command('current')
+def db_current_command():
+    """현재 스키마 버전과 대기 중인 마이그레이션 표시"""
+    current = current_schema_version()
+    click.echo(f"현재 스키마 버전: {current}")
+    for step in sorted(MIGRATIONS, key=lambda step: step.version):
+        state = '적용됨' if step.version <= current else '대기'
+        click.echo(f"  {step.version:>3} [{state}] {step.description}")
+
+def hot_queries():
+    """자주 실행되는 라우트 쿼리 (이름, 쿼리, 인덱스 순서로 정렬되어야 하는지)"""
+    now = datetime.utcnow()
+    return [
+        ('board', Post.query.order_by(Post.date_posted.desc(), Post.id.desc()).limit(13), True),
+        ('board ?after=', Post.query.filter(db.or_(
+            Post.date_posted < now, db.and_(Post.date_posted == now, Post.id < 100)
+        )).order_by(Post.date_posted.desc(), Post.id.desc()).limit(13), True),
+        ('board ?year=', Post.query.filter(Post.performance_date >= now.date(),
+                                           Post.performance_date < now.date() + timedelta(days=365)), False),
+        ('post images', PostImage.query.filter_by(post_id=1).order_by(PostImage.display_order, PostImage.id), True),
+        ('primary image', PostImage.query.filter_by(post_id=1, is_primary=True).limit(1), False),
+        ('image counts', db.session.query(PostImage.post_id, db.func.count(PostImage.id))
+            .filter(PostImage.post_id.in_([1, 2, 3])).group_by(PostImage.post_id), False),
+        ('portfolio', Video.query.order_by(Video.date_uploaded.desc(), Video.id.desc()).limit(9), True),
+        ('portfolio ?after=', Video.query.filter(db.or_(
+            Video.date_uploaded < now, db.and_(Video.date_uploaded == now, Video.id < 100)
+        )).order_by(Video.date_uploaded.desc(), Video.id.desc()).limit(25), True),
+        ('portfolio ?tag=', Video.query.join(video_tag, video_tag.c.video_id == Video.id)
+            .join(Tag, Tag.id == video_tag.c.tag_id).filter(Tag.name == 'tag'), False),
+        ('related videos', Video.query.join(RelatedVideo, RelatedVideo.related_id == Video.id)
+            .filter(RelatedVideo.video_id == 1).order_by(RelatedVideo.rank).limit(4), True),
+        ('admin contacts', Contact.query.order_by(Contact.date_sent.desc(), Contact.id.desc()).limit(51), True),
+        ('admin contacts ?status=', Contact.query.filter(Contact.answered == db.false())
+            .order_by(Contact.date_sent.desc(), Contact.id.desc()).limit(51), True),
+        ('admin contacts ?status=&from=', Contact.query.filter(Contact.answered == db.true(),
+            Contact.date_sent >= now - timedelta(days=30)).order_by(Contact.date_sent.desc(), Contact.id.desc())
+            .limit(51), True),
+        ('contact counts', db.session.query(Contact.answered, db.func.count(Contact.id))
+            .group_by(Contact.answered), False),
+        ('job claim', db.session.query(Job.id).filter(Job.status == 'pending', Job.run_after <= now)
+            .order_by(Job.run_after, Job.id).limit(5), True),
+    ]
+
+def explain_query(query):
+    """쿼리 계획을 줄 단위 문자열 목록으로 반환"""
+    compiled = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    connection = db.session.connection()
+    if db.engine.dialect.name == 'postgresql':
+        # 테스트 DB 는 행이 적어 순차 스캔이 더 싸게 나오므로 인덱스를 쓸 수 있는지만 확인
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        rows = connection.exec_driver_sql(f'EXPLAIN {compiled}', params).fetchall()
+        return [row[0] for row in rows]
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params).fetchall()
+    return [row[-1] for row in rows]
+
+def plan_problems(plan, ordered):
+    """전체 테이블 스캔, (ordered 이면) 별도 정렬 단계 찾기"""
+    problems = []
+    for line in plan:
+        step = line.strip(' -|`>')
+        if step.startswith('Seq Scan') or (step.startswith('SCAN ') and 'USING' not in step
+                                             and 'CONSTANT ROW' not in step):
+            problems.append(step)
+        elif ordered and ('TEMP B-TREE FOR ORDER BY' in step or step.startswith('Sort ')):
+            problems.append(step)
+    return problems
+
+@schema_cli.command('explain')
+@click.option('--verbose', is_flag=True, help='모든 쿼리 계획 출력')
+def db_explain_command(verbose):
+    """주요 라우트 쿼리가 인덱스를 쓰는지 EXPLAIN 으로 확인 (전체 스캔이 있으면 실패)"""
+    failures = 0
+    for name, query, ordered in hot_queries():
+        plan = explain_query(query)
+        problems = plan_problems(plan, ordered)
+        click.echo(f"{'FAIL' if problems else 'ok  '} {name}")
+        if problems or verbose:
+            for line in plan:
+                click.echo(f"       {line}")
+        failures += bool(problems)
+    db.session.rollback()
+    if failures:
+        raise click.ClickException(f'인덱스를 쓰지 않는 쿼리 {failures}개')
+
+storage_cli = AppGroup('storage', help='업로드 폴더 점검과 고아 파일 정리')
+app.cli.add_command(storage_cli)
+
+@storage_cli.command('fsck')
+@click.option('--grace', type=int, default=None, help='이보다 최근(초)에 생긴 파일은 고아로 보지 않음')
+def storage_fsck_command(grace):
+    """업로드 폴더와 DB 비교: 고아/누락 파일, 참조 수 불일치, 사용량 (아무것도 바꾸지 않음)"""
+    report = check_storage(reclaim=False, grace=grace)
+    for line in storage_report_lines(report):
+        click.echo(line)
+    for result in report.values():
+        for key in result.get('orphans', []):
+            click.echo(f"  고아 {key}")
+        for key in result.get('missing', []):
+            click.echo(f"  누락 {key}")
+
+@storage_cli.command('gc')
+@click.option('--grace', type=int, default=None, help='이보다 최근(초)에 생긴 파일은 지우지 않음')
+def storage_gc_command(grace):
+    """고아 파일(원본, 파생본) 삭제, 참조 수 바로잡기"""
+    for line in storage_report_lines(check_storage(reclaim=True, grace=grace)):
+        click.echo(line)
+
+@app.cli.command('init')
+def init_command():
+    """배포 시 한 번 실행: 업로드 폴더 생성, 스키마 마이그레이션 적용, 정적 자산 빌드"""
+    prepare_upload_folders()
+    applied = upgrade_schema(echo=click.echo)
+    assets = build_assets(echo=lambda message: None)
+    click.echo("=" * 50)
+    click.echo("Render.com 배포용 Flask 앱 초기화 완료!")
+    # 어떤 DB 에 적용했는지 확인용 (비밀번호는 가림)
+    click.echo(f"  - 데이터베이스 {db.engine.dialect.name}: {db.engine.url.render_as_string(hide_password=True)}")
+    click.echo(f"  - 스키마 버전 {current_schema_version()} (이번에 적용 {applied}개)")
+    click.echo(f"  - 정적 자산 {len(assets)}개 빌드")
+    click.echo("  - 게시판 (다중 이미지 지원)")
+    click.echo("  - 포트폴리오 (YouTube/Vimeo/로컬 비디오)")
+    click.echo("  - 연락처 폼")
+    click.echo("  - 관리자 기능")
+    click.echo("=" * 50)
+
+@app.cli.command('build-assets')
+@click.option('--clean', is_flag=True, help='현재 manifest 에 없는 이전 빌드 파일 삭제')
+def build_assets_command(clean):
+    """CSS/JS 축소, 내용 해시 파일명, gzip/brotli 미리 압축 (배포 시 한 번)"""
+    manifest = build_assets(echo=click.echo, clean=clean)
+    click.echo(f"{len(manifest)}개 자산 빌드 -> {ASSET_MANIFEST}")
+
+@app.cli.command('backfill-dates')
+@click.option('--all', 'refresh_all', is_flag=True, help='이미 날짜가 있는 행도 다시 계산')
+@click.option('--batch-size', default=500, show_default=True)
+def backfill_dates_command(refresh_all, batch_size):
+    """기존 게시글/영상의 공연 날짜 컬럼 채우기"""
+    def update_video(video):
+        # 관리자가 직접 입력한 공연 날짜는 덮어쓰지 않음
+        if not video.performance_date:
+            update_video_performance_date(video)
+    
+    for model, update in ((Post, update_post_performance_date), (Video, update_video)):
+        query = model.query.order_by(model.id)
+        if not refresh_all:
+            query = query.filter(model.performance_date.is_(None))
+        
+        updated = 0
+        last_id = 0
+        while True:
+            rows = query.filter(model.id > last_id).limit(batch_size).all()
+            if not rows:
+                break
+            for row in rows:
+                update(row)
+                if row.performance_date:
+                    updated += 1
+            last_id = rows[-1].id
+            db.session.commit()
+        click.echo(f"{model.__tablename__}: {updated}개 행의 공연 날짜 갱신")
+
+@app.cli.command('backfill-tags')
+@click.option('--batch-size', default=200, show_default=True)
+def backfill_tags_command(batch_size):
+    """기존 Video.tags 문자열을 tag/video_tag 테이블로 다시 옮기기 (마이그레이션 6 과 같음, 여러 번 실행해도 안전)"""
+    migrated = backfill_video_tags(batch_size)
+    response_cache.invalidate('videos')
+    object_cache.invalidate('video')
+    click.echo(f"video: {migrated}개 영상의 태그 이전, 태그 {Tag.query.count()}개")
+
+@app.cli.command('rebuild-related-videos')
+def rebuild_related_videos_command():
+    """모든 영상의 관련 영상 목록 다시 계산"""
+    video_ids = [row.id for row in db.session.query(Video.id)]
+    rebuilt = refresh_related_videos(rebuild_ids=video_ids)
+    click.echo(f"video: {rebuilt}개 영상의 관련 영상 갱신")
+
+@app.cli.command('build-image-derivatives')
+@click.option('--force', is_flag=True, help='이미 있는 파생본도 다시 생성')
+def build_image_derivatives_command(force):
+    """업로드 이미지와 단원 사진의 반응형/WebP 파생본 일괄 생성"""
+    for prefix in ('uploads', 'images/members'):
+        folder = os.path.join(app.static_folder, prefix)
+        if not os.path.isdir(folder):
+            continue
+        
+        created = 0
+        for entry in os.scandir(folder):
+            if not entry.is_file() or not supports_derivatives(entry.name):
+                continue
+            try:
+                created += generate_image_derivatives(f'{prefix}/{entry.name}', force=force)
+            except Exception as e:
+                click.echo(f"{prefix}/{entry.name}: 파생본 생성 실패 ({e})")
+        click.echo(f"{prefix}: 파생본 {created}개 생성")
+
+@app.cli.command('run-jobs')
+@click.option('--once', is_flag=True, help='대기 중인 작업만 처리하고 종료')
+def run_jobs_command(once):
+    """백그라운드 작업 전용 워커 (JOB_WORKERS=0 으로 웹 워커 처리를 끈 경우)"""
+    bootstrap_app()
+    while True:
+        processed = job_queue.run_pending()
+        if processed:
+            click.echo(f"작업 {processed}개 처리")
+        if once:
+            break
+        time.sleep(job_queue.poll_interval)
+
+@app.cli.command('rebuild-search-index')
+@click.option('--batch-size', default=500, show_default=True)
+def rebuild_search_index_command(batch_size):
+    """게시글/영상 전체로 검색 색인 다시 만들기"""
+    ensure_search_index()
+    SearchDocument.query.delete()
+    db.session.commit()
+
+    for model, index in ((Post, index_post), (Video, index_video)):
+        indexed = 0
+        last_id = 0
+        while True:
+            rows = model.query.filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+            if not rows:
+                break
+            for row in rows:
+                index(row)
+            indexed += len(rows)
+            last_id = rows[-1].id
+            db.session.commit()
+        click.echo(f"{model.__tablename__}: {indexed}개 문서 색인")
+
+    if db.engine.dialect.name == 'sqlite':
+        # 트리거가 빠진 채로 쌓인 행이 있어도 원본 테이블 기준으로 다시 색인
+        db.session.execute(db.text("INSERT INTO search_fts(search_fts) VALUES ('rebuild')"))
+        db.session.execute(db.text("INSERT INTO search_fts(search_fts) VALUES ('optimize')"))
+        db.session.commit()
+
 # ============================================
 # 앱 실행
 # ============================================
 if __name__ == '__main__':
-    app.run(debug=True)
-
-print("="*50)
-print("Render.com 배포용 Flask 앱 초기화 완료!")
-print("지원 기능:")
-print("  - 게시판 (다중 이미지 지원)")
-print("  - 포트폴리오 (YouTube/Vimeo/로컬 비디오)")
-print("  - 연락처 폼")
-print("  - 관리자 기능")
-print("="*50)
\ No newline at end of file
+    app.run(debug=True)
\ No newline at end of file
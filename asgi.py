@@ -0,0 +1,231 @@
+"""
+ASGI 진입점 (비동기 서빙 모드)
+
+    uvicorn asgi:application --workers 4
+    gunicorn asgi:application -k uvicorn.workers.UvicornWorker --workers 4
+
+기본값(ASGI_ASYNC_DB=0)은 모든 라우트를 스레드 풀의 Flask 앱으로 처리한다 (a2wsgi).
+ASGI_ASYNC_DB=1 이면 게시판, 포트폴리오, 게시글/영상 상세 페이지와 /api/video(s) 조회 API 는 DB 를
+비동기 드라이버(PostgreSQL: asyncpg, SQLite: aiosqlite)로 접근한다. 뷰 코드는 동기 모드와 같은 함수를 AsyncSession.run_sync 안에서
+실행하므로, 쿼리 결과를 기다리는 동안 워커가 다른 요청을 처리한다. 요청 전/후 처리(before_request 의
+레이트 리미터·문의 수 조회, after_request 훅)는 스레드 풀에서 실행하지만, 뷰 안의 응답 캐시 조회와
+템플릿 렌더링은 이벤트 루프에서 실행되므로 그동안은 다른 요청을 처리하지 못한다. 따라서 이득은 쿼리
+대기 시간이 렌더링 시간보다 긴 원격 DB 에서만 기대할 수 있다 (RESPONSE_CACHE_DB 를 쓰면 캐시 조회도
+SQLite 파일 I/O 로 루프를 막는다). 본문을 읽는 POST 라우트, 관리자/업로드/폼 라우트와 정적·미디어 파일
+전송은 이때도 스레드 풀에서 실행한다. 측정(benchmarks/asgi_load.py)에서 비동기 경로가 스레드 풀보다
+느렸으므로 실제 DB 에 대고 이득을 확인한 배포에서만 켠다.
+"""
+import io
+import os
+import sys
+import asyncio
+
+from a2wsgi import WSGIMiddleware
+from flask_sqlalchemy.query import Query
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from werkzeug.exceptions import HTTPException
+from werkzeug.wrappers import Request
+
+from app import app, db, bootstrap_app, wants_ndjson
+
+# 비동기 세션으로 처리하는 GET 전용 라우트 (뷰 함수가 db_session 인자를 받아야 함)
+# 요청 본문을 넘기지 않으므로 POST 라우트는 넣지 않음 (스레드 풀의 WSGI 앱이 처리)
+ASYNC_ENDPOINTS = {
+    'board', 'view_post', 'portfolio', 'view_video',
+    'get_video_info', 'list_videos_api',
+}
+
+app.config['ASGI_WSGI_THREADS'] = int(os.environ.get('ASGI_WSGI_THREADS', 10))
+# 1 이면 ASYNC_ENDPOINTS 를 비동기 드라이버로 처리, 그 외(기본값 0)는 모든 라우트를 스레드 풀에서 처리
+# (벤치마크에서 비동기 경로가 SQLite 222 req/s, 스레드 풀 248 req/s 로 오히려 느려 기본값은 끔)
+app.config['ASGI_ASYNC_DB'] = os.environ.get('ASGI_ASYNC_DB', '0')
+
+def async_database_url(url):
+    """동기 엔진 URL 을 같은 DB 를 가리키는 비동기 드라이버 URL 로 변환"""
+    if url.drivername.startswith('postgresql'):
+        return url.set(drivername='postgresql+asyncpg')
+    if url.drivername.startswith('sqlite'):
+        return url.set(drivername='sqlite+aiosqlite')
+    return url
+
+def build_async_engine_options(url):
+    """DB_* 환경 변수로 비동기 엔진 연결 풀 옵션 구성 (동기 엔진과 같은 값)"""
+    options = {'pool_recycle': app.config['DB_POOL_RECYCLE']}
+    if app.config['DB_PRE_PING'] == 'always':
+        options['pool_pre_ping'] = True
+
+    if url.drivername.startswith('sqlite') and url.database in (None, '', ':memory:'):
+        return options
+    options.update({
+        'pool_size': app.config['DB_POOL_SIZE'],
+        'max_overflow': app.config['DB_MAX_OVERFLOW'],
+        'pool_timeout': app.config['DB_POOL_TIMEOUT'],
+    })
+    if url.drivername.startswith('postgresql'):
+        server_settings = {'application_name': app.config['DB_APPLICATION_NAME']}
+        if app.config['DB_STATEMENT_TIMEOUT_MS']:
+            server_settings['statement_timeout'] = str(app.config['DB_STATEMENT_TIMEOUT_MS'])
+        options['connect_args'] = {'server_settings': server_settings}
+    return options
+
+def build_environ(scope):
+    """ASGI HTTP scope 를 WSGI environ 으로 변환 (본문은 넘기지 않으므로 GET 라우트에만 사용)"""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]) if server[1] is not None else '80',
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope['headers']:
+        name = name.decode('latin-1')
+        if name == 'content-type':
+            key = 'CONTENT_TYPE'
+        elif name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if key in environ:
+            value = f'{environ[key]},{value}'
+        environ[key] = value
+    return environ
+
+class AsyncApplication:
+    """읽기 전용 라우트는 비동기 세션으로, 나머지는 스레드 풀의 WSGI 앱으로 처리"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_WSGI_THREADS'])
+        self.engine = None
+        self.sessions = None
+        self.async_db = flask_app.config['ASGI_ASYNC_DB'] == '1'
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] == 'http':
+            environ = build_environ(scope)
+            route = self.match(environ)
+            if route is not None:
+                await self.dispatch(environ, *route, send)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def startup(self):
+        """워커 프로세스마다 한 번: 동기 모드의 첫 요청 초기화 + 비동기 엔진 생성"""
+        def bootstrap():
+            with self.flask_app.app_context():
+                bootstrap_app()
+        await asyncio.to_thread(bootstrap)
+        if self.async_db:
+            self.ensure_engine()
+
+    async def shutdown(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+            self.sessions = None
+
+    def ensure_engine(self):
+        """lifespan 을 지원하지 않는 서버에서는 첫 요청 때 생성"""
+        if self.engine is not None:
+            return
+        with self.flask_app.app_context():
+            url = async_database_url(db.engine.url)
+        self.engine = create_async_engine(url, **build_async_engine_options(url))
+        # Flask-SQLAlchemy Query 를 써야 뷰 코드의 .paginate() 가 그대로 동작
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False, query_cls=Query)
+
+    def match(self, environ):
+        """비동기로 처리할 라우트이면 (endpoint, view_args), 아니면 None"""
+        if not self.async_db:
+            return None
+        adapter = self.flask_app.url_map.bind_to_environ(
+            environ, server_name=self.flask_app.config['SERVER_NAME'])
+        try:
+            endpoint, view_args = adapter.match()
+        except HTTPException:
+            # 404, 405, 슬래시 리다이렉트 등은 Flask 가 평소대로 응답
+            return None
+        if endpoint not in ASYNC_ENDPOINTS or environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+            return None
+        # NDJSON 스트리밍은 응답을 만드는 동안 세션을 붙잡으므로 스레드 풀에서 처리
+        if endpoint == 'list_videos_api' and wants_ndjson(Request(environ)):
+            return None
+        return endpoint, view_args
+
+    async def dispatch(self, environ, endpoint, view_args, send):
+        """Flask.full_dispatch_request 와 같은 순서로 처리하되 뷰는 비동기 세션 위에서 실행
+
+        요청 전/후 처리와 응답 본문 생성은 SQLite 저장소(레이트 리미터, 응답 캐시)나 DB 를 동기로 쓰므로
+        스레드에서 실행한다. 요청 컨텍스트는 contextvars 로 스레드에 복사되어 그대로 보인다.
+        """
+        self.ensure_engine()
+        flask_app = self.flask_app
+        view = flask_app.view_functions[endpoint]
+
+        def finish(rv, error):
+            try:
+                try:
+                    if error is not None:
+                        raise error
+                except Exception as e:
+                    rv = flask_app.handle_user_exception(e)
+                response = flask_app.finalize_request(rv)
+            except Exception as e:
+                response = flask_app.handle_exception(e)
+            app_iter, status, headers = response.get_wsgi_response(environ)
+            try:
+                return status, headers, b''.join(app_iter)
+            finally:
+                response.close()
+
+        with flask_app.request_context(environ):
+            rv = error = None
+            try:
+                rv = await asyncio.to_thread(flask_app.preprocess_request)
+                if rv is None:
+                    async with self.sessions() as session:
+                        rv = await session.run_sync(
+                            lambda sync_session: view(**view_args, db_session=sync_session))
+            except Exception as e:
+                error = e
+            status, headers, body = await asyncio.to_thread(finish, rv, error)
+
+        await send({
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+application = AsyncApplication(app)
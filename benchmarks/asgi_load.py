@@ -0,0 +1,86 @@
+"""
+동기(gunicorn sync 워커) / 비동기(uvicorn 워커, asgi.py) 서빙 모드 처리량 비교
+
+같은 워커 수로 두 모드를 차례로 띄우고 읽기 전용 라우트(/board, /portfolio, /post/<id>,
+/api/videos, /api/video/<id>)에 높은 동시성으로 요청을 보내 초당 처리량과 p50/p99 지연 시간을 비교한다.
+응답 캐시와 객체 캐시는 끄고 측정하므로 모든 요청이 DB 를 거친다.
+
+    python benchmarks/asgi_load.py --workers 2 --concurrency 64,256
+    BENCH_DATABASE_URL=postgresql://... python benchmarks/asgi_load.py
+
+측정 예 (워커 2개, SQLite, 10초, 1코어 개발 머신; async 는 기본값, async* 는 ASGI_ASYNC_DB=1 로 aiosqlite 사용):
+
+    mode        conc     req/s   p50(ms)   p99(ms)  errors
+    sync          64     248.1     257.8     401.7       0
+    sync         256     289.3     906.7    1244.1       0
+    async         64     225.9     271.1     672.7       0
+    async        256     247.9     924.6    2210.0       0
+    async*        64     222.0     279.9     690.7       0
+    async*       256     250.6    1053.7    2933.2       0
+
+SQLite 는 쿼리가 프로세스 안에서 끝나 기다릴 I/O 가 없으므로 비동기 모드가 이득이 없고, CPU 가 하나뿐이면
+이벤트 루프/스레드 전환 비용만큼 오히려 느리다 (그래서 ASGI_ASYNC_DB 는 기본값이 꺼져 있다).
+비동기 드라이버는 DB 가 네트워크 너머에 있어 쿼리 왕복 동안 sync 워커가 통째로 노는 PostgreSQL 배포를
+위한 것이지만, 템플릿 렌더링과 응답 캐시 조회는 이벤트 루프에서 실행되므로 이득은
+쿼리 대기 시간이 렌더링 시간보다 긴 만큼으로 제한된다. 배포 전 BENCH_DATABASE_URL 로 실제 DB 에 대고 측정한다.
+"""
+import os
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+from seed import seed_database
+from http_load import free_port, wait_until_ready, run_load, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'sync': ['gunicorn', '--worker-class', 'sync', 'app:app'],
+    'async': ['gunicorn', '--worker-class', 'uvicorn.workers.UvicornWorker', 'asgi:application'],
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', default='64,256', help='동시 연결 수 (쉼표로 여러 개)')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--paths', default='/board,/portfolio,/post/1,/post/2,/api/videos,/api/video/1,/api/video/2')
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--videos', type=int, default=300)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='dayu-asgi-bench-')
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': os.environ.get('BENCH_DATABASE_URL') or f'sqlite:///{os.path.join(workdir, "bench.db")}',
+        'JOB_WORKERS': '0',
+        'RESPONSE_CACHE_ENABLED': '0',
+        'OBJECT_CACHE_ENABLED': '0',
+        'COUNTER_FLUSH_INTERVAL': '10',
+        'SLOW_REQUEST_MS': '100000',
+    })
+    seed_database(env, args.posts, args.videos)
+    paths = args.paths.split(',')
+
+    print(f"{'mode':<8}{'conc':>8}{'req/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'errors':>8}")
+    for mode in args.modes.split(','):
+        for concurrency in [int(value) for value in args.concurrency.split(',')]:
+            port = free_port()
+            command = MODES[mode] + ['--workers', str(args.workers), '--bind', f'127.0.0.1:{port}',
+                                     '--backlog', str(max(2048, concurrency * 2))]
+            server = subprocess.Popen(command, env=env, cwd=ROOT,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_until_ready(port, server)
+                result = summarize(asyncio.run(run_load(port, paths, concurrency, args.duration)), args.duration)
+            finally:
+                server.terminate()
+                server.wait()
+
+            print(f"{mode:<8}{concurrency:>8}{result['req_per_sec']:>10.1f}{result['p50_ms']:>10.1f}"
+                  f"{result['p99_ms']:>10.1f}{result['errors']:>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+벤치마크 결과 JSON 저장과 커밋 간 비교
+
+micro.py 와 http_load.py 는 --output 파일(기본 benchmarks/results/<커밋>.json)의 자기 섹션에 결과를 쓴다.
+두 결과 파일을 비교하면 지표별 변화율을 출력하고, 기준보다 나빠진 지표가 있으면 종료 코드 1 을 반환한다.
+
+    python benchmarks/baseline.py benchmarks/results/a1b2c3d.json benchmarks/results/e4f5a6b.json
+    python benchmarks/baseline.py old.json new.json --threshold 15
+"""
+import os
+import sys
+import json
+import platform
+import argparse
+import subprocess
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FOLDER = os.path.join(ROOT, 'benchmarks', 'results')
+
+# 지표 이름 -> 클수록 좋은지 (나머지는 작을수록 좋음)
+HIGHER_IS_BETTER = {'req_per_sec': True, 'ops_per_sec': True}
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}-dirty' if dirty else commit
+
+def default_output():
+    return os.path.join(RESULTS_FOLDER, f'{git_commit()}.json')
+
+def write_results(path, section, results, settings):
+    """path 의 section 을 results 로 교체 (다른 섹션은 유지)"""
+    data = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    data['meta'] = {
+        'commit': git_commit(),
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': f'{platform.system()} {platform.machine()} ({os.cpu_count()} cpu)',
+    }
+    data[section] = {'settings': settings, 'results': results}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print(f"결과 저장: {path}")
+
+def compare(old, new, threshold):
+    """(섹션, 항목, 지표, 이전, 이후, 변화율%, 나빠졌는지) 목록"""
+    rows = []
+    for section in sorted(set(old) & set(new) - {'meta'}):
+        old_results, new_results = old[section]['results'], new[section]['results']
+        for name in sorted(set(old_results) & set(new_results)):
+            for metric, before in old_results[name].items():
+                after = new_results[name].get(metric)
+                if not isinstance(before, (int, float)) or not isinstance(after, (int, float)):
+                    continue
+                change = (after - before) / before * 100 if before else (0.0 if after == before else 100.0)
+                worse = -change if HIGHER_IS_BETTER.get(metric) else change
+                rows.append((section, name, metric, before, after, change, worse > threshold))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10.0, help='나빠졌다고 볼 변화율(%%)')
+    args = parser.parse_args()
+
+    with open(args.old, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+
+    regressions = 0
+    for section, name, metric, before, after, change, regressed in compare(old, new, args.threshold):
+        regressions += regressed
+        mark = '!!' if regressed else '  '
+        print(f"{mark} {section:<6} {name:<40} {metric:<20} {before:>12.2f} {after:>12.2f} {change:>+8.1f}%")
+    if regressions:
+        print(f"{args.threshold}% 넘게 나빠진 지표 {regressions}개")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+공개 라우트 HTTP 부하 테스트
+
+seed.py 로 만든 DB 에 gunicorn 을 띄우고 공개 라우트마다 차례로 --duration 초 동안 --concurrency 개
+연결로 요청해 초당 처리량, p50/p95/p99 지연 시간, 요청당 쿼리 수(Server-Timing 헤더)를 잰다.
+결과는 baseline.py 형식의 JSON 으로 저장해 커밋 간에 비교한다.
+
+    python benchmarks/http_load.py --posts 100000 --images 500000 --videos 2000
+    BENCH_DATABASE_URL=postgresql://... python benchmarks/http_load.py --duration 10
+    python benchmarks/baseline.py benchmarks/results/<이전>.json benchmarks/results/<현재>.json
+
+캐시(응답/객체)는 기본으로 끄고 측정한다 (--with-cache 로 운영 설정 그대로 측정).
+"""
+import os
+import re
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+import http.client
+from urllib.parse import quote
+
+from seed import seed_database
+from baseline import default_output, write_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 엔드포인트 -> 측정할 경로 ({post_id}, {video_id} 는 시드 데이터의 실제 id 로 채움)
+PUBLIC_ROUTES = {
+    'home': ['/'],
+    'greeting': ['/greeting'],
+    'about': ['/about'],
+    'members': ['/members'],
+    'healingconcert': ['/healingconcert'],
+    'contact': ['/contact'],
+    'board': ['/board', '/board?page=50', '/board?year=2023'],
+    'view_post': ['/post/{post_id}'],
+    'search': ['/search?q=힐링콘서트'],
+    'search_api': ['/api/search?q=가야금 산조'],
+    'portfolio': ['/portfolio', '/portfolio?tag=가야금'],
+    'view_video': ['/video/{video_id}'],
+    'get_video_info': ['/api/video/{video_id}'],
+    'list_videos_api': ['/api/videos', '/api/videos?ids={video_ids}'],
+}
+# 로그인이 필요하거나 쓰기/파일 전송/디버그용이라 측정하지 않는 GET 엔드포인트
+NON_PUBLIC_ENDPOINTS = {
+    'static', 'serve_asset', 'stream_video', 'write_post', 'edit_post', 'add_video', 'edit_video',
+    'admin_redirect', 'admin_login', 'admin_logout', 'admin_dashboard', 'admin_jobs', 'admin_metrics',
+    'admin_pool', 'mark_answered', 'video_metadata_api', 'video_upload_status',
+    'debug_routes', 'debug_templates', 'debug_db',
+}
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+# Server-Timing 은 METRICS_TOKEN 요청에만 붙으므로 측정 서버에 같은 토큰을 설정
+BENCH_METRICS_TOKEN = 'bench'
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_until_ready(port, server, path='/board'):
+    while True:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', path)
+            connection.getresponse().read()
+            return
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError('서버가 종료되었습니다.')
+            time.sleep(0.05)
+
+async def fetch(port, connection, path):
+    """keep-alive 연결로 GET 한 번, (status, 헤더, 연결) 반환 (서버가 연결을 닫으면 다음 요청 때 다시 연결)"""
+    if connection is None:
+        connection = await asyncio.open_connection('127.0.0.1', port)
+    reader, writer = connection
+    target = quote(path, safe='/?=&,')
+    writer.write(f'GET {target} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: keep-alive\r\n'
+                 f'Authorization: Bearer {BENCH_METRICS_TOKEN}\r\n\r\n'.encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get('content-length', 0)))
+    if headers.get('connection', '').lower() == 'close':
+        writer.close()
+        connection = None
+    return status, headers, connection
+
+async def run_load(port, paths, concurrency, duration):
+    """concurrency 개의 연결로 duration 초 동안 paths 를 번갈아 요청"""
+    latencies = []
+    queries = []
+    statuses = {}
+    deadline = time.perf_counter() + duration
+
+    async def client(offset):
+        connection = None
+        i = offset
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                status, headers, connection = await fetch(port, connection, path)
+            except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+                status = 'connection'
+                if connection is not None:
+                    connection[1].close()
+                connection = None
+            if status != 200:
+                statuses[status] = statuses.get(status, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            match = SERVER_TIMING_QUERIES.search(headers.get('server-timing', ''))
+            if match:
+                queries.append(int(match.group(1)))
+        if connection is not None:
+            connection[1].close()
+
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    return {'latencies': latencies, 'queries': queries, 'errors': statuses}
+
+def summarize(load, duration):
+    latencies = sorted(load['latencies'])
+    def quantile(q):
+        return round(latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000, 2) if latencies else 0.0
+    return {
+        'req_per_sec': round(len(latencies) / duration, 1),
+        'p50_ms': quantile(0.5),
+        'p95_ms': quantile(0.95),
+        'p99_ms': quantile(0.99),
+        'queries_per_request': round(statistics.mean(load['queries']), 2) if load['queries'] else 0.0,
+        'errors': sum(load['errors'].values()),
+    }
+
+def sample_ids():
+    """경로에 넣을 최신 게시글/영상 id"""
+    from app import app, Post, Video
+
+    with app.app_context():
+        post = Post.query.order_by(Post.date_posted.desc(), Post.id.desc()).first()
+        videos = Video.query.order_by(Video.date_uploaded.desc(), Video.id.desc()).limit(20).all()
+        return {
+            'post_id': post.id if post else 1,
+            'video_id': videos[0].id if videos else 1,
+            'video_ids': ','.join(str(video.id) for video in videos) or '1',
+        }
+
+def unlisted_endpoints():
+    """PUBLIC_ROUTES 에도 NON_PUBLIC_ENDPOINTS 에도 없는 GET 엔드포인트 (새 라우트를 빠뜨리지 않도록)"""
+    from app import app
+
+    return sorted({rule.endpoint for rule in app.url_map.iter_rules() if 'GET' in rule.methods}
+                  - set(PUBLIC_ROUTES) - NON_PUBLIC_ENDPOINTS)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--images', type=int, default=30000)
+    parser.add_argument('--videos', type=int, default=500)
+    parser.add_argument('--contacts', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn 워커당 스레드 수 (gthread)')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0, help='라우트당 측정 시간(초)')
+    parser.add_argument('--routes', default=None, help='측정할 엔드포인트 (쉼표로 구분, 기본: 전체)')
+    parser.add_argument('--with-cache', action='store_true', help='응답/객체 캐시를 켠 채로 측정')
+    parser.add_argument('--output', default=None, help='결과 JSON (기본: benchmarks/results/<커밋>.json)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='dayu-http-bench-')
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': os.environ.get('BENCH_DATABASE_URL') or f'sqlite:///{os.path.join(workdir, "bench.db")}',
+        'JOB_WORKERS': '0',
+        'COUNTER_FLUSH_INTERVAL': '10',
+        'SLOW_REQUEST_MS': '100000',
+        'METRICS_TOKEN': BENCH_METRICS_TOKEN,
+    })
+    if not args.with_cache:
+        env.update({'RESPONSE_CACHE_ENABLED': '0', 'OBJECT_CACHE_ENABLED': '0'})
+    seed_database(env, args.posts, args.videos, images=args.images, contacts=args.contacts, index=True)
+    for endpoint in unlisted_endpoints():
+        print(f"경고: {endpoint} 가 PUBLIC_ROUTES/NON_PUBLIC_ENDPOINTS 어디에도 없어 측정하지 않음")
+
+    ids = sample_ids()
+    endpoints = args.routes.split(',') if args.routes else list(PUBLIC_ROUTES)
+    port = free_port()
+    server = subprocess.Popen(
+        ['gunicorn', '--workers', str(args.workers), '--worker-class', 'gthread', '--threads', str(args.threads),
+         '--bind', f'127.0.0.1:{port}', 'app:app'],
+        env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    results = {}
+    try:
+        wait_until_ready(port, server)
+        print(f"{'route':<40}{'req/s':>9}{'p50(ms)':>9}{'p95(ms)':>9}{'p99(ms)':>9}{'queries':>9}{'errors':>8}")
+        for endpoint in endpoints:
+            for path in PUBLIC_ROUTES[endpoint]:
+                path = path.format(**ids)
+                name = f'{endpoint} {path}' if len(PUBLIC_ROUTES[endpoint]) > 1 else endpoint
+                load = asyncio.run(run_load(port, [path], args.concurrency, args.duration))
+                result = results[name] = summarize(load, args.duration)
+                print(f"{name[:39]:<40}{result['req_per_sec']:>9.1f}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+                      f"{result['p99_ms']:>9.1f}{result['queries_per_request']:>9.2f}{result['errors']:>8}"
+                      + (f"  {load['errors']}" if load['errors'] else ''))
+    finally:
+        server.terminate()
+        server.wait()
+
+    settings = {key: value for key, value in vars(args).items() if key != 'output'}
+    settings['database'] = 'postgresql' if env['DATABASE_URL'].startswith('postgresql') else 'sqlite'
+    write_results(args.output or default_output(), 'http', results, settings)
+
+if __name__ == '__main__':
+    main()
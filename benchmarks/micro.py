@@ -0,0 +1,107 @@
+"""
+마이크로 벤치마크: 본문 날짜 추출, YouTube/Vimeo ID 추출, 템플릿 렌더링
+
+템플릿은 각 페이지를 한 번 요청해 뷰가 넘긴 템플릿/컨텍스트를 잡아 두고, 같은 요청 컨텍스트 안에서
+렌더링만 반복해 잰다 (DB 조회 시간은 빠짐). DB 는 임시 SQLite 에 seed.py 로 소량 생성한다.
+
+    python benchmarks/micro.py
+    python benchmarks/micro.py --only extract --output /tmp/micro.json
+"""
+import os
+import sys
+import timeit
+import argparse
+import tempfile
+import statistics
+
+from seed import seed_database
+from baseline import default_output, write_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATE_CONTENTS = {
+    'dotted': '2024.3.15 힐링콘서트\n\n요양원 관객분들과 함께한 공연 소식을 전해드립니다.',
+    'korean': '2024년 11월 2일 정기연주회 후기입니다. 많은 분들이 찾아주셨습니다.',
+    'month_day': '3월 15일 찾아가는 음악회 - 가야금 산조와 아리랑',
+    'no_date': '앙상블 다유 공연 안내 ' * 40,
+}
+YOUTUBE_URLS = {
+    'watch': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+    'watch_params': 'https://www.youtube.com/watch?feature=share&list=PL123&v=dQw4w9WgXcQ&t=42',
+    'short': 'https://youtu.be/dQw4w9WgXcQ?si=abc',
+    'embed': 'https://www.youtube.com/embed/dQw4w9WgXcQ',
+    'invalid': 'https://example.com/video/123',
+}
+VIMEO_URLS = {
+    'basic': 'https://vimeo.com/123456789',
+    'channel': 'https://vimeo.com/channels/staffpicks/123456789',
+    'invalid': 'https://example.com/video/abc',
+}
+TEMPLATE_PAGES = ['/', '/board', '/board?page=3', '/post/1', '/portfolio', '/contact']
+
+def measure(func, repeat=5):
+    """한 번 측정에 0.2초 이상 걸리도록 반복 횟수를 정하고 repeat 번 측정한 중앙값"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    per_op = statistics.median(timer.repeat(repeat=repeat, number=number)) / number
+    return {'us_per_op': round(per_op * 1e6, 3), 'ops_per_sec': round(1 / per_op, 1)}
+
+def extractor_benchmarks(app_module):
+    results = {}
+    for name, content in DATE_CONTENTS.items():
+        results[f'extract_date_from_content[{name}]'] = measure(
+            lambda: app_module.extract_date_from_content(content))
+    for name, url in YOUTUBE_URLS.items():
+        results[f'extract_youtube_video_id[{name}]'] = measure(lambda: app_module.extract_youtube_video_id(url))
+    for name, url in VIMEO_URLS.items():
+        results[f'extract_vimeo_video_id[{name}]'] = measure(lambda: app_module.extract_vimeo_video_id(url))
+    return results
+
+def template_benchmarks(app_module):
+    from flask import template_rendered
+
+    app = app_module.app
+    results = {}
+    for path in TEMPLATE_PAGES:
+        rendered = []
+        def capture(sender, template, context, **extra):
+            rendered.append((template, context))
+
+        with app.test_request_context(path):
+            with template_rendered.connected_to(capture, app):
+                response = app.full_dispatch_request()
+            if response.status_code != 200 or not rendered:
+                print(f"{path}: 템플릿을 렌더링하지 않음 (status {response.status_code}), 건너뜀")
+                continue
+            template, context = rendered[-1]
+            results[f'render[{template.name} {path}]'] = measure(lambda: template.render(context))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', choices=['extract', 'templates'])
+    parser.add_argument('--output', default=None, help='결과 JSON (기본: benchmarks/results/<커밋>.json)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='dayu-micro-bench-')
+    seed_database({
+        'DATABASE_URL': f'sqlite:///{os.path.join(workdir, "bench.db")}',
+        'JOB_WORKERS': '0',
+        'RESPONSE_CACHE_ENABLED': '0',
+        'SLOW_REQUEST_MS': '100000',
+    }, posts=200, videos=60, images=400)
+    sys.path.insert(0, ROOT)
+    import app as app_module
+
+    results = {}
+    if args.only in (None, 'extract'):
+        results.update(extractor_benchmarks(app_module))
+    if args.only in (None, 'templates'):
+        results.update(template_benchmarks(app_module))
+
+    for name, result in results.items():
+        print(f"{name:<55}{result['us_per_op']:>12.2f} us{result['ops_per_sec']:>14.0f} ops/s")
+    write_results(args.output or default_output(), 'micro', results, {'only': args.only})
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+연결 풀 크기별 처리량 측정
+
+gunicorn (gthread 워커) 을 DB_POOL_SIZE 를 바꿔 가며 띄우고, /board 와 /portfolio 에
+동시 요청을 보내 초당 처리량과 지연 시간, 연결 대기 시간(/admin/pool)을 비교한다.
+응답 캐시는 끄고 측정하므로 모든 요청이 DB 를 거친다.
+
+    python benchmarks/pool_load.py --pool-sizes 1,2,5,10 --threads 16 --concurrency 32
+    BENCH_DATABASE_URL=postgresql://... python benchmarks/pool_load.py
+"""
+import os
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+import http.client
+
+from seed import seed_database
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRICS_TOKEN = 'pool-load-benchmark'
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_until_ready(port, server):
+    while True:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/board')
+            connection.getresponse().read()
+            return
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError('gunicorn 이 종료되었습니다.')
+            time.sleep(0.05)
+
+def run_load(port, paths, concurrency, duration):
+    """concurrency 개의 keep-alive 연결로 duration 초 동안 paths 를 번갈아 요청"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        i = offset
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise http.client.HTTPException(response.status)
+                local.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+def pool_snapshot(port):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    connection.request('GET', '/admin/pool', headers={'Authorization': f'Bearer {METRICS_TOKEN}'})
+    return json.loads(connection.getresponse().read())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pool-sizes', default='1,2,5,10')
+    parser.add_argument('--threads', type=int, default=16, help='gunicorn 워커당 스레드 수')
+    parser.add_argument('--concurrency', type=int, default=32, help='동시 클라이언트 연결 수')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--paths', default='/board,/portfolio,/board?page=2,/portfolio?page=2')
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--videos', type=int, default=300)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='dayu-pool-bench-')
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': os.environ.get('BENCH_DATABASE_URL') or f'sqlite:///{os.path.join(workdir, "bench.db")}',
+        'JOB_WORKERS': '0',
+        'RESPONSE_CACHE_ENABLED': '0',
+        'COUNTER_FLUSH_INTERVAL': '10',
+        'METRICS_TOKEN': METRICS_TOKEN,
+        'SLOW_REQUEST_MS': '100000',
+    })
+    seed_database(env, args.posts, args.videos)
+    paths = args.paths.split(',')
+
+    print(f"{'pool':>5}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'errors':>8}{'avg wait(ms)':>14}{'max wait(ms)':>14}{'timeouts':>10}")
+    for pool_size in [int(size) for size in args.pool_sizes.split(',')]:
+        port = free_port()
+        server_env = dict(env, DB_POOL_SIZE=str(pool_size), DB_MAX_OVERFLOW='0', GUNICORN_PRELOAD='1')
+        server = subprocess.Popen(
+            ['gunicorn', '--workers', '1', '--worker-class', 'gthread', '--threads', str(args.threads),
+             '--bind', f'127.0.0.1:{port}', 'app:app'],
+            env=server_env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_ready(port, server)
+            latencies, errors = run_load(port, paths, args.concurrency, args.duration)
+            pool = pool_snapshot(port)
+        finally:
+            server.terminate()
+            server.wait()
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+        print(f"{pool_size:>5}{len(latencies) / args.duration:>10.1f}"
+              f"{statistics.median(latencies) * 1000 if latencies else 0.0:>10.1f}{p95:>10.1f}{errors:>8}"
+              f"{pool['avg_wait_ms']:>14.2f}{pool['max_wait_ms']:>14.1f}{pool['timeouts']:>10}")
+
+if __name__ == '__main__':
+    main()
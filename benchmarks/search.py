@@ -0,0 +1,93 @@
+"""
+검색 색인 벤치마크
+
+임시 SQLite DB 에 합성 게시글(기본 10만 건)을 만들고 색인한 뒤 대표 검색어의 응답 시간을 측정한다.
+PostgreSQL 로 측정하려면 BENCH_DATABASE_URL 에 빈 데이터베이스 주소를 지정한다.
+
+    python benchmarks/search.py --posts 100000 --repeat 20
+"""
+import os
+import sys
+import time
+import random
+import itertools
+import tempfile
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 실제 게시글처럼 소수의 흔한 단어와 다수의 드문 단어(지명, 곡명 등)가 섞이도록 Zipf 분포로 뽑음
+COMMON_WORDS = [
+    '힐링콘서트', '정기연주회', '앙상블', '다유', '가야금', '해금', '대금', '피리', '아쟁', '장구',
+    '국악', '창작곡', '협연', '공연', '연주', '관객', '초대', '요양원', '병원', '학교', '찾아가는',
+    '음악회', '봄', '여름', '가을', '겨울', '아리랑', '산조', '시나위', '민요', '편곡', '리허설',
+    '감사합니다', '안내', '소식', '후기', '사진', '영상', '서울', '부산', '대구', '광주', '문화재단',
+    'concert', 'ensemble', 'live', 'arirang', 'gayageum', 'haegeum',
+]
+SYLLABLES = '가나다라마바사아자차카타파하강남동서산해별빛소리바람노을'
+QUERIES = ['힐링콘서트', '가야금 산조', '정기연주회 후기', '아리랑', '해', 'concert', 'gaya', '부산 찾아가는 음악회', '없는검색어']
+
+def build_vocabulary(rng, size=20000):
+    words = list(COMMON_WORDS)
+    while len(words) < size:
+        words.append(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    return words, cum_weights
+
+def synthetic_text(rng, vocabulary, words):
+    return ' '.join(rng.choices(vocabulary[0], cum_weights=vocabulary[1], k=words))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='dayu-search-bench-')
+    os.environ['DATABASE_URL'] = os.environ.get('BENCH_DATABASE_URL') or f'sqlite:///{os.path.join(workdir, "bench.db")}'
+    os.environ.setdefault('JOB_WORKERS', '0')
+    os.environ.setdefault('AUTO_MIGRATE', '1')
+    sys.path.insert(0, ROOT)
+    from app import app, db, Post, SearchDocument, ngram_text, search_documents
+
+    rng = random.Random(args.seed)
+    vocabulary = build_vocabulary(rng)
+    with app.app_context(), app.test_request_context():
+        started = time.perf_counter()
+        for offset in range(0, args.posts, args.batch_size):
+            posts = []
+            for i in range(offset, min(offset + args.batch_size, args.posts)):
+                posts.append({
+                    'id': i + 1,
+                    'title': synthetic_text(rng, vocabulary, 4),
+                    'content': synthetic_text(rng, vocabulary, 60),
+                    'author': '앙상블 다유',
+                })
+            db.session.execute(Post.__table__.insert(), posts)
+            db.session.execute(SearchDocument.__table__.insert(), [{
+                'doc_type': 'post',
+                'doc_id': post['id'],
+                'title': post['title'],
+                'body': f"{post['author']}\n{post['content']}",
+                'title_tokens': ngram_text(post['title']),
+                'body_tokens': ngram_text(f"{post['author']}\n{post['content']}"),
+            } for post in posts])
+            db.session.commit()
+        print(f"색인: 게시글 {args.posts}건 {time.perf_counter() - started:.1f}초")
+
+        print(f"{'검색어':<24}{'결과':>6}{'p50(ms)':>10}{'p95(ms)':>10}")
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results = search_documents(query, limit=20)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{query:<24}{len(results):>6}{statistics.median(timings):>10.2f}{p95:>10.2f}")
+
+if __name__ == '__main__':
+    main()
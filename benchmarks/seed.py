@@ -0,0 +1,172 @@
+"""
+벤치마크용 합성 데이터 생성
+
+게시글(Post), 게시글 이미지(PostImage), 영상(Video), 문의(Contact)를 원하는 만큼 만든다.
+본문은 한국어 공연 안내 문장으로, 앞부분에 공연 날짜가 들어 있어 날짜 추출/연도 필터가 실제처럼 동작한다.
+이미 그만큼 행이 있는 테이블은 건너뛰므로 같은 DB 에 여러 번 실행해도 된다.
+
+    python benchmarks/seed.py --database-url sqlite:////tmp/bench.db --posts 100000 --images 500000
+    python benchmarks/seed.py --database-url postgresql://... --videos 5000 --contacts 20000
+
+이미지 행은 파일 없이 파일명만 만든다 (템플릿은 없는 파생본을 원본 경로로 대체함).
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PLACES = ['서울', '부산', '대구', '광주', '대전', '전주', '춘천', '제주', '세종문화회관', '국립국악원', '예술의전당']
+EVENTS = ['힐링콘서트', '정기연주회', '찾아가는 음악회', '기획공연', '초청공연', '하우스콘서트', '송년음악회']
+AUDIENCES = ['요양원', '병원', '초등학교', '복지관', '도서관', '문화재단', '구청']
+INSTRUMENTS = ['가야금', '해금', '대금', '피리', '아쟁', '장구', '거문고', '25현 가야금']
+PIECES = ['아리랑', '산조', '시나위', '도라지', '밀양아리랑', '비나리', '뱃노래', '창작곡 「봄의 소리」', '천년만세']
+SENTENCES = [
+    '{place}에서 {audience} 관객분들과 함께한 {event} 소식을 전해드립니다.',
+    '{instrument} 독주로 {piece}을(를) 들려드렸고, 관객분들의 박수가 이어졌습니다.',
+    '앙상블 다유는 {instrument}와 {instrument2}의 어울림으로 {piece}을(를) 새롭게 편곡했습니다.',
+    '다음 {event}에도 많은 관심 부탁드립니다. 감사합니다.',
+    '리허설 사진과 공연 후기를 함께 올립니다.',
+]
+NAMES = ['김민지', '이서준', '박지우', '최하은', '정도윤', '강서연', '조예준', '윤지아', '장시우', '임수아']
+MESSAGES = [
+    '{audience} 행사에 공연을 요청드리고 싶습니다. {place} 지역인데 가능할까요?',
+    '{event} 관람 문의드립니다. 단체 관람 예약이 되나요?',
+    '{instrument} 레슨이나 체험 프로그램도 운영하시는지 궁금합니다.',
+]
+TAGS = EVENTS + INSTRUMENTS + ['국악', '앙상블', '라이브', '협연', '창작', '전통']
+
+def sentence(rng, template):
+    instrument, instrument2 = rng.sample(INSTRUMENTS, 2)
+    return template.format(place=rng.choice(PLACES), audience=rng.choice(AUDIENCES), event=rng.choice(EVENTS),
+                           instrument=instrument, instrument2=instrument2, piece=rng.choice(PIECES))
+
+def performance_date(rng, base):
+    return (base + timedelta(days=rng.randint(0, 365 * 5))).date()
+
+def post_row(rng, i, base):
+    performed = performance_date(rng, base)
+    event = rng.choice(EVENTS)
+    body = ' '.join(sentence(rng, rng.choice(SENTENCES)) for _ in range(rng.randint(4, 12)))
+    return {
+        'title': f'{rng.choice(PLACES)} {event} ({performed.month}월)',
+        'content': f'{performed.year}.{performed.month}.{performed.day} {event}\n\n{body}',
+        'author': '앙상블 다유',
+        'date_posted': datetime.combine(performed, datetime.min.time()) + timedelta(days=rng.randint(1, 10),
+                                                                                    minutes=i % 1440),
+        'performance_date': performed,
+    }
+
+def video_row(rng, i, base):
+    performed = performance_date(rng, base)
+    platform = rng.choice(['youtube', 'youtube', 'youtube', 'vimeo'])
+    return {
+        'title': f'{rng.choice(PIECES)} - {rng.choice(INSTRUMENTS)} ({performed.year})',
+        'description': f'{performed.year}.{performed.month}.{performed.day} {sentence(rng, rng.choice(SENTENCES))}',
+        'author': '앙상블 다유',
+        'platform': platform,
+        'video_id': f'yt{i:09d}' if platform == 'youtube' else str(100000000 + i),
+        'performance_date': performed,
+        'tags': ', '.join(rng.sample(TAGS, rng.randint(1, 4))),
+        'view_count': rng.randint(0, 5000),
+        'like_count': rng.randint(0, 300),
+        'date_uploaded': datetime.combine(performed, datetime.min.time()) + timedelta(days=rng.randint(1, 30),
+                                                                                     minutes=i % 1440),
+        'is_featured': rng.random() < 0.05,
+    }
+
+def contact_row(rng, i, base):
+    return {
+        'name': rng.choice(NAMES),
+        'email': f'user{i}@example.com',
+        'message': sentence(rng, rng.choice(MESSAGES)),
+        'date_sent': base + timedelta(minutes=rng.randint(0, 60 * 24 * 365 * 5)),
+        'answered': rng.random() < 0.8,
+    }
+
+def insert_rows(model, total, make_row, batch_size, echo):
+    """model 테이블에 total 행이 되도록 부족한 만큼 batch_size 단위로 삽입"""
+    from app import db
+
+    existing = db.session.query(db.func.count(model.id)).scalar()
+    started = time.perf_counter()
+    for offset in range(existing, total, batch_size):
+        db.session.execute(model.__table__.insert(),
+                           [make_row(i) for i in range(offset, min(offset + batch_size, total))])
+        db.session.commit()
+    if total > existing:
+        echo(f"{model.__tablename__}: {total - existing}행 생성 ({time.perf_counter() - started:.1f}초)")
+    return max(total - existing, 0)
+
+def seed(posts=1000, images=0, videos=100, contacts=0, batch_size=5000, seed_value=42, index=False, echo=print):
+    """현재 DATABASE_URL 의 DB 에 합성 데이터 생성 (스키마가 없으면 먼저 만듦)"""
+    sys.path.insert(0, ROOT)
+    from app import app, db, Post, PostImage, Video, Contact, upgrade_schema
+
+    rng = random.Random(seed_value)
+    base = datetime(2020, 1, 1)
+    with app.app_context():
+        upgrade_schema(echo=lambda message: None)
+        created = insert_rows(Post, posts, lambda i: post_row(rng, i, base), batch_size, echo)
+
+        # 게시글마다 고르게 나눠 붙임 (첫 장이 대표 이미지)
+        post_ids = [row.id for row in db.session.query(Post.id).order_by(Post.id).limit(posts)]
+        def image_row(i):
+            post_id = post_ids[i % len(post_ids)]
+            order = i // len(post_ids)
+            return {
+                'post_id': post_id,
+                'filename': f'bench_{post_id}_{order}.jpg',
+                'display_order': order,
+                'is_primary': order == 0,
+                'date_uploaded': base + timedelta(minutes=i),
+            }
+        if post_ids:
+            insert_rows(PostImage, images, image_row, batch_size, echo)
+
+        created_videos = insert_rows(Video, videos, lambda i: video_row(rng, i, base), batch_size, echo)
+        insert_rows(Contact, contacts, lambda i: contact_row(rng, i, base), batch_size, echo)
+
+        # 태그 테이블은 영상 생성 뒤 기존 명령으로 채우고, 색인은 요청한 경우에만 (10만 건이면 수십 초)
+        if created or created_videos:
+            runner = app.test_cli_runner()
+            commands = [['backfill-tags']] if created_videos else []
+            if index:
+                commands += [['rebuild-related-videos'], ['rebuild-search-index']]
+            for command in commands:
+                started = time.perf_counter()
+                result = runner.invoke(args=command)
+                if result.exception:
+                    raise result.exception
+                output = ', '.join(result.output.split('\n')).strip(', ')
+                echo(f"flask {command[0]}: {output} ({time.perf_counter() - started:.1f}초)")
+
+def seed_database(env, posts, videos, **options):
+    """env(DATABASE_URL 등)를 이 프로세스에 적용하고 합성 데이터 생성 (각 벤치마크 스크립트에서 사용)"""
+    os.environ.update(env)
+    seed(posts=posts, videos=videos, echo=lambda message: None, **options)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=os.environ.get('BENCH_DATABASE_URL'))
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--images', type=int, default=500000)
+    parser.add_argument('--videos', type=int, default=2000)
+    parser.add_argument('--contacts', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-index', dest='index', action='store_false', help='검색 색인/관련 영상 계산 생략')
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error('--database-url (또는 BENCH_DATABASE_URL) 이 필요합니다')
+
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ.setdefault('JOB_WORKERS', '0')
+    seed(posts=args.posts, images=args.images, videos=args.videos, contacts=args.contacts,
+         batch_size=args.batch_size, seed_value=args.seed, index=args.index)
+
+if __name__ == '__main__':
+    main()
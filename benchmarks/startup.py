@@ -0,0 +1,106 @@
+"""
+워커 시작 시간 벤치마크
+
+새 파이썬 프로세스에서 앱을 import 하고 첫 요청에 응답하기까지의 시간을 측정한다.
+--gunicorn 을 주면 실제 gunicorn 을 띄워 첫 HTTP 응답까지의 시간을 측정한다.
+DB 는 임시 SQLite 파일을 쓰며 측정 전에 flask init 으로 한 번 초기화한다.
+
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --gunicorn --workers 2
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+from app import app
+imported = time.perf_counter()
+client = app.test_client()
+status = client.get({path!r}).status_code
+responded = time.perf_counter()
+second_started = time.perf_counter()
+client.get({path!r})
+print(json.dumps({{'import_ms': (imported - started) * 1000,
+                  'first_response_ms': (responded - imported) * 1000,
+                  'warm_response_ms': (time.perf_counter() - second_started) * 1000,
+                  'status': status}}))
+"""
+
+def bench_env(workdir):
+    env = dict(os.environ)
+    env['DATABASE_URL'] = f'sqlite:///{os.path.join(workdir, "bench.db")}'
+    env.setdefault('JOB_WORKERS', '0')
+    env.setdefault('RESPONSE_CACHE_ENABLED', '0')
+    return env
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def run_import_probe(args, env):
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(root=ROOT, path=args.path)], env=env,
+                                cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+def run_gunicorn_probe(args, env):
+    samples = []
+    for _ in range(args.runs):
+        port = free_port()
+        command = ['gunicorn', '--workers', str(args.workers), '--bind', f'127.0.0.1:{port}', 'app:app']
+        if not args.preload:
+            env = dict(env, GUNICORN_PRELOAD='0')
+        started = time.perf_counter()
+        server = subprocess.Popen(command, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                try:
+                    with urllib.request.urlopen(f'http://127.0.0.1:{port}{args.path}', timeout=1) as response:
+                        status = response.status
+                    break
+                except OSError:
+                    if server.poll() is not None:
+                        raise RuntimeError('gunicorn 이 종료되었습니다.')
+                    time.sleep(0.01)
+            samples.append({'first_response_ms': (time.perf_counter() - started) * 1000, 'status': status})
+        finally:
+            server.terminate()
+            server.wait()
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--gunicorn', action='store_true', help='gunicorn 을 띄워 첫 HTTP 응답까지 측정')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--no-preload', dest='preload', action='store_false')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='dayu-startup-bench-')
+    env = bench_env(workdir)
+    subprocess.run(['flask', '--app', 'app', 'init'], env=env, cwd=ROOT, check=True, capture_output=True)
+
+    samples = run_gunicorn_probe(args, env) if args.gunicorn else run_import_probe(args, env)
+    for key in ('import_ms', 'first_response_ms', 'warm_response_ms'):
+        values = [sample[key] for sample in samples if key in sample]
+        if values:
+            print(f"{key:<20} median {statistics.median(values):8.1f}  min {min(values):8.1f}  max {max(values):8.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+# gunicorn 설정 (gunicorn 은 작업 디렉터리의 gunicorn.conf.py 를 자동으로 읽음)
+# 앱 import 는 DB 에 접속하지 않으므로 마스터에서 한 번만 import 하고 워커는 fork 로 시작
+# DB 연결은 fork 직후 자식 프로세스에서 버려짐 (app.reset_after_fork)
+import os
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
@@ -0,0 +1,340 @@
+// 선택된 플랫폼 (youtube / vimeo / local)
+function currentPlatform() {
+    return document.querySelector('input[name="platform"]:checked').value;
+}
+
+// 플랫폼 전환: URL 입력과 로컬 파일 입력 중 하나만 표시
+function switchPlatform(platform) {
+    const isLocal = platform === 'local';
+    document.getElementById('url-section').style.display = isLocal ? 'none' : 'block';
+    document.getElementById('file-section').style.display = isLocal ? 'block' : 'none';
+    document.getElementById('video-preview').style.display = 'none';
+
+    const urlInput = document.getElementById('video_url');
+    if (platform === 'vimeo') {
+        document.getElementById('video-url-label').textContent = 'Vimeo URL *';
+        urlInput.placeholder = 'https://vimeo.com/...';
+    } else {
+        document.getElementById('video-url-label').textContent = 'YouTube URL *';
+        urlInput.placeholder = 'https://www.youtube.com/watch?v=... 또는 https://youtu.be/...';
+    }
+    if (!isLocal && urlInput.value) {
+        fetchVideoMetadata();
+    }
+}
+
+// 영상 정보 미리보기 (서버가 oEmbed 를 조회하고 결과를 캐시)
+async function fetchVideoMetadata() {
+    const url = document.getElementById('video_url').value.trim();
+    const platform = currentPlatform();
+    if (!url || platform === 'local') return;
+
+    try {
+        const response = await fetch(`/api/video/metadata?platform=${platform}&url=${encodeURIComponent(url)}`);
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error);
+        }
+
+        // 제목은 비어 있을 때만 자동 입력
+        const titleInput = document.getElementById('title');
+        if (!titleInput.value.trim() && data.title) {
+            titleInput.value = data.title;
+        }
+        document.getElementById('preview-video-thumbnail').src = data.thumbnail_url || '';
+        document.getElementById('preview-video-title').textContent = data.title || '';
+        document.getElementById('preview-video-author').textContent = data.author_name || '';
+        document.getElementById('preview-video-duration').textContent = data.duration || '';
+        document.getElementById('video-preview').style.display = 'block';
+
+    } catch (error) {
+        console.error('영상 정보 가져오기 실패:', error);
+        document.getElementById('video-preview').style.display = 'none';
+        alert(error.message || '영상 정보를 가져올 수 없습니다.');
+    }
+}
+
+// YouTube 비디오 ID 추출
+function extractYouTubeVideoId(url) {
+    const regex = /(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)/;
+    const match = url.match(regex);
+    return match ? match[1] : null;
+}
+
+// Vimeo 비디오 ID 추출
+function extractVimeoVideoId(url) {
+    const match = url.match(/vimeo\.com\/(?:video\/)?(\d+)/);
+    return match ? match[1] : null;
+}
+
+// 커스텀 썸네일 미리보기
+function previewThumbnail(input) {
+    const file = input.files[0];
+    if (!file) return;
+
+    const reader = new FileReader();
+    reader.onload = function(e) {
+        document.getElementById('preview-thumbnail').src = e.target.result;
+        document.getElementById('thumbnail-preview').style.display = 'block';
+    };
+    reader.readAsDataURL(file);
+}
+
+// 폼 제출 처리
+document.getElementById('addVideoForm').addEventListener('submit', function(event) {
+    event.preventDefault();
+
+    // 유효성 검사
+    if (!validateForm()) {
+        return;
+    }
+
+    // 제출 버튼 비활성화
+    const submitBtn = document.getElementById('submitBtn');
+    const submitLabel = submitBtn.innerHTML;
+    submitBtn.disabled = true;
+    submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin" style="margin-right: 8px;"></i>추가 중...';
+    submitBtn.style.background = '#6c757d';
+
+    // 로컬 영상은 분할 업로드 API 로 전송 (끊겨도 이어서 업로드)
+    if (currentPlatform() === 'local') {
+        uploadVideoInChunks(document.getElementById('video_file').files[0], {
+            title: document.getElementById('title').value,
+            description: document.getElementById('description').value,
+            author: document.getElementById('author').value,
+            performance_date: document.getElementById('performance_date').value,
+            tags: document.getElementById('tags').value
+        }).then(() => {
+            clearAutoSave();
+            window.location.href = '/portfolio';
+        }).catch(error => {
+            console.error('Error:', error);
+            alert('영상 업로드 중 오류가 발생했습니다: ' + error.message);
+            submitBtn.disabled = false;
+            submitBtn.innerHTML = submitLabel;
+            submitBtn.style.background = '#ff0000';
+        });
+        return;
+    }
+
+    // 일반 폼 제출
+    this.submit();
+});
+
+// 분할 업로드: init -> 청크 PUT (SHA-256 검증) -> finalize
+async function sha256Hex(buffer) {
+    const digest = await crypto.subtle.digest('SHA-256', buffer);
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+async function uploadVideoInChunks(file, metadata) {
+    const submitBtn = document.getElementById('submitBtn');
+    let response = await fetch('/api/uploads/video', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(Object.assign({filename: file.name, size: file.size}, metadata))
+    });
+    let status = await response.json();
+    if (!response.ok) {
+        throw new Error(status.error || response.statusText);
+    }
+
+    let retries = 0;
+    while (status.received_size < status.total_size) {
+        const chunk = await file.slice(status.received_size, status.received_size + status.chunk_size).arrayBuffer();
+        try {
+            response = await fetch(`/api/uploads/video/${status.upload_id}?offset=${status.received_size}`, {
+                method: 'PUT',
+                headers: {'X-Chunk-SHA256': await sha256Hex(chunk)},
+                body: chunk
+            });
+            const result = await response.json();
+            if (!response.ok && response.status !== 409 && response.status !== 422) {
+                throw new Error(result.error || response.statusText);
+            }
+            status = result.upload_id ? result : status;
+            if (response.ok) {
+                retries = 0;
+            } else if (++retries > 5) {
+                throw new Error(result.error || response.statusText);
+            }
+        } catch (error) {
+            // 연결이 끊기면 서버 상태를 다시 확인하고 이어서 전송
+            if (++retries > 5) {
+                throw error;
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000 * retries));
+            response = await fetch(`/api/uploads/video/${status.upload_id}`);
+            if (response.ok) {
+                status = await response.json();
+            }
+        }
+        submitBtn.textContent = `업로드 중... ${Math.floor(status.received_size / status.total_size * 100)}%`;
+    }
+
+    response = await fetch(`/api/uploads/video/${status.upload_id}/finalize`, {method: 'POST'});
+    if (!response.ok) {
+        const result = await response.json();
+        throw new Error(result.error || response.statusText);
+    }
+}
+
+// 폼 유효성 검사
+function validateForm() {
+    const title = document.getElementById('title').value.trim();
+    if (!title) {
+        alert('영상 제목을 입력해주세요.');
+        document.getElementById('title').focus();
+        return false;
+    }
+
+    const platform = currentPlatform();
+    if (platform === 'local') {
+        const file = document.getElementById('video_file').files[0];
+        if (!file) {
+            alert('영상 파일을 선택해주세요.');
+            return false;
+        }
+        if (!/\.(mp4|webm|mov|m4v)$/i.test(file.name)) {
+            alert('지원하지 않는 영상 형식입니다.');
+            return false;
+        }
+        if (file.size > 100 * 1024 * 1024) {
+            alert('파일이 너무 큽니다. (최대 100MB)');
+            return false;
+        }
+        return true;
+    }
+
+    const url = document.getElementById('video_url').value.trim();
+    const name = platform === 'vimeo' ? 'Vimeo' : 'YouTube';
+    if (!url) {
+        alert(`${name} URL을 입력해주세요.`);
+        document.getElementById('video_url').focus();
+        return false;
+    }
+
+    const videoId = platform === 'vimeo' ? extractVimeoVideoId(url) : extractYouTubeVideoId(url);
+    if (!videoId) {
+        alert(`올바른 ${name} URL을 입력해주세요.`);
+        document.getElementById('video_url').focus();
+        return false;
+    }
+
+    return true;
+}
+
+// 태그 입력 도우미
+document.getElementById('tags').addEventListener('input', function(event) {
+    let value = event.target.value;
+    // 연속된 쉼표나 공백 정리
+    value = value.replace(/,+/g, ',').replace(/\s+,/g, ',').replace(/,\s+/g, ', ');
+    if (value !== event.target.value) {
+        event.target.value = value;
+    }
+});
+
+// 페이지 이탈 경고
+let formChanged = false;
+
+// 폼 변경 감지
+document.querySelectorAll('#addVideoForm input, #addVideoForm textarea').forEach(element => {
+    element.addEventListener('change', function() {
+        formChanged = true;
+    });
+});
+
+// 페이지 이탈 시 경고
+window.addEventListener('beforeunload', function(event) {
+    if (formChanged && !document.getElementById('submitBtn').disabled) {
+        event.preventDefault();
+        event.returnValue = '변경사항이 저장되지 않았습니다. 페이지를 떠나시겠습니까?';
+        return event.returnValue;
+    }
+});
+
+// 키보드 단축키
+document.addEventListener('keydown', function(event) {
+    // Ctrl+Enter로 폼 제출
+    if (event.ctrlKey && event.key === 'Enter') {
+        event.preventDefault();
+        document.getElementById('addVideoForm').dispatchEvent(new Event('submit'));
+    }
+
+    // ESC로 취소
+    if (event.key === 'Escape') {
+        if (confirm('영상 추가를 취소하고 포트폴리오로 돌아가시겠습니까?')) {
+            window.location.href = '/portfolio';
+        }
+    }
+});
+
+// 자동 저장 기능 (로컬 스토리지)
+function autoSave() {
+    if (typeof(Storage) !== "undefined") {
+        const formData = {
+            title: document.getElementById('title').value,
+            description: document.getElementById('description').value,
+            author: document.getElementById('author').value,
+            performance_date: document.getElementById('performance_date').value,
+            tags: document.getElementById('tags').value,
+            platform: currentPlatform(),
+            video_url: document.getElementById('video_url').value
+        };
+        localStorage.setItem('video_form_draft', JSON.stringify(formData));
+    }
+}
+
+// 임시 저장된 데이터 복원
+function restoreFromAutoSave() {
+    if (typeof(Storage) !== "undefined") {
+        const saved = localStorage.getItem('video_form_draft');
+        if (saved && confirm('이전에 작성 중이던 내용이 있습니다. 복원하시겠습니까?')) {
+            const formData = JSON.parse(saved);
+
+            document.getElementById('title').value = formData.title || '';
+            document.getElementById('description').value = formData.description || '';
+            document.getElementById('author').value = formData.author || '';
+            document.getElementById('performance_date').value = formData.performance_date || '';
+            document.getElementById('tags').value = formData.tags || '';
+            document.getElementById('video_url').value = formData.video_url || '';
+
+            // 플랫폼 선택 복원 (로컬 파일은 다시 선택해야 함), URL이 있으면 미리보기 표시
+            const platformInput = document.querySelector(`input[name="platform"][value="${formData.platform || 'youtube'}"]`);
+            if (platformInput) {
+                platformInput.checked = true;
+                switchPlatform(platformInput.value);
+            }
+        }
+    }
+}
+
+// 페이지 로드 시 자동 저장 복원
+window.addEventListener('load', function() {
+    restoreFromAutoSave();
+});
+
+// 입력 시 자동 저장
+let autoSaveTimer;
+document.querySelectorAll('#addVideoForm input, #addVideoForm textarea').forEach(element => {
+    element.addEventListener('input', function() {
+        clearTimeout(autoSaveTimer);
+        autoSaveTimer = setTimeout(autoSave, 2000); // 2초 후 자동 저장
+    });
+});
+
+// 폼 제출 성공 시 임시 저장 데이터 삭제
+function clearAutoSave() {
+    if (typeof(Storage) !== "undefined") {
+        localStorage.removeItem('video_form_draft');
+    }
+}
+
+// URL 입력 시 자동으로 제목 필드로 포커스 이동
+document.getElementById('video_url').addEventListener('blur', function() {
+    if (this.value && !document.getElementById('title').value) {
+        setTimeout(() => {
+            document.getElementById('title').focus();
+        }, 500);
+    }
+});
@@ -0,0 +1,142 @@
+function playVideo(thumbnailElement, videoId) {
+    if (!videoId) return;
+
+    // 썸네일을 YouTube iframe으로 교체
+    const iframe = document.createElement('iframe');
+    iframe.className = 'youtube-player';
+    iframe.src = `https://www.youtube.com/embed/${videoId}?autoplay=1&rel=0`;
+    iframe.allow = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture';
+    iframe.allowFullscreen = true;
+
+    // 썸네일과 재생 버튼을 iframe으로 교체
+    const container = thumbnailElement.closest('.video-container');
+    const thumbnail = container.querySelector('.video-thumbnail');
+    const playButton = container.querySelector('.play-button-overlay');
+
+    if (thumbnail) thumbnail.style.display = 'none';
+    if (playButton) playButton.style.display = 'none';
+
+    // iframe을 컨테이너에 추가
+    container.appendChild(iframe);
+
+    // 배지 위치 조정 (iframe 위에 표시되도록)
+    const badge = container.querySelector('.badge');
+    if (badge) {
+        badge.style.zIndex = '10';
+    }
+}
+
+// 페이지 로드 시 모든 썸네일에 호버 효과 추가
+document.addEventListener('DOMContentLoaded', function() {
+    const thumbnails = document.querySelectorAll('.video-thumbnail');
+
+    thumbnails.forEach(thumbnail => {
+        thumbnail.addEventListener('mouseenter', function() {
+            const playButton = this.parentElement.querySelector('.play-button-overlay');
+            if (playButton) {
+                playButton.style.opacity = '0.9';
+            }
+        });
+
+        thumbnail.addEventListener('mouseleave', function() {
+            const playButton = this.parentElement.querySelector('.play-button-overlay');
+            if (playButton) {
+                playButton.style.opacity = '1';
+            }
+        });
+    });
+});
+
+// 무한 스크롤: 목록 끝이 보이면 /api/videos 로 다음 영상들을 불러와 카드 추가
+const VIDEO_FIELDS = 'id,title,description,platform,video_id,thumbnail_url,tags,cursor';
+
+function createElement(tag, className, text) {
+    const element = document.createElement(tag);
+    if (className) element.className = className;
+    if (text) element.textContent = text;
+    return element;
+}
+
+function createVideoCard(video) {
+    const column = createElement('div', 'col-12 mb-4');
+    const card = createElement('div', 'card h-100');
+    card.style.maxWidth = '1400px';
+    card.style.margin = '0 auto';
+
+    const container = createElement('div', 'position-relative video-container');
+    container.dataset.videoId = video.video_id || '';
+    if (video.platform === 'youtube' && video.video_id) {
+        const thumbnail = createElement('img', 'card-img-top video-thumbnail');
+        thumbnail.src = video.thumbnail_url;
+        thumbnail.alt = video.title;
+        thumbnail.loading = 'lazy';
+        thumbnail.style.cssText = 'height: 450px; width: 800px; object-fit: cover; cursor: pointer;';
+        thumbnail.addEventListener('click', () => playVideo(thumbnail, video.video_id));
+        const overlay = createElement('div', 'play-button-overlay');
+        overlay.appendChild(createElement('div', 'play-triangle'));
+        overlay.addEventListener('click', () => playVideo(thumbnail, video.video_id));
+        container.append(thumbnail, overlay);
+    } else {
+        const placeholder = createElement('div', 'card-img-top bg-light d-flex align-items-center justify-content-center');
+        placeholder.style.height = '400px';
+        const icon = createElement('i', 'fas fa-film text-muted');
+        icon.style.fontSize = '6rem';
+        placeholder.appendChild(icon);
+        container.appendChild(placeholder);
+    }
+
+    const body = createElement('div', 'card-body d-flex flex-column');
+    body.appendChild(createElement('h5', 'card-title', video.title));
+    if (video.description) {
+        const description = video.description.length > 100 ? video.description.slice(0, 100) + '...' : video.description;
+        body.appendChild(createElement('p', 'card-text flex-grow-1', description));
+    }
+    if (video.tags.length) {
+        const tags = createElement('div', 'mb-2');
+        video.tags.forEach(name => {
+            const link = createElement('a', 'badge bg-secondary text-decoration-none me-1', '#' + name);
+            link.href = '/portfolio?tag=' + encodeURIComponent(name);
+            tags.appendChild(link);
+        });
+        body.appendChild(tags);
+    }
+
+    card.append(container, body);
+    column.appendChild(card);
+    return column;
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const more = document.getElementById('video-list-more');
+    const list = document.getElementById('video-list');
+    if (!more || !list || !('IntersectionObserver' in window)) return;
+
+    const pagination = document.getElementById('video-pagination');
+    if (pagination) pagination.style.display = 'none';
+    let loading = false;
+
+    const observer = new IntersectionObserver(async entries => {
+        if (!entries[0].isIntersecting || loading || !more.dataset.cursor) return;
+        loading = true;
+        more.textContent = '불러오는 중...';
+        const params = new URLSearchParams({after: more.dataset.cursor, limit: 9, fields: VIDEO_FIELDS});
+        if (more.dataset.tag) params.set('tag', more.dataset.tag);
+        if (more.dataset.year) params.set('year', more.dataset.year);
+        try {
+            const response = await fetch('/api/videos?' + params);
+            if (!response.ok) throw new Error(response.status);
+            const data = await response.json();
+            data.videos.forEach(video => list.appendChild(createVideoCard(video)));
+            more.dataset.cursor = data.next_cursor || '';
+            more.textContent = '';
+            if (!data.next_cursor) observer.disconnect();
+        } catch (error) {
+            // 실패하면 기존 페이지네이션으로 되돌림
+            observer.disconnect();
+            more.textContent = '';
+            if (pagination) pagination.style.display = '';
+        }
+        loading = false;
+    }, {rootMargin: '600px'});
+    observer.observe(more);
+});
@@ -0,0 +1,57 @@
+"""
+테스트 공통 설정
+
+app 을 import 하기 전에 임시 폴더로 옮겨 가고 DATABASE_URL 을 그 안의 SQLite 파일로 바꾼다.
+상대 경로 업로드 폴더도 임시 폴더 아래에 만들어지므로 저장소의 website.db 와 static/uploads 는 건드리지 않는다.
+
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix='dayumusic-test-')
+
+os.chdir(WORKDIR)
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(WORKDIR, 'test.db')
+os.environ['AUTO_MIGRATE'] = '1'
+os.environ['JOB_WORKERS'] = '0'
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, ROOT)
+
+import app as app_module  # noqa: E402
+
+app_module.app.config.update(
+    TESTING=True,
+    LOCAL_VIDEO_FOLDER=os.path.join(WORKDIR, 'videos'),
+    VIDEO_UPLOAD_TMP_FOLDER=os.path.join(WORKDIR, 'partial_uploads'),
+)
+app_module.static_storage = app_module.upload_storage = app_module.LocalFileStorage(os.path.join(WORKDIR, 'static'))
+
+@pytest.fixture(scope='session')
+def app():
+    with app_module.app.app_context():
+        app_module.upgrade_schema()
+    return app_module.app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def admin_client(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['is_admin'] = True
+    return client
+
+@pytest.fixture
+def run_jobs(app):
+    """요청이 쌓아 둔 작업 큐를 바로 처리"""
+    def run():
+        with app.app_context():
+            return app_module.job_queue.run_pending()
+    return run
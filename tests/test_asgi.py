@@ -0,0 +1,81 @@
+import json
+import asyncio
+
+import pytest
+
+import app as app_module
+import asgi
+
+def call(application, method, path, body=b'', headers=()):
+    """ASGI 앱에 HTTP 요청 하나를 보내고 (상태 코드, 헤더 dict, 본문) 반환"""
+    messages = []
+
+    async def run():
+        received = False
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            await asyncio.Event().wait()
+
+        async def send(message):
+            messages.append(message)
+
+        path_only, _, query = path.partition('?')
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': method, 'scheme': 'http', 'path': path_only, 'raw_path': path_only.encode(),
+            'query_string': query.encode(), 'root_path': '',
+            'headers': [(name.lower().encode(), value.encode()) for name, value in headers],
+            'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+        }
+        await application(scope, receive, send)
+        if getattr(application, 'engine', None) is not None:
+            await application.shutdown()
+
+    asyncio.run(run())
+    start = next(m for m in messages if m['type'] == 'http.response.start')
+    body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+    return start['status'], {k.decode(): v.decode() for k, v in start['headers']}, body
+
+@pytest.fixture
+def video_id(app):
+    with app.app_context():
+        video = app_module.Video(title='ASGI 영상', platform='youtube', video_id='asgi0000000',
+                                 external_url='https://youtu.be/asgi0000000')
+        app_module.db.session.add(video)
+        app_module.db.session.commit()
+        return video.id
+
+def test_async_db_is_off_by_default(app):
+    assert app.config['ASGI_ASYNC_DB'] == '0'
+    assert not asgi.application.async_db
+
+@pytest.mark.parametrize('async_db', ['0', '1'])
+def test_get_route(app, video_id, monkeypatch, async_db):
+    monkeypatch.setitem(app.config, 'ASGI_ASYNC_DB', async_db)
+    application = asgi.AsyncApplication(app)
+    environ = asgi.build_environ({'method': 'GET', 'path': f'/api/video/{video_id}', 'query_string': b'',
+                                  'headers': [], 'server': ('testserver', 80)})
+    assert (application.match(environ) is not None) == (async_db == '1')
+
+    status, headers, body = call(application, 'GET', f'/api/video/{video_id}')
+    assert status == 200
+    assert headers['content-type'].startswith('application/json')
+    assert json.loads(body)['title'] == 'ASGI 영상'
+
+def test_post_route_falls_through_to_wsgi(app, video_id, monkeypatch):
+    monkeypatch.setitem(app.config, 'ASGI_ASYNC_DB', '1')
+    application = asgi.AsyncApplication(app)
+    environ = asgi.build_environ({'method': 'POST', 'path': f'/api/video/{video_id}/view', 'query_string': b'',
+                                  'headers': [], 'server': ('testserver', 80)})
+    assert application.match(environ) is None
+
+    before = app_module.counter_buffer.pending(video_id, 'view_count')
+    status, _, body = call(application, 'POST', f'/api/video/{video_id}/view', body=b'{}',
+                           headers=[('Content-Type', 'application/json'), ('Content-Length', '2')])
+    assert status == 200
+    assert json.loads(body)['counted'] is True
+    assert app_module.counter_buffer.pending(video_id, 'view_count') == before + 1
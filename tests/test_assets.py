@@ -0,0 +1,24 @@
+import app as app_module
+
+TRICKY_JS = r'''// 한 줄 주석
+const greeting = `첫 줄
+    들여쓴 줄 // 주석이 아님
+  /* 이것도 아님 */ ${ "x`y" + `안쪽 ${1}` }`;
+const backticks = /`[^`]*`/g;   // 백틱이 들어간 정규식
+const url = "http://example.com"; /* 블록 주석 */
+const quote = 'it\'s // fine';
+let total = greeting
+  + url
+'''
+
+def test_minify_js_keeps_literals_and_drops_comments():
+    minified = app_module.minify_js(TRICKY_JS)
+
+    assert '`첫 줄\n    들여쓴 줄 // 주석이 아님\n  /* 이것도 아님 */ ${' in minified
+    assert '"x`y"' in minified and '`안쪽 ${1}`' in minified
+    assert '/`[^`]*`/g' in minified
+    assert '"http://example.com"' in minified
+    assert "'it\\'s // fine'" in minified
+    assert '한 줄 주석' not in minified and '블록 주석' not in minified and '백틱이 들어간' not in minified
+    # 세미콜론 없이 줄바꿈으로 끝나는 문장은 줄바꿈을 유지
+    assert 'greeting\n+url' in minified
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import app as app_module
+
+calls = []
+
+@app_module.job_handler('test_flaky')
+def flaky_job(payload):
+    calls.append(payload)
+    raise RuntimeError('boom')
+
+def test_failed_job_retries_with_backoff_then_fails(app):
+    with app.app_context():
+        job = app_module.enqueue_job('test_flaky', {'n': 1}, max_attempts=2)
+        app_module.db.session.commit()
+
+        assert app_module.job_queue.run_pending() == 1
+        app_module.db.session.refresh(job)
+        assert job.status == 'pending'
+        assert job.attempts == 1
+        assert job.last_error == 'RuntimeError: boom'
+        # 5 * 2 ** attempts 초 뒤로 미뤄지므로 바로는 다시 실행되지 않음
+        assert job.run_after > datetime.utcnow() + timedelta(seconds=8)
+        assert app_module.job_queue.run_pending() == 0
+
+        job.run_after = datetime.utcnow()
+        app_module.db.session.commit()
+        assert app_module.job_queue.run_pending() == 1
+        app_module.db.session.refresh(job)
+        assert job.status == 'failed'
+        assert job.attempts == 2
+    assert len(calls) == 2
+
+def test_stale_running_jobs_requeue_only_while_attempts_remain(app):
+    with app.app_context():
+        started_at = datetime.utcnow() - timedelta(seconds=app_module.job_queue.timeout + 60)
+        retry = app_module.Job(kind='test_flaky', payload='{}', status='running', attempts=1, max_attempts=3,
+                               started_at=started_at, run_after=datetime.utcnow() + timedelta(hours=1))
+        exhausted = app_module.Job(kind='test_flaky', payload='{}', status='running', attempts=3, max_attempts=3,
+                                   started_at=started_at, run_after=datetime.utcnow() + timedelta(hours=1))
+        app_module.db.session.add_all([retry, exhausted])
+        app_module.db.session.commit()
+
+        app_module.job_queue._next_requeue = 0
+        assert app_module.job_queue.claim() is None
+        app_module.db.session.refresh(retry)
+        app_module.db.session.refresh(exhausted)
+        assert retry.status == 'pending'
+        assert exhausted.status == 'failed'
+        assert exhausted.last_error
+
+def test_queued_related_video_refreshes_are_coalesced(app, monkeypatch):
+    builds = []
+    build_video_features = app_module.build_video_features
+
+    def counting_build():
+        builds.append(1)
+        return build_video_features()
+    monkeypatch.setattr(app_module, 'build_video_features', counting_build)
+
+    with app.app_context():
+        videos = [app_module.Video(title=f'합치기 {i}', platform='youtube', video_id=f'coalesce{i:03d}') for i in range(3)]
+        app_module.db.session.add_all(videos)
+        app_module.db.session.flush()
+        jobs = [app_module.enqueue_job('refresh_related_videos', {'changed': [video.id]}) for video in videos]
+        app_module.db.session.commit()
+
+        assert app_module.job_queue.run_pending() == 1
+        assert len(builds) == 1
+        for job in jobs:
+            app_module.db.session.refresh(job)
+            assert job.status == 'done'
@@ -0,0 +1,29 @@
+import app as app_module
+
+def test_server_timing_only_for_admins_and_metrics_token(app, client, admin_client, monkeypatch):
+    assert 'Server-Timing' not in client.get('/about').headers
+    assert 'Server-Timing' in admin_client.get('/about').headers
+
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'secret')
+    assert 'Server-Timing' not in client.get('/about', headers={'Authorization': 'Bearer wrong'}).headers
+    assert 'Server-Timing' in client.get('/about', headers={'Authorization': 'Bearer secret'}).headers
+
+
+def test_query_shapes_only_for_sampled_requests(app, client, monkeypatch, caplog):
+    monkeypatch.setitem(app.config, 'N_PLUS_ONE_THRESHOLD', 0)
+
+    def n_plus_one_count():
+        return app_module.request_metrics.snapshot().get('board', {}).get('n_plus_one', 0)
+
+    monkeypatch.setitem(app.config, 'QUERY_SHAPE_SAMPLE_RATE', 0.0)
+    before = n_plus_one_count()
+    app_module.response_cache.invalidate('posts')
+    assert client.get('/board').status_code == 200
+    assert n_plus_one_count() == before
+    assert '[N+1]' not in caplog.text
+
+    monkeypatch.setitem(app.config, 'QUERY_SHAPE_SAMPLE_RATE', 1.0)
+    app_module.response_cache.invalidate('posts')
+    assert client.get('/board').status_code == 200
+    assert n_plus_one_count() == before + 1
+    assert any(r.levelname == 'WARNING' and '[N+1] GET /board' in r.getMessage() for r in caplog.records)
@@ -0,0 +1,55 @@
+import re
+from datetime import date, datetime
+from html import unescape
+
+import app as app_module
+
+def create_post(app, title, **fields):
+    with app.app_context():
+        post = app_module.Post(title=title, content=fields.pop('content', '내용'), author='다유', **fields)
+        app_module.db.session.add(post)
+        app_module.db.session.commit()
+        app_module.response_cache.invalidate('posts')
+        return post.id
+
+def test_cached_page_answers_conditional_get_with_304(app, client):
+    post_id = create_post(app, '조건부 요청')
+    first = client.get(f'/post/{post_id}')
+    assert first.status_code == 200
+    assert first.headers['ETag'] and first.headers['Last-Modified']
+
+    cached = client.get(f'/post/{post_id}', headers={'If-None-Match': first.headers['ETag']})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+def test_edit_post_invalidates_cached_pages(app, client, admin_client):
+    post_id = create_post(app, '수정 전 제목')
+    before = client.get(f'/post/{post_id}')
+    assert '수정 전 제목' in before.get_data(as_text=True)
+    assert '수정 전 제목' in client.get('/board').get_data(as_text=True)
+
+    response = admin_client.post(f'/edit/{post_id}', data={'title': '수정 후 제목', 'content': '내용', 'author': '다유'})
+    assert response.status_code == 302
+
+    after = client.get(f'/post/{post_id}', headers={'If-None-Match': before.headers['ETag']})
+    assert after.status_code == 200
+    assert '수정 후 제목' in after.get_data(as_text=True)
+    assert '수정 후 제목' in client.get('/board').get_data(as_text=True)
+
+def test_board_cursor_walks_every_post_once(app, client):
+    # 같은 작성 시각의 게시글은 id 로 이어져야 커서 경계에서 빠지거나 겹치지 않음
+    posted = datetime(2001, 1, 1, 12, 0)
+    titles = {f'커서 게시글 {i:02d}' for i in range(15)}
+    for title in sorted(titles):
+        create_post(app, title, date_posted=posted, performance_date=date(2097, 5, 1))
+
+    # 첫 커서를 같은 작성 시각 위에 두어 처음부터 id 경계를 지나가게 함
+    seen = []
+    url = f'/board?after={app_module.encode_cursor(posted, 10 ** 9)}&year=2097'
+    while url:
+        html = client.get(url).get_data(as_text=True)
+        seen += re.findall(r'커서 게시글 \d\d', html)
+        match = re.search(r'href="(/board\?after=[^"]+)"', html)
+        url = unescape(match.group(1)) if match else None
+    assert len(seen) == len(titles)
+    assert set(seen) == titles
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+import app as app_module
+from conftest import WORKDIR
+
+def test_hot_queries_use_indexes(app):
+    """flask db explain 과 같은 확인: 마이그레이션으로 만든 스키마에서 주요 쿼리에 전체 스캔/별도 정렬이 없어야 함"""
+    with app.app_context():
+        failures = {}
+        for name, query, ordered in app_module.hot_queries():
+            problems = app_module.plan_problems(app_module.explain_query(query), ordered)
+            if problems:
+                failures[name] = problems
+        app_module.db.session.rollback()
+    assert failures == {}
+
+@pytest.fixture
+def empty_database(app, monkeypatch):
+    """빈 SQLite 파일을 가리키는 엔진으로 잠시 바꿔 끼움 (세션 공용 테스트 DB 는 건드리지 않음)"""
+    path = os.path.join(WORKDIR, 'migrations.db')
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f'sqlite:///{path}')
+    with app.app_context():
+        app_module.db.session.remove()
+        monkeypatch.setitem(app_module.db._app_engines[app], None, engine)
+        yield engine
+        app_module.db.session.remove()
+    engine.dispose()
+
+def schema(engine):
+    inspector = inspect(engine)
+    return {
+        table: ({column['name'] for column in inspector.get_columns(table)},
+                {index['name'] for index in inspector.get_indexes(table)})
+        for table in inspector.get_table_names() if not table.startswith('search_fts')
+    }
+
+def test_migrations_build_the_model_schema_and_round_trip(empty_database):
+    latest = max(step.version for step in app_module.MIGRATIONS)
+    app_module.upgrade_schema(echo=lambda message: None)
+    assert app_module.current_schema_version() == latest
+    upgraded = schema(empty_database)
+    for name, table in app_module.db.metadata.tables.items():
+        assert upgraded[name][0] == {column.name for column in table.columns}, name
+        assert {index.name for index in table.indexes} <= upgraded[name][1], name
+
+    app_module.downgrade_schema(1, echo=lambda message: None)
+    assert app_module.current_schema_version() == 1
+    downgraded = schema(empty_database)
+    assert 'upload_blob' not in downgraded
+    assert 'ix_video_date_uploaded_id' not in downgraded['video'][1]
+    assert 'ix_contact_answered_date_sent' not in downgraded['contact'][1]
+
+    app_module.upgrade_schema(echo=lambda message: None)
+    assert app_module.current_schema_version() == latest
+    assert schema(empty_database) == upgraded
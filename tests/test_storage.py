@@ -0,0 +1,83 @@
+import os
+import time
+
+from sqlalchemy import event
+
+import app as app_module
+
+def write_file(path, age=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'data')
+    if age:
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+def add_post_image(app, filename):
+    with app.app_context():
+        post = app_module.Post(title='저장소 점검', content='내용', author='다유')
+        app_module.db.session.add(post)
+        app_module.db.session.flush()
+        app_module.db.session.add(app_module.PostImage(post_id=post.id, filename=filename))
+        app_module.db.session.commit()
+
+def test_scope_reports_orphans_missing_and_respects_grace(app, tmp_path):
+    storage = app_module.LocalFileStorage(str(tmp_path))
+    add_post_image(app, '0000-referenced.jpg')
+    add_post_image(app, '0000-missing.jpg')
+    write_file(storage.path('uploads/0000-referenced.jpg'), age=7200)
+    write_file(storage.path('uploads/old-orphan.jpg'), age=7200)
+    write_file(storage.path('uploads/new-orphan.jpg'))
+    write_file(storage.path('derived/uploads/0000-referenced_320w.webp'), age=7200)
+    write_file(storage.path('derived/uploads/gone_320w.webp'), age=7200)
+
+    with app.app_context():
+        result = app_module.check_storage_scope(storage, 'uploads/', 'derived/uploads/',
+                                                [app_module.PostImage.filename], reclaim=True, grace=3600)
+    assert result['orphans'] == ['uploads/old-orphan.jpg', 'derived/uploads/gone_320w.webp']
+    assert result['missing'][:1] == ['uploads/0000-missing.jpg']
+    assert result['stats']['orphan_files'] == 1 and result['stats']['derived_orphan_files'] == 1
+    assert result['stats']['reclaimed_files'] == 2
+    assert not storage.exists('uploads/old-orphan.jpg')
+    assert not storage.exists('derived/uploads/gone_320w.webp')
+    for key in ('uploads/0000-referenced.jpg', 'uploads/new-orphan.jpg', 'derived/uploads/0000-referenced_320w.webp'):
+        assert storage.exists(key)
+
+def test_storage_gc_keeps_referenced_and_recent_files(app):
+    storage = app_module.upload_storage
+    add_post_image(app, 'gc-referenced.jpg')
+    write_file(storage.path('uploads/gc-referenced.jpg'), age=7200)
+    write_file(storage.path('uploads/gc-recent.jpg'))
+    write_file(storage.path('uploads/gc-orphan.jpg'), age=7200)
+
+    result = app.test_cli_runner().invoke(args=['storage', 'gc'])
+    assert result.exit_code == 0, result.output
+    assert storage.exists('uploads/gc-referenced.jpg')
+    assert storage.exists('uploads/gc-recent.jpg')
+    assert not storage.exists('uploads/gc-orphan.jpg')
+
+def test_ref_count_fix_does_not_overwrite_concurrent_change(app):
+    add_post_image(app, 'cas.jpg')
+    with app.app_context():
+        app_module.db.session.add(app_module.UploadBlob(filename='cas.jpg', ref_count=5, size=4))
+        app_module.db.session.commit()
+
+        session = app_module.db.session()
+        concurrent = []
+
+        @event.listens_for(session, 'do_orm_execute')
+        def bump_before_fix(state):
+            # 점검이 참조 수를 읽은 뒤 고치기 전에 다른 요청이 같은 파일을 올린 경우
+            if state.is_update and not concurrent:
+                concurrent.append(True)
+                state.session.execute(app_module.db.text(
+                    "UPDATE upload_blob SET ref_count = ref_count + 1 WHERE filename = 'cas.jpg'"))
+
+        app_module.check_upload_ref_counts(reclaim=True)
+        event.remove(session, 'do_orm_execute', bump_before_fix)
+        assert concurrent
+        assert app_module.db.session.get(app_module.UploadBlob, 'cas.jpg').ref_count == 6
+
+        app_module.db.session.expire_all()
+        app_module.check_upload_ref_counts(reclaim=True)
+        assert app_module.db.session.get(app_module.UploadBlob, 'cas.jpg').ref_count == 1
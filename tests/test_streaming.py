@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+CONTENT = bytes(range(256)) * 4
+
+@pytest.fixture
+def video_file(app):
+    folder = app.config['LOCAL_VIDEO_FOLDER']
+    os.makedirs(folder, exist_ok=True)
+    filename = 'ab' * 16 + '.mp4'
+    with open(os.path.join(folder, filename), 'wb') as f:
+        f.write(CONTENT)
+    return filename
+
+def test_single_range_is_partial_content(client, video_file):
+    response = client.get(f'/media/videos/{video_file}', headers={'Range': 'bytes=10-19'})
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == f'bytes 10-19/{len(CONTENT)}'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert response.data == CONTENT[10:20]
+
+def test_multiple_ranges_are_multipart_byteranges(client, video_file):
+    response = client.get(f'/media/videos/{video_file}', headers={'Range': 'bytes=0-3,100-103,-4'})
+    assert response.status_code == 206
+    content_type = response.headers['Content-Type']
+    assert content_type.startswith('multipart/byteranges; boundary=')
+    boundary = content_type.split('boundary=')[1].encode()
+
+    parts = [part for part in response.data.split(b'--' + boundary) if part.strip() not in (b'', b'--')]
+    assert len(parts) == 3
+    expected = [(0, 3), (100, 103), (len(CONTENT) - 4, len(CONTENT) - 1)]
+    for part, (start, end) in zip(parts, expected):
+        headers, body = part.split(b'\r\n\r\n', 1)
+        assert f'Content-Range: bytes {start}-{end}/{len(CONTENT)}'.encode() in headers
+        assert body[:end + 1 - start] == CONTENT[start:end + 1]
+        assert body[end + 1 - start:] == b'\r\n'
+
+def test_if_range_with_stale_etag_sends_whole_file(client, video_file):
+    etag = client.get(f'/media/videos/{video_file}').headers['ETag']
+
+    matching = client.get(f'/media/videos/{video_file}', headers={'Range': 'bytes=0-9', 'If-Range': etag})
+    assert matching.status_code == 206
+    assert matching.data == CONTENT[:10]
+
+    for range_header in ('bytes=0-9', 'bytes=0-9,20-29'):
+        stale = client.get(f'/media/videos/{video_file}', headers={'Range': range_header, 'If-Range': '"stale"'})
+        assert stale.status_code == 200
+        assert stale.data == CONTENT
+
+@pytest.mark.parametrize('range_header', ['bytes=5000-5010', 'bytes=5000-5010,6000-6010'])
+def test_unsatisfiable_range_is_416(client, video_file, range_header):
+    response = client.get(f'/media/videos/{video_file}', headers={'Range': range_header})
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == f'bytes */{len(CONTENT)}'
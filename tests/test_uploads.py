@@ -0,0 +1,94 @@
+import io
+import os
+import hashlib
+
+import pytest
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+import app as app_module
+
+def jpeg_with_exif(color):
+    """세로로 찍어 가로로 저장된(Orientation=6) 사진, 카메라/GPS 정보 포함"""
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = 'Camera'
+    exif[0x8825] = {1: 'N', 2: (37.0, 33.0, 59.0)}
+    buffer = io.BytesIO()
+    Image.new('RGB', (40, 20), color).save(buffer, 'JPEG', exif=exif)
+    return buffer.getvalue()
+
+def store(app, data, name='photo.jpg'):
+    with app.test_request_context():
+        filename = app_module.store_upload(FileStorage(io.BytesIO(data), filename=name))
+        app_module.db.session.commit()
+    return filename
+
+def test_stored_upload_is_normalized_and_matches_its_hash(app):
+    filename = store(app, jpeg_with_exif('red'))
+
+    with open(app_module.upload_storage.path(f'uploads/{filename}'), 'rb') as f:
+        stored = f.read()
+    assert hashlib.sha256(stored).hexdigest()[:32] == filename.split('.')[0]
+    with Image.open(io.BytesIO(stored)) as image:
+        assert image.size == (20, 40)
+        assert not image.getexif()
+
+def test_same_image_is_stored_once_with_reference_count(app):
+    data = jpeg_with_exif('blue')
+    first = store(app, data)
+    second = store(app, data)
+    assert first == second
+    with app.app_context():
+        assert app_module.db.session.get(app_module.UploadBlob, first).ref_count == 2
+
+def test_board_is_invalidated_when_derivatives_are_ready(app, client, run_jobs):
+    buffer = io.BytesIO()
+    Image.new('RGB', (400, 200), 'green').save(buffer, 'JPEG')
+    filename = store(app, buffer.getvalue())
+    with app.app_context():
+        post = app_module.Post(title='파생본 게시글', content='내용', author='다유')
+        app_module.db.session.add(post)
+        app_module.db.session.flush()
+        app_module.db.session.add(app_module.PostImage(post_id=post.id, filename=filename, is_primary=True))
+        app_module.db.session.commit()
+        # 글쓰기 라우트를 거치지 않았으므로 앞선 테스트가 캐시해 둔 게시판을 직접 무효화
+        app_module.response_cache.invalidate('posts')
+
+    # 파생본이 없을 때 캐시된 게시판 페이지가 작업이 끝난 뒤에는 srcset 을 포함해 다시 렌더링되어야 함
+    assert filename in client.get('/board').get_data(as_text=True)
+    assert 'srcset' not in client.get('/board').get_data(as_text=True)
+    run_jobs()
+    assert 'srcset' in client.get('/board').get_data(as_text=True)
+
+def release(app, filename):
+    with app.app_context():
+        app_module.release_uploads([filename])
+        app_module.db.session.commit()
+
+def test_released_upload_is_deleted_only_while_unreferenced(app, run_jobs):
+    data = jpeg_with_exif('yellow')
+    filename = store(app, data)
+    path = app_module.upload_storage.path(f'uploads/{filename}')
+
+    # 삭제 작업이 돌기 전에 같은 사진이 다시 올라오면 파일과 행을 남김
+    release(app, filename)
+    assert store(app, data) == filename
+    run_jobs()
+    assert os.path.exists(path)
+    with app.app_context():
+        assert app_module.db.session.get(app_module.UploadBlob, filename).ref_count == 1
+
+    release(app, filename)
+    run_jobs()
+    assert not os.path.exists(path)
+    with app.app_context():
+        assert app_module.db.session.get(app_module.UploadBlob, filename) is None
+
+def test_oversized_image_is_rejected_before_decoding(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'MAX_IMAGE_PIXELS', 100)
+    buffer = io.BytesIO()
+    Image.new('RGB', (20, 20), 'black').save(buffer, 'PNG')
+    with app.test_request_context():
+        with pytest.raises(ValueError):
+            app_module.normalize_upload(FileStorage(io.BytesIO(buffer.getvalue()), filename='big.png'))
@@ -0,0 +1,67 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+
+TAG = 'api테스트'
+
+@pytest.fixture(scope='module')
+def video_ids(app):
+    """같은 태그를 가진 영상 5개 (최신순 id 목록), 다른 테스트의 영상과 섞이지 않도록 ?tag= 로 거름"""
+    with app.app_context():
+        start = datetime(2020, 1, 1)
+        videos = [app_module.Video(title=f'API 영상 {i}', platform='youtube', video_id=f'apivideo{i:03d}',
+                                   date_uploaded=start + timedelta(days=i)) for i in range(5)]
+        # 같은 시각에 올린 영상 두 개: id 로 순서가 정해져야 커서가 건너뛰거나 겹치지 않음
+        videos[3].date_uploaded = videos[4].date_uploaded
+        app_module.db.session.add_all(videos)
+        app_module.db.session.flush()
+        for video in videos:
+            app_module.set_video_tags(video, TAG)
+        app_module.db.session.commit()
+        return [video.id for video in sorted(videos, key=lambda v: (v.date_uploaded, v.id), reverse=True)]
+
+def test_ids_keep_request_order_and_report_missing(client, video_ids):
+    requested = [video_ids[2], 999999, video_ids[0]]
+    data = client.get('/api/videos?ids=' + ','.join(map(str, requested))).get_json()
+    assert [video['id'] for video in data['videos']] == [video_ids[2], video_ids[0]]
+    assert data['missing'] == [999999]
+
+def test_cursor_pages_cover_every_video_once(client, video_ids):
+    seen = []
+    url = f'/api/videos?tag={TAG}&limit=2&fields=id'
+    while True:
+        data = client.get(url).get_json()
+        seen += [video['id'] for video in data['videos']]
+        if not data['next_cursor']:
+            break
+        url = f"/api/videos?tag={TAG}&limit=2&fields=id&after={data['next_cursor']}"
+    assert seen == video_ids
+
+@pytest.mark.parametrize('query', ['fields=id,password', 'ids=1,abc', 'after=not-a-cursor'])
+def test_invalid_parameters_are_400(client, query):
+    response = client.get(f'/api/videos?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+def test_fields_limit_the_keys(client, video_ids):
+    data = client.get(f'/api/videos?ids={video_ids[0]}&fields=id,title').get_json()
+    assert data['videos'] == [{'id': video_ids[0], 'title': 'API 영상 4'}]
+
+def test_etag_answers_304(client, video_ids):
+    url = f'/api/videos?tag={TAG}&fields=id,title'
+    first = client.get(url)
+    assert first.status_code == 200 and first.headers['ETag']
+    again = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+
+def test_ndjson_streams_one_video_per_line(client, video_ids):
+    for kwargs in ({'query_string': {'tag': TAG, 'format': 'ndjson', 'fields': 'id'}},
+                   {'query_string': {'tag': TAG, 'fields': 'id'}, 'headers': {'Accept': 'application/x-ndjson'}}):
+        response = client.get('/api/videos', **kwargs)
+        assert response.headers['Content-Type'].startswith('application/x-ndjson')
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)['id'] for line in lines] == video_ids
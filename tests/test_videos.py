@@ -0,0 +1,219 @@
+import os
+import time
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+
+def upload_local_video(client, content, title):
+    """분할 업로드 API (init -> 청크 PUT -> finalize) 로 로컬 영상 등록"""
+    response = client.post('/api/uploads/video', json={'filename': 'clip.mp4', 'size': len(content), 'title': title})
+    assert response.status_code == 201
+    upload_id = response.get_json()['upload_id']
+
+    response = client.put(f'/api/uploads/video/{upload_id}?offset=0', data=content,
+                          headers={'X-Chunk-SHA256': hashlib.sha256(content).hexdigest()})
+    assert response.status_code == 200
+
+    response = client.post(f'/api/uploads/video/{upload_id}/finalize')
+    assert response.status_code == 201
+    return response.get_json()
+
+def test_delete_one_of_two_duplicate_uploads_keeps_file(app, admin_client, run_jobs):
+    content = os.urandom(4096)
+    first = upload_local_video(admin_client, content, '같은 영상 1')
+    second = upload_local_video(admin_client, content, '같은 영상 2')
+    assert first['video_filename'] == second['video_filename']
+    path = os.path.join(app.config['LOCAL_VIDEO_FOLDER'], first['video_filename'])
+
+    admin_client.post(f"/delete_video/{first['video_id']}")
+    run_jobs()
+    assert os.path.exists(path)
+    with app.app_context():
+        assert app_module.db.session.get(app_module.Video, second['video_id']).video_filename == second['video_filename']
+
+    admin_client.post(f"/delete_video/{second['video_id']}")
+    run_jobs()
+    assert not os.path.exists(path)
+
+def test_repeated_page_views_count_once(app, client, monkeypatch):
+    monkeypatch.setattr(app_module.rate_limiter, 'enabled', True)
+    with app.app_context():
+        video = app_module.Video(title='조회수 영상', platform='youtube', video_id='dQw4w9WgXcQ',
+                                 external_url='https://youtu.be/dQw4w9WgXcQ')
+        app_module.db.session.add(video)
+        app_module.db.session.commit()
+        video_id = video.id
+
+    client.get(f'/video/{video_id}')
+    client.get(f'/video/{video_id}')
+    client.post(f'/api/video/{video_id}/view')
+    assert app_module.counter_buffer.pending(video_id, 'view_count') == 1
+
+def test_shared_thumbnail_survives_until_last_video_is_deleted(app, admin_client, run_jobs):
+    folder = app.config['THUMBNAIL_UPLOAD_FOLDER']
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, 'youtube_shared.jpg')
+    open(path, 'wb').close()
+    with app.app_context():
+        videos = [app_module.Video(title=f'썸네일 공유 {i}', platform='youtube', video_id='shared',
+                                   thumbnail_filename='youtube_shared.jpg') for i in range(2)]
+        app_module.db.session.add_all(videos)
+        app_module.db.session.commit()
+        video_ids = [video.id for video in videos]
+
+    admin_client.post(f'/delete_video/{video_ids[0]}')
+    run_jobs()
+    assert os.path.exists(path)
+
+    admin_client.post(f'/delete_video/{video_ids[1]}')
+    run_jobs()
+    assert not os.path.exists(path)
+
+def test_video_detail_page_renders(app, client):
+    with app.app_context():
+        video = app_module.Video(title='상세 페이지 영상', description='설명', platform='youtube', video_id='abcdefghijk',
+                                 external_url='https://youtu.be/abcdefghijk')
+        app_module.db.session.add(video)
+        app_module.db.session.commit()
+        video_id = video.id
+
+    response = client.get(f'/video/{video_id}')
+    assert response.status_code == 200
+    assert '상세 페이지 영상' in response.get_data(as_text=True)
+
+def test_warm_video_detail_page_runs_no_queries(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'secret')
+    with app.app_context():
+        video = app_module.Video(title='캐시 영상', platform='youtube', video_id='abcdefghijk',
+                                 external_url='https://youtu.be/abcdefghijk')
+        app_module.db.session.add(video)
+        app_module.db.session.commit()
+        video_id = video.id
+
+    headers = {'Authorization': 'Bearer secret'}
+    cold = client.get(f'/video/{video_id}', headers=headers)
+    warm = client.get(f'/video/{video_id}', headers=headers)
+    assert cold.status_code == warm.status_code == 200
+    assert '"0 queries"' not in cold.headers['Server-Timing']
+    assert '"0 queries"' in warm.headers['Server-Timing']
+
+def start_local_upload(client, content):
+    """init + 청크 PUT 까지 (finalize 전 상태)"""
+    response = client.post('/api/uploads/video', json={'filename': 'clip.mp4', 'size': len(content), 'title': '업로드'})
+    upload_id = response.get_json()['upload_id']
+    client.put(f'/api/uploads/video/{upload_id}?offset=0', data=content,
+               headers={'X-Chunk-SHA256': hashlib.sha256(content).hexdigest()})
+    return upload_id
+
+def test_failed_finalize_keeps_part_file_for_retry(app, admin_client, monkeypatch):
+    upload_id = start_local_upload(admin_client, os.urandom(2048))
+    with app.app_context():
+        part_path = app_module.partial_upload_path(upload_id)
+
+    def broken_index(video):
+        raise RuntimeError('index down')
+    monkeypatch.setattr(app_module, 'index_video', broken_index)
+    with pytest.raises(RuntimeError):
+        admin_client.post(f'/api/uploads/video/{upload_id}/finalize')
+    assert os.path.exists(part_path)
+    with app.app_context():
+        assert app_module.db.session.get(app_module.VideoUpload, upload_id) is not None
+
+    monkeypatch.undo()
+    response = admin_client.post(f'/api/uploads/video/{upload_id}/finalize')
+    assert response.status_code == 201
+    assert not os.path.exists(part_path)
+    assert admin_client.post(f'/api/uploads/video/{upload_id}/finalize').status_code == 404
+
+def test_abandoned_upload_sessions_expire(app, admin_client):
+    upload_id = start_local_upload(admin_client, os.urandom(1024))
+    with app.app_context():
+        part_path = app_module.partial_upload_path(upload_id)
+        orphan_path = app_module.partial_upload_path('0' * 32)
+        open(orphan_path, 'wb').close()
+        old = time.time() - 2 * 86400
+        os.utime(orphan_path, (old, old))
+
+        upload = app_module.db.session.get(app_module.VideoUpload, upload_id)
+        upload.created_at = datetime.utcnow() - timedelta(days=2)
+        app_module.db.session.commit()
+        app_module.expire_video_uploads_job({})
+
+        assert app_module.db.session.get(app_module.VideoUpload, upload_id) is None
+    assert not os.path.exists(part_path)
+    assert not os.path.exists(orphan_path)
+    assert admin_client.post(f'/api/uploads/video/{upload_id}/finalize').status_code == 404
+
+def create_youtube_video(app, title):
+    with app.app_context():
+        video = app_module.Video(title=title, platform='youtube', video_id='abcdefghijk',
+                                 external_url='https://youtu.be/abcdefghijk')
+        app_module.db.session.add(video)
+        app_module.db.session.commit()
+        return video.id
+
+def test_view_api_dedups_by_cookie_and_rate_limits(app, monkeypatch):
+    monkeypatch.setattr(app_module.rate_limiter, 'enabled', True)
+    monkeypatch.setitem(app_module.rate_limiter.rules, 'events', app_module.RateLimitRule(3, 60))
+    video_id = create_youtube_video(app, '요청 제한 영상')
+    client = app.test_client()
+    environ = {'REMOTE_ADDR': '10.20.0.1'}
+
+    first = client.post(f'/api/video/{video_id}/view', environ_overrides=environ)
+    second = client.post(f'/api/video/{video_id}/view', environ_overrides=environ)
+    assert first.get_json()['counted'] is True
+    assert second.status_code == 200 and second.get_json()['counted'] is False
+
+    client.post(f'/api/video/{video_id}/view', environ_overrides=environ)
+    limited = client.post(f'/api/video/{video_id}/view', environ_overrides=environ)
+    assert limited.status_code == 429
+    assert int(limited.headers['Retry-After']) > 0
+    assert app_module.counter_buffer.pending(video_id, 'view_count') == 1
+
+def test_cookieless_visitors_behind_nat_are_not_duplicates(app, monkeypatch):
+    monkeypatch.setattr(app_module.rate_limiter, 'enabled', True)
+    video_id = create_youtube_video(app, 'NAT 영상')
+    environ = {'REMOTE_ADDR': '10.30.0.1'}
+    headers = {'User-Agent': 'same-browser'}
+
+    for _ in range(3):
+        # 매번 새 클라이언트 = 쿠키가 없는 서로 다른 방문자, IP 와 User-Agent 는 같음
+        response = app.test_client().post(f'/api/video/{video_id}/view', headers=headers, environ_overrides=environ)
+        assert response.get_json()['counted'] is True
+    assert app_module.counter_buffer.pending(video_id, 'view_count') == 3
+
+def test_view_api_for_missing_video_is_404(app, client):
+    response = client.post('/api/video/999999/view')
+    assert response.status_code == 404
+    assert not response.get_json()['success']
+
+def test_portfolio_filters_by_tag(app, client):
+    with app.app_context():
+        tagged = app_module.Video(title='태그 필터 정기공연', platform='youtube', video_id='tagfilter01')
+        other = app_module.Video(title='태그 필터 소품집', platform='youtube', video_id='tagfilter02')
+        app_module.db.session.add_all([tagged, other])
+        app_module.db.session.flush()
+        app_module.set_video_tags(tagged, '정기공연, 실내악')
+        app_module.set_video_tags(other, '소품')
+        app_module.db.session.commit()
+        app_module.response_cache.invalidate('videos')
+
+    body = client.get('/portfolio?tag=정기공연').get_data(as_text=True)
+    assert '태그 필터 정기공연' in body
+    assert '태그 필터 소품집' not in body
+
+def test_tag_migration_moves_legacy_tag_strings(app):
+    with app.app_context():
+        video = app_module.Video(title='예전 태그 영상', platform='youtube', video_id='legacytag01', tags='앙코르, 실내악')
+        app_module.db.session.add(video)
+        app_module.db.session.commit()
+        assert video.tag_items == []
+
+        migration = next(step for step in app_module.MIGRATIONS if step.version == 6)
+        migration.upgrade()
+        app_module.db.session.commit()
+        app_module.db.session.refresh(video)
+        assert sorted(tag.name for tag in video.tag_items) == ['실내악', '앙코르']